@@ -628,6 +628,12 @@ class RequestHandler(BaseHTTPRequestHandler):
             eval_num_timesteps = self.server.args.eval_num_timesteps
         if not 0 <= eval_num_timesteps <= self.server.args.eval_num_timesteps_max:
             return {'error': 'num_evalate_timeteps out of range.'}
+        target_ce_stderr = api_data[0].get('target_ce_stderr', self.server.args.eval_target_ce_stderr)
+        if not (target_ce_stderr is None or isinstance(target_ce_stderr, (int, float)) and target_ce_stderr > 0):
+            return {'error': 'target_ce_stderr out of range.'}
+        target_ce_stderr_relative = api_data[0].get('target_ce_stderr_relative', self.server.args.eval_target_ce_stderr_relative)
+        if not (target_ce_stderr_relative is None or isinstance(target_ce_stderr_relative, (int, float)) and target_ce_stderr_relative > 0):
+            return {'error': 'target_ce_stderr_relative out of range.'}
         num_environments = self.server.args.num_environments_healthcheck if prefix == 'healthcheck-' else self.server.args.num_environments
         num_trace_episodes = api_data[0].get('num_sample_paths')
         if not isinstance(num_trace_episodes, (int, float)):
@@ -639,6 +645,10 @@ class RequestHandler(BaseHTTPRequestHandler):
             '--num-environments', str(num_environments),
             '--num-trace-episodes', str(num_trace_episodes),
         ]
+        if target_ce_stderr is not None:
+            options += ['--eval-target-ce-stderr', str(target_ce_stderr)]
+        if target_ce_stderr_relative is not None:
+            options += ['--eval-target-ce-stderr-relative', str(target_ce_stderr_relative)]
         results = [None] * len(gammas)
         threads = []
         error_result = None
@@ -848,6 +858,9 @@ def main():
     parser.add_argument('--eval-num-timesteps', type = int, default = 100000)
     parser.add_argument('--eval-num-timesteps-healthcheck', type = int, default = 1000)
     parser.add_argument('--eval-num-timesteps-max', type = int, default = 2000000)
+    parser.add_argument('--eval-target-ce-stderr', type = float)
+        # Default target certainty equivalent standard error at which to stop evaluating early. num_evaluate_timesteps is then the maximum budget.
+    parser.add_argument('--eval-target-ce-stderr-relative', type = float) # Default target standard error as a fraction of the certainty equivalent.
     parser.add_argument('--num-environments', type = int, default = 200) # Number of parallel environments to use per worker. Speeds up torch/tensorflow.
     parser.add_argument('--num-environments-healthcheck', type = int, default = 10)
     parser.add_argument('--num-trace-episodes', type = int, default = 5) # Default number of sample traces to generate.
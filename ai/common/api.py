@@ -120,6 +120,8 @@ def parse_api_scenario(api_scenario, *, permissive = False):
         'rl_stocks_max': number,
 
         'num_evaluate_timesteps': number,
+        'target_ce_stderr': enumeration([None, number]),
+        'target_ce_stderr_relative': enumeration([None, number]),
         'num_sample_paths': number,
     })
 
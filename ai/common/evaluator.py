@@ -9,10 +9,10 @@
 # PURPOSE.
 
 import csv
-from math import ceil, sqrt
+from math import ceil, isnan, sqrt
 from itertools import chain
 import os
-from random import getstate, seed
+from random import getstate, seed, setstate
 from statistics import mean, stdev, StatisticsError
 
 import numpy as np
@@ -75,6 +75,18 @@ def weighted_stdev(value_weights):
     except (FloatingPointError, ZeroDivisionError):
         return float('nan')
 
+def weighted_stderr(value_weights):
+    try:
+        std = weighted_stdev(value_weights)
+    except ZeroDivisionError:
+        std = float('nan')
+    try:
+        return std / sqrt(len(value_weights[0]))
+            # Standard error is ill-defined for a weighted sample.
+            # Here we are incorrectly assuming each episode carries equal weight.
+    except ZeroDivisionError:
+        return float('nan')
+
 def weighted_ppf(value_weights, q):
     if len(value_weights[0]) == 0:
         return float('nan')
@@ -99,12 +111,93 @@ def unpack_value_weights(value_weights):
 
     return np.array(value_weights).T
 
+class RandomStreams(object):
+    '''Common random numbers for evaluation.
+
+    Each episode gets its own random number stream seeded from the
+    evaluation seed and the episode's sequence number, so that
+    evaluations using the same seed experience the same market and
+    mortality shocks irrespective of the policy being evaluated. Each
+    episode draws NumPy random numbers from its own RandomState. The
+    Python global generator state is swapped in around each reset and
+    step of an environment, and the original state is reinstated by
+    restore().
+
+    If antithetic is true, consecutive episodes share a stream, with the
+    second episode of each pair experiencing negated shocks.
+
+    If quasi_dimensions is non-zero, the mortality and market shocks of
+    each stream are instead taken from a scrambled Sobol sequence with
+    this many dimensions, with any shocks beyond these dimensions being
+    pseudo-random.
+
+    '''
+
+    def __init__(self, num_envs, eval_seed, worker = 0, *, antithetic = False, quasi_dimensions = 0):
+
+        self.eval_seed = eval_seed
+        self.worker = worker
+        self.antithetic = antithetic
+        if quasi_dimensions:
+            from gym_fin.quasi_random import QuasiRandom # Imports scipy.stats; only needed for quasi-random evaluation.
+            self.quasi = QuasiRandom(quasi_dimensions, seed = np.random.default_rng((eval_seed, worker)))
+        else:
+            self.quasi = None
+
+        self.states = [None] * num_envs
+        self.outer_state = None
+        self.episodes = 0
+
+    def start_episode(self, i, env):
+        '''Seed a new stream for environment i, and make it the current
+        stream. Returns the episode sequence number.
+
+        '''
+
+        episode = self.episodes
+        self.episodes += 1
+        stream = episode // 2 if self.antithetic else episode
+
+        self._save_outer_state()
+        entropy = np.random.SeedSequence((self.eval_seed, self.worker, stream)).generate_state(4)
+        seed(int.from_bytes(entropy.tobytes(), 'little'))
+        env.set_random_stream(antithetic = self.antithetic and episode % 2 == 1, quasi = self.quasi, quasi_episode = stream,
+            random_state = np.random.RandomState(entropy))
+
+        return episode
+
+    def resume(self, i):
+
+        self._save_outer_state()
+        setstate(self.states[i])
+
+    def suspend(self, i):
+
+        self.states[i] = getstate()
+
+    def restore(self):
+        '''Reinstate the Python global generator state from before any
+        stream was made current.
+
+        '''
+
+        if self.outer_state is not None:
+            setstate(self.outer_state)
+            self.outer_state = None
+
+    def _save_outer_state(self):
+
+        # Saving and restoring the state is slow, so only done once rather than around each step.
+        if self.outer_state is None:
+            self.outer_state = getstate()
+
 class Evaluator(object):
 
     def __init__(self, eval_envs, eval_seed, eval_num_timesteps, *,
         remote_evaluators = None, render = False, eval_batch_monitor = False,
         num_trace_episodes = 0, pdf_buckets = 100, cdf_buckets = 100, pdf_raw_buckets = 10000, pdf_smoothing_window = 0.02, pdf_constant_initial_consume = False,
-        cr_cls = [0.80, 0.95]):
+        cr_cls = [0.80, 0.95], common_random_numbers = False, antithetic = False, quasi_random = False, quasi_random_dimensions = 2048,
+        target_ce_stderr = None, target_ce_stderr_relative = None, min_stderr_episodes = 100):
 
         self.eval_envs = eval_envs
         self.eval_seed = eval_seed
@@ -119,9 +212,24 @@ class Evaluator(object):
         self.pdf_smoothing_window = pdf_smoothing_window
         self.pdf_constant_initial_consume = pdf_constant_initial_consume
         self.cr_cls = cr_cls
+        self.common_random_numbers = common_random_numbers or antithetic or quasi_random
+        self.antithetic = antithetic
+        self.quasi_random_dimensions = quasi_random_dimensions if quasi_random else 0
+            # Quasi-random evaluation episodes are not independent, so the reported standard error is only an upper bound.
+        self.target_ce_stderr = target_ce_stderr
+        self.target_ce_stderr_relative = target_ce_stderr_relative
+        self.min_stderr_episodes = min_stderr_episodes
+            # When a target standard error is specified eval_num_timesteps is the maximum timestep budget.
+            # Convergence is checked after each batch of len(eval_envs) episodes, once at least min_stderr_episodes samples are available.
 
         if self.remote_evaluators:
             self.eval_num_timesteps = ceil(self.eval_num_timesteps / len(self.remote_evaluators))
+            stderr_scale = sqrt(len(self.remote_evaluators)) # Each worker only needs to achieve a standard error this much larger.
+            if self.target_ce_stderr is not None:
+                self.target_ce_stderr *= stderr_scale
+            if self.target_ce_stderr_relative is not None:
+                self.target_ce_stderr_relative *= stderr_scale
+            self.min_stderr_episodes = ceil(self.min_stderr_episodes / len(self.remote_evaluators))
             self.num_trace_episodes = ceil(self.num_trace_episodes / len(self.remote_evaluators))
 
         self.trace = []
@@ -172,11 +280,50 @@ class Evaluator(object):
 
         return warnings
 
+    def converged(self, utility, erewards, serewards):
+        '''Whether the certainty equivalent standard error estimated from
+        the (value, weight) lists of episode rewards erewards and standard
+        error samples serewards is below target.
+
+        '''
+
+        if self.target_ce_stderr is None and self.target_ce_stderr_relative is None:
+            return False
+        if len(serewards) < self.min_stderr_episodes:
+            return False
+
+        rew = weighted_mean(unpack_value_weights(erewards))
+        stderr = weighted_stderr(unpack_value_weights(serewards))
+        ce = utility.inverse(rew)
+        ce_stderr = ce - utility.inverse(rew - stderr)
+        if isnan(ce_stderr):
+            return False
+
+        return (self.target_ce_stderr is None or ce_stderr <= self.target_ce_stderr) and \
+            (self.target_ce_stderr_relative is None or ce_stderr <= self.target_ce_stderr_relative * abs(ce))
+
     def evaluate(self, pi):
 
-        def rollout(eval_envs, pi):
+        def rollout(eval_envs, pi, worker = 0):
 
             envs = tuple(eval_env.fin for eval_env in eval_envs)
+            streams = RandomStreams(len(envs), self.eval_seed, worker, antithetic = self.antithetic,
+                quasi_dimensions = self.quasi_random_dimensions) if self.common_random_numbers else None
+            episodes = [None] * len(envs)
+
+            def reset(i):
+                if streams:
+                    episodes[i] = streams.start_episode(i, envs[i])
+                    obs = eval_envs[i].reset()
+                    streams.suspend(i)
+                    return obs
+                else:
+                    return eval_envs[i].reset()
+
+            def pair_erewards():
+                # Only complete pairs are samples of the pair mean; a pair whose partner episode never ran is excluded.
+                return [(rew / weight if weight != 0 else 0, weight) for rew, weight, count in pairs.values() if count == 2]
+
             for env in envs:
                 env.set_info(rewards = True)
             tracing = [False] * len(eval_envs)
@@ -185,8 +332,9 @@ class Evaluator(object):
                 tracing[i] = True
             rewards = []
             erewards = []
+            pairs = {}
             estates = []
-            obss = [eval_env.reset() for eval_env in eval_envs]
+            obss = [reset(i) for i in range(len(eval_envs))]
             et = sum(tracing)
             e = 0
             s = 0
@@ -197,6 +345,8 @@ class Evaluator(object):
             consume_mean = 0
             consume_m2 = 0
             finished = [False] * len(eval_envs)
+            stopping = False
+            checked = 0
             anticipated = 0
             for i, env in enumerate(envs):
                 if anticipated < self.eval_num_timesteps:
@@ -211,7 +361,11 @@ class Evaluator(object):
                     eval_envs[0].render()
                 for i, (eval_env, env, action) in enumerate(zip(eval_envs, envs, actions)):
                     if not finished[i]:
+                        if streams:
+                            streams.resume(i)
                         obs, r, done, info = eval_env.step(action)
+                        if streams:
+                            streams.suspend(i)
                         if tracing[i]:
                             self.trace_step(i, False, info)
                         s += 1
@@ -250,14 +404,21 @@ class Evaluator(object):
                             except ZeroDivisionError:
                                 er = 0
                             erewards.append((er, eweights[i]))
+                            if self.antithetic:
+                                pair_rew, pair_weight, pair_count = pairs.get(episodes[i] // 2, (0, 0, 0))
+                                pairs[episodes[i] // 2] = (pair_rew + er * eweights[i], pair_weight + eweights[i], pair_count + 1)
                             erews[i] = 0
                             eweights[i] = 0
+                            if not stopping and e - checked >= len(eval_envs):
+                                checked = e
+                                serewards = pair_erewards() if self.antithetic else erewards
+                                stopping = self.converged(env.utility, erewards, serewards)
                             if i == 0 and self.eval_render:
                                 eval_env.render()
-                            if anticipated >= self.eval_num_timesteps:
+                            if anticipated >= self.eval_num_timesteps or stopping:
                                 finished[i] = True
                             else:
-                                obss[i] = eval_env.reset()
+                                obss[i] = reset(i)
                                 assert all(obss[i][j] == obs0[j] for j in range(len(obs0))), 'Unstable scenario'
                                 anticipated += env.anticipated_episode_length
                         else:
@@ -267,10 +428,21 @@ class Evaluator(object):
 
             assert s == anticipated
 
+            if streams:
+                streams.restore()
+                for env in envs:
+                    env.set_random_stream()
+
+            if self.antithetic:
+                # Antithetic pairs are independent of each other, but the episodes within a pair are not.
+                perewards = pack_value_weights(sorted(pair_erewards()))
+            else:
+                perewards = None
+
             warnings = self.merge_warnings(tuple(env.warnings for env in envs))
 
-            return pack_value_weights(sorted(rewards), length = 3), pack_value_weights(sorted(erewards)), pack_value_weights(sorted(estates)), \
-                reward_initial, weight_sum, consume_mean, consume_m2, self.trace, warnings
+            return pack_value_weights(sorted(rewards), length = 3), pack_value_weights(sorted(erewards)), perewards, pack_value_weights(sorted(estates)), \
+                reward_initial, weight_sum, consume_mean, consume_m2, s, self.trace, warnings
 
         self.object_ids = None
         self.exception = None
@@ -289,7 +461,7 @@ class Evaluator(object):
             # Rllib developer API way:
             #     self.object_ids = [e.apply.remote(lambda e: e.foreach_env(lambda env: rollout([env], make_pi(e.get_policy())))) for e in self.remote_evaluators]
             # Fast way (rollout() batches calls to policy when multiple envs):
-            self.object_ids = [e.apply.remote(lambda e: [rollout(e.async_env.get_unwrapped(), make_pi(e.get_policy()))]) for e in self.remote_evaluators]
+            self.object_ids = [e.apply.remote(lambda e: [rollout(e.async_env.get_unwrapped(), make_pi(e.get_policy()), e.worker_index)]) for e in self.remote_evaluators]
 
             return self.object_ids
 
@@ -301,7 +473,8 @@ class Evaluator(object):
             np.random.seed(self.eval_seed)
 
             try:
-                self.reward_ages, self.erewards, self.estates, self.reward_initial, self.weight_sum, self.consume_mean, self.consume_m2, self.trace, self.warnings = \
+                self.reward_ages, self.erewards, self.perewards, self.estates, self.reward_initial, self.weight_sum, self.consume_mean, self.consume_m2, self.num_timesteps, \
+                    self.trace, self.warnings = \
                     rollout(self.eval_envs, pi)
             except Exception as e:
                 self.exception = e # Only want to know about failures in one place; later in summarize().
@@ -316,18 +489,24 @@ class Evaluator(object):
 
             rollouts = ray.get(self.object_ids)
 
-            rewards, erewards, estates, reward_initials, weight_sums, consume_means, consume_m2s, traces, warnings = zip(*chain(*rollouts))
+            rewards, erewards, perewards, estates, reward_initials, weight_sums, consume_means, consume_m2s, num_timesteps, traces, warnings = zip(*chain(*rollouts))
             if len(rewards) > 1:
                 unpacked_sort = lambda x : x[x[:, 0].argsort()]
                 self.reward_ages = pack_value_weights(unpacked_sort(np.concatenate([unpack_value_weights(reward) for reward in rewards])), length = 3)
                 self.erewards = pack_value_weights(unpacked_sort(np.concatenate([unpack_value_weights(ereward) for ereward in erewards])))
+                if perewards[0] is not None:
+                    self.perewards = pack_value_weights(unpacked_sort(np.concatenate([unpack_value_weights(pereward) for pereward in perewards])))
+                else:
+                    self.perewards = None
                 self.estates = pack_value_weights(unpacked_sort(np.concatenate([unpack_value_weights(estate) for estate in estates])))
             else:
                 self.reward_ages = rewards[0]
                 self.erewards = erewards[0]
+                self.perewards = perewards[0]
                 self.estates = estates[0]
 
             self.reward_initial = reward_initials[0]
+            self.num_timesteps = sum(num_timesteps)
 
             # https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance
             self.weight_sum = 0
@@ -360,17 +539,10 @@ class Evaluator(object):
         self.rewards = self.reward_ages[0:2]
 
         rew = weighted_mean(self.erewards)
-        try:
-            std = weighted_stdev(self.erewards)
-        except ZeroDivisionError:
-            std = float('nan')
-        try:
-            stderr = std / sqrt(len(self.erewards[0]))
-                # Standard error is ill-defined for a weighted sample.
-                # Here we are incorrectly assuming each episode carries equal weight.
-                # Use erewards rather than rewards because episode rewards are correlated.
-        except ZeroDivisionError:
-            stderr = float('nan')
+        serewards = self.erewards if self.perewards is None else self.perewards
+            # Antithetic episodes are negatively correlated, so compute the standard error from the pair means.
+        stderr = weighted_stderr(serewards)
+            # Use erewards rather than rewards because episode rewards are correlated.
         env = self.eval_envs[0].fin
         params = AttributeObject(env.params_dict)
         env.reset()
@@ -404,6 +576,7 @@ class Evaluator(object):
 
         del self.rewards # Conserve RAM.
         del self.erewards
+        del self.perewards
 
         age_rewards = np.vstack((self.reward_ages[2], self.reward_ages[0:2])) # Age row first.
         del self.reward_ages # Conserve RAM.
@@ -422,7 +595,7 @@ class Evaluator(object):
             ages.append(env.age + i * params.time_period)
         alive = {'age': ages, 'couple': env.alive_both, 'single': env.alive_one}
 
-        warnings = sorted(msg for msg, data in self.warnings.items() if data['count'] > data['timestep_ok_fraction'] * self.eval_num_timesteps)
+        warnings = sorted(msg for msg, data in self.warnings.items() if data['count'] > data['timestep_ok_fraction'] * self.num_timesteps)
 
         return {
             'couple': couple,
@@ -444,6 +617,7 @@ class Evaluator(object):
             'paths': self.trace,
             'alive': alive,
             'warnings': warnings,
+            'num_evaluate_timesteps': self.num_timesteps,
         }
 
     def pdf_cdf(self, what, value_weights, de_minus_low, low, high, step, f = lambda x: x, multiplier = 1):
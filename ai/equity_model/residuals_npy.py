@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+# AIPlanner - Deep Learning Financial Planner
+# Copyright (C) 2023 Gordon Irlam
+#
+# All rights reserved. This program may not be used, copied, modified,
+# or redistributed without permission.
+#
+# This program is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.
+
+# Convert the standardized residuals written by equity_model.py to the binary form memory mapped by the simulator.
+
+from argparse import ArgumentParser
+from csv import reader
+from os.path import splitext
+
+import numpy as np
+
+from gym_fin.returns_equity import residuals_digest
+
+parser = ArgumentParser(description = 'Convert standardized residuals from CSV to NumPy binary format.')
+parser.add_argument('--csv', default = 'standardized_residuals.csv', help = 'Input CSV file of residual, sigma_t pairs')
+args = parser.parse_args()
+
+with open(args.csv, 'rb') as f:
+    digest = residuals_digest(f.read())
+
+with open(args.csv) as f:
+    r = reader(f)
+    data = tuple((float(d[0]), float(d[1])) for d in r)
+
+np.save(splitext(args.csv)[0] + '-' + digest + '.npy', np.array(data, dtype = np.float64))
+    # Named by the digest of the CSV contents so the simulator never uses a .npy file that is out of date.
@@ -27,6 +27,8 @@ import numpy as np
 
 from setproctitle import setproctitle
 
+from spia import cache_stats
+
 from ai.common.api import parse_api_scenario
 from ai.common.cmd_util import arg_parser, fin_arg_parse, make_fin_env
 from ai.common.evaluator import Evaluator
@@ -34,6 +36,7 @@ from ai.common.scenario_space import allowed_gammas, enumerate_model_params_api,
 from ai.common.tf_util import TFRunner
 from ai.common.utils import AttributeObject, boolean_flag
 from ai.gym_fin.model_params import dump_params, load_params_file
+from ai.gym_fin.profiler import clear_profile_stats, enable_profiling, profile_stats
 
 def pi_merton(env, params, obs, continuous_time = False):
     observation = env.decode_observation(obs)
@@ -276,6 +279,10 @@ def eval_models(eval_model_params, *, api = [{}], daemon, api_content_length, st
                 print('Evaluation certainty equivalent:', res['ce_individual'], '+/-', res['ce_stderr_individual'],
                     '(80% confidence interval:', res['consume10_individual'], '-', str(res['consume90_individual']) + ')', file = out, flush = True)
 
+                if profile_stats():
+                    log_profile_stats(stderr if daemon else out)
+                    clear_profile_stats()
+
                 plot(prefix, res['paths'], res['consume_pdf'], res['consume_cdf'], res['estate_pdf'], res['estate_cdf'], res['consume_cr'], res['alive'])
 
                 final_results = dict(results[scenario_num]['results'][sub_num], **{
@@ -342,7 +349,8 @@ runner_cache = {}
 def eval_model(eval_model_params, *, daemon, merton, samuelson, opal, opal_file, address, allow_tensorflow, checkpoint_name,
     evaluate, warm_cache, eval_couple_net, eval_seed, eval_num_timesteps, eval_render,
     num_cpu, model, default_object_id, train_dirs, search_consume_initial_around, out,
-               aid, num_workers, num_environments, num_trace_episodes, pdf_buckets, pdf_smoothing_window, pdf_constant_initial_consume):
+               aid, num_workers, num_environments, num_trace_episodes, pdf_buckets, pdf_smoothing_window, pdf_constant_initial_consume,
+               common_random_numbers, antithetic, quasi_random, quasi_random_dimensions, eval_target_ce_stderr, eval_target_ce_stderr_relative):
 
     eval_seed += 1000 # Use a different seed than might have been used during training.
     # The next two lines should only be needed if we are attempting to evaluate variable scenarios, so that we get the same initial_results each time.
@@ -456,7 +464,10 @@ def eval_model(eval_model_params, *, daemon, merton, samuelson, opal, opal_file,
             envs.append(make_fin_env(**eval_model_params, direct_action = not model))
 
         evaluator = Evaluator(envs, eval_seed, eval_num_timesteps, remote_evaluators = remote_evaluators, render = eval_render,
-            num_trace_episodes = num_trace_episodes, pdf_buckets = pdf_buckets, pdf_smoothing_window = pdf_smoothing_window, pdf_constant_initial_consume = pdf_constant_initial_consume)
+            num_trace_episodes = num_trace_episodes, pdf_buckets = pdf_buckets, pdf_smoothing_window = pdf_smoothing_window, pdf_constant_initial_consume = pdf_constant_initial_consume,
+            common_random_numbers = common_random_numbers, antithetic = antithetic,
+            quasi_random = quasi_random, quasi_random_dimensions = quasi_random_dimensions,
+            target_ce_stderr = eval_target_ce_stderr, target_ce_stderr_relative = eval_target_ce_stderr_relative)
 
         def pi(obss):
 
@@ -740,6 +751,22 @@ def plot(prefix, traces, consume_pdf, consume_cdf, estate_pdf, estate_cdf, consu
     except CalledProcessError:
         assert not traces, 'Error ploting results.'
 
+def log_cache_stats(file):
+
+    for name, stats in sorted(cache_stats().items()):
+        print('AIPLANNER: cache', name, 'size:', stats['size'], '/', stats['capacity'], 'hits:', stats['hits'], 'misses:', stats['misses'],
+            'evictions:', stats['evictions'], 'instances:', stats['instances'], file = file)
+    file.flush()
+
+def log_profile_stats(file):
+
+    # Only covers environments stepped in this process, not those of any remote evaluators.
+    print('Phase profile:', file = file)
+    for phase, stats in sorted(profile_stats().items()):
+        print('    {:40s} {:10d} calls {:10.3f} seconds {:10.1f} microseconds per call'.format(phase, stats['count'], stats['time'],
+            stats['time'] / stats['count'] * 1e6), file = file)
+    print(file = file, flush = True)
+
 def main():
     parser = arg_parser(training = False)
     parser.add_argument('-d', '--daemon', action = "store_true", default = False)
@@ -772,7 +799,21 @@ def main():
     parser.add_argument('--pdf-buckets', type = int, default = 100) # Number of non de minus buckets to use in computing probability density distributions.
     parser.add_argument('--pdf-smoothing-window', type = float, default = 0.02) # Width of smoothing window to use in computing probability density distributions.
     boolean_flag(parser, 'pdf-constant-initial-consume', default = False) # Whether to include the initial consumption spike for retired scenarios in the consumption probability density distribution.
+    parser.add_argument('--eval-target-ce-stderr', type = float)
+        # Stop evaluating once the certainty equivalent standard error falls to this value. eval_num_timesteps is then the maximum timestep budget.
+    parser.add_argument('--eval-target-ce-stderr-relative', type = float) # Stop evaluating once the certainty equivalent standard error falls to this fraction of the certainty equivalent.
+    boolean_flag(parser, 'common-random-numbers', default = False)
+        # Give each evaluation episode its own random number stream derived from the evaluation seed, so evaluations of different policies see the same shocks.
+    boolean_flag(parser, 'antithetic', default = False) # Evaluate episodes in antithetic pairs with negated shocks. Implies common-random-numbers.
+    boolean_flag(parser, 'quasi-random', default = False)
+        # Take evaluation episode shocks from a scrambled Sobol sequence rather than pseudo-random numbers. Implies common-random-numbers.
+    parser.add_argument('--quasi-random-dimensions', type = int, default = 2048) # Dimensionality of the Sobol sequence; later shocks are pseudo-random.
+    boolean_flag(parser, 'log-cache-stats', default = False) # Daemon only. Log cache statistics to stderr after each request.
+    boolean_flag(parser, 'profile-phases', default = False) # Report time spent in each phase of the environment step and reset code.
     training_model_params, eval_model_params, args = fin_arg_parse(parser, training = False, dump = False)
+    log_cache = args.pop('log_cache_stats')
+    if args.pop('profile_phases'):
+        enable_profiling()
     setproctitle('evaluate' if args['evaluate'] else 'infer')
     if args['stdin']:
         args['daemon'] = True
@@ -809,6 +850,8 @@ def main():
                         continue
                     args = argv[1:] + split(line)
                     training_model_params, eval_model_params, args = fin_arg_parse(parser, training = False, dump = False, args = args)
+                    del args['log_cache_stats']
+                    del args['profile_phases']
                     args['warm_cache'] = False
                     api_content_length = args['api_content_length']
                     assert api_content_length is not None, 'No --api-content-length parameter.'
@@ -838,6 +881,8 @@ def main():
                 print('Content-Length:', len(results_str.encode('utf-8')))
                 stdout.write(results_str)
                 stdout.flush()
+                if log_cache:
+                    log_cache_stats(stderr)
 
 if __name__ == '__main__':
     main()
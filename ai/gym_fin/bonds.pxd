@@ -35,7 +35,12 @@ cdef class Bonds(BondsBase):
     cdef double time_period
 
     cdef double mean_short_interest_rate
-    cdef dict _sr_cache
+    cdef object _sr_cache
+    cdef object _grid
+    cdef list _grid_t
+    cdef list _grid_spot
+    cdef list _grid_B
+    cdef int _grid_len
 
     cdef double adjust
     cdef double sir_init
@@ -44,7 +49,9 @@ cdef class Bonds(BondsBase):
     cdef OUProcess oup
     cdef bint _lpv_cache_valid
     cdef double _lpv_cache
-    cdef dict _discount_cache
+    cdef bint _discount_grid_valid
+    cdef list _discount_grid
+    cdef object _discount_cache
 
     cdef object _short_interest_rate(self, bint next = ?)
 
@@ -84,7 +91,7 @@ cdef class Inflation(Bonds):
     cdef bint model_bond_volatility
 
     cdef double nominal_premium
-    cdef dict _sir_cache
+    cdef object _sir_cache
 
     cdef OUProcess inflation_oup
 
@@ -16,10 +16,67 @@ import numpy as np
 
 import cython
 
-from spia import YieldCurve
+from spia import LRUCache, YieldCurve, get_yield_curve
 
 from ai.gym_fin.factory_ou_process import make_ou_process
 
+class HullWhiteGrid(object):
+    '''Spot rates and Hull-White B(t) factors of a yield curve precomputed
+    at durations that are multiples of time_period, up to
+    max_duration.
+
+    Durations not on the grid have their spot rates looked up in
+    sr_cache and their B(t) factors computed as needed.
+
+    '''
+
+    def __init__(self, yield_curve, a, time_period, sr_cache, *, max_duration = 100):
+
+        e = exp(1)
+        n = int(max_duration / time_period + 0.5) + 1
+
+        self.yield_curve = yield_curve
+        self.a = a
+        self.time_period = time_period
+        self.sr_cache = sr_cache
+
+        self.t = [i * time_period for i in range(n)]
+        self.spot = [yield_curve.spot(t) for t in self.t]
+        self.B = [(1 - e ** (- a * t)) / a for t in self.t] # Same expression as Bonds._log_present_value() so results are identical.
+
+        self.t_array = np.array(self.t)
+        self.spot_array = np.array(self.spot)
+        self.B_array = np.array(self.B)
+
+    def lookup(self, durations):
+        '''Return arrays of the spot rates and B(t) factors for the array of
+        durations.
+
+        '''
+
+        durations = np.asarray(durations, dtype = float)
+        i = np.rint(durations / self.time_period).astype(int)
+        on_grid = (i >= 0) & (i < len(self.t))
+        i = np.where(on_grid, i, 0)
+        on_grid &= self.t_array[i] == durations
+        if on_grid.all():
+            return self.spot_array[i], self.B_array[i]
+
+        spot = np.where(on_grid, self.spot_array[i], 0.0)
+        B = np.where(on_grid, self.B_array[i], 0.0)
+        e = exp(1)
+        for j in np.flatnonzero(~ on_grid):
+            t = float(durations.flat[j])
+            try:
+                sr = self.sr_cache[t]
+            except KeyError:
+                sr = self.yield_curve.spot(t)
+                self.sr_cache[t] = sr
+            spot.flat[j] = sr
+            B.flat[j] = (1 - e ** (- self.a * t)) / self.a
+
+        return spot, B
+
 @cython.cclass
 class BondsBase:
 
@@ -47,6 +104,22 @@ class BondsBase:
 
         assert False
 
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+
+        assert False
+
+    def set_path_length(self, path_length):
+
+        assert False
+
+    def snapshot(self):
+
+        assert False
+
+    def restore(self, state):
+
+        assert False
+
     @cython.locals(t = cython.double)
     def discount_rate(self, t):
 
@@ -117,10 +190,21 @@ class Bonds(BondsBase):
         self.oup = make_ou_process(self.time_period, self.a, self.sigma)
             # Underlying random movement in short interest rates.
 
-        self._sr_cache = {}
+        self._sr_cache = LRUCache('bonds_spot')
+        self._discount_cache = LRUCache('bonds_discount')
+        self._set_grid(HullWhiteGrid(self.yield_curve, self.a, self.time_period, self._sr_cache))
 
         self.reset()
 
+    def _set_grid(self, grid):
+
+        self._grid = grid
+        self._grid_t = grid.t
+        self._grid_spot = grid.spot
+        self._grid_B = grid.B
+        self._grid_len = len(grid.t)
+        self._discount_grid_valid = False
+
     def reset(self):
 
         self.adjust = normalvariate(0, self.standard_error)
@@ -140,7 +224,8 @@ class Bonds(BondsBase):
 
         self._lpv_cache_valid = False
         self._lpv_cache = -1
-        self._discount_cache = {}
+        self._discount_grid_valid = False
+        self._discount_cache.clear()
 
     @cython.locals(next = cython.bint)
     def _short_interest_rate(self, next = False):
@@ -167,20 +252,46 @@ class Bonds(BondsBase):
             self._lpv_cache = sir
 
         #  https://en.wikipedia.org/wiki/Hull%E2%80%93White_model P(0, T).
-        sr: cython.double; log_P: cython.double; ex: cython.double; B: cython.double
-        try:
-            sr = self._sr_cache[t]
-        except KeyError:
-            sr = self.yield_curve.spot(t)
-            if len(self._sr_cache) < 1000:
+        sr: cython.double; log_P: cython.double; ex: cython.double; B: cython.double; i: cython.int
+        i = int(t / self.time_period + 0.5)
+        if 0 <= i < self._grid_len and self._grid_t[i] == t:
+            sr = self._grid_spot[i]
+            B = self._grid_B[i]
+        else:
+            try:
+                sr = self._sr_cache[t]
+            except KeyError:
+                sr = self.yield_curve.spot(t)
                 self._sr_cache[t] = sr
+            ex = self.e ** (- self.a * t)
+            B = (1 - ex) / self.a
         log_P = - t * (sr + self.adjust)
-        ex = self.e ** (- self.a * t)
-        B = (1 - ex) / self.a
         log_P += B * (self.sir_init - sir)
 
         return log_P
 
+    def _short_interest_rates(self, sir):
+        '''Return the column vector of short interest rates corresponding to
+        the array of underlying short interest rates sir.
+
+        '''
+
+        return np.asarray(sir)[:, np.newaxis]
+
+    def log_present_values(self, durations, next = False, sir = None):
+        '''Vectorized _log_present_value() for the array durations.
+
+        If sir is supplied it is an array of short interest rates to use
+        in place of the current short interest rate, and the result has
+        a row for each short interest rate.
+
+        '''
+
+        spot, B = self._grid.lookup(durations)
+        sir = self._short_interest_rate(next) if sir is None else self._short_interest_rates(sir)
+
+        return - np.asarray(durations, dtype = float) * (spot + self.adjust) + B * (self.sir_init - sir)
+
     @cython.locals(t = cython.double)
     def discount_rate(self, t):
         '''Return 1 + the annual spot discount rate of a zero coupon bond
@@ -188,7 +299,14 @@ class Bonds(BondsBase):
 
         '''
 
-        dr: cython.double
+        dr: cython.double; i: cython.int
+        i = int(t / self.time_period + 0.5)
+        if 0 <= i < self._grid_len and self._grid_t[i] == t:
+            if not self._discount_grid_valid:
+                self._discount_grid = self.discount_rates(self._grid.t_array).tolist()
+                self._discount_grid_valid = True
+            return self._discount_grid[i]
+
         try:
             dr = self._discount_cache[t]
         except KeyError:
@@ -199,11 +317,24 @@ class Bonds(BondsBase):
             else:
                 lpv = self._short_interest_rate()
             dr = self.e ** lpv
-            if len(self._discount_cache) < 1000:
-                self._discount_cache[t] = dr
+            self._discount_cache[t] = dr
 
         return dr
 
+    def discount_rates(self, durations, sir = None):
+        '''Vectorized discount_rate() for the array durations, and optionally
+        an array of short interest rates sir.
+
+        '''
+
+        durations = np.asarray(durations, dtype = float)
+        lpv = self.log_present_values(durations, sir = sir)
+        short = self._short_interest_rate() if sir is None else self._short_interest_rates(sir)
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            rate = np.where(durations > 0, - lpv / durations, short)
+
+        return np.power(self.e, rate)
+
     def _yield(self, t):
         '''Return the current continuously compounded yield of a zero coupon
         bond paying 1 at time t.
@@ -227,6 +358,21 @@ class Bonds(BondsBase):
 
         return self.e ** (nxt - cur)
 
+    def samples(self, durations, sir = None, next_sir = None):
+        '''Vectorized sample() for the array durations, and optionally arrays
+        of current and next short interest rates sir and next_sir. Either
+        both or neither of sir and next_sir must be supplied.
+
+        '''
+
+        durations = np.asarray(durations, dtype = float)
+        assert np.all(durations >= self.time_period)
+
+        nxt = self.log_present_values(durations - self.time_period, True, next_sir)
+        cur = self.log_present_values(durations, False, sir)
+
+        return np.power(self.e, nxt - cur)
+
     def step(self):
 
         if self.static_bonds:
@@ -234,9 +380,45 @@ class Bonds(BondsBase):
 
         self.t += self.time_period
         self._lpv_cache_valid = False
-        self._discount_cache = {}
+        self._discount_grid_valid = False
+        self._discount_cache.clear()
         self.oup.step()
 
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+        '''Discard any buffered stochastic shocks, and set whether future
+        shocks are negated. If quasi is a QuasiStream take future shocks
+        from it. If random_state is a NumPy RandomState draw pseudo-random
+        shocks from it rather than the NumPy global generator.
+
+        '''
+
+        self.oup.reset_random(antithetic, quasi, random_state)
+
+    def set_path_length(self, path_length):
+        '''Generate whole short rate paths of path_length steps at each
+        reset, rather than one step at a time.
+
+        '''
+
+        if not self.static_bonds: # Static bonds are never stepped.
+            self.oup.set_path_length(path_length)
+
+    def snapshot(self):
+        '''Return the state of the short rate model as a tuple.'''
+
+        return (self.adjust, self.sir_init, self.sir0, self.t, self.oup.snapshot())
+
+    def restore(self, state):
+        '''Restore the short rate model to a state returned by snapshot().'''
+
+        oup_state: tuple
+        self.adjust, self.sir_init, self.sir0, self.t, oup_state = state
+        self.oup.restore(oup_state)
+
+        self._lpv_cache_valid = False
+        self._discount_grid_valid = False
+        self._discount_cache.clear()
+
     def _report(self):
 
         durations = (1, 2, 5, 7, 10, 15, 20, 30)
@@ -503,7 +685,7 @@ class Inflation(Bonds):
         self.nominal_premium = self.inflation_risk_premium - self.real_liquidity_premium
         deflated_yield_curve = YieldCurveSum(nominal_yield_curve, real_bonds.yield_curve, weight = -1, offset = - self.nominal_premium)
 
-        self._sir_cache = {}
+        self._sir_cache = LRUCache('inflation_short_rate')
 
         if not self.model_bond_volatility:
             # Inflation model OU Process tracks modeled nominal bond standard deviation OU Process.
@@ -522,7 +704,8 @@ class Inflation(Bonds):
         super().reset()
 
         if not self.model_bond_volatility:
-            self.inflation_oup.reset(mu = self.sir_init, x = self.sir0, norm = self.oup.norm)
+            # Follow the shocks of the whole path if one was generated.
+            self.inflation_oup.reset(mu = self.sir_init, x = self.sir0, norm = self.oup._path_norms if self.oup._path_len > 0 else self.oup.norm)
         else:
             self.inflation_oup = self.oup
 
@@ -539,8 +722,7 @@ class Inflation(Bonds):
             # ex = self.e ** (- a * t)
             # sir = forward + (sigma * (1 - ex) / a) ** 2 / 2
             sir = self.yield_curve.forward(t)
-            if len(self._sir_cache) < 1000:
-                self._sir_cache[t] = sir
+            self._sir_cache[t] = sir
 
         return sir
 
@@ -588,12 +770,7 @@ class Inflation(Bonds):
 
         #  https://en.wikipedia.org/wiki/Hull%E2%80%93White_model P(0, T).
         sr: cython.double; log_P: cython.double; ex: cython.double; B: cython.double
-        try:
-            sr = self._sr_cache[t]
-        except KeyError:
-            sr = self.yield_curve.spot(t)
-            if len(self._sr_cache) < 1000:
-                self._sr_cache[t] = sr
+        sr = self._grid_spot[1] # Spot rate at duration time_period.
         log_P = - t * (sr + self.adjust)
         ex = self.e ** (- self.inflation_a * t)
         B = (1 - ex) / self.inflation_a
@@ -614,7 +791,33 @@ class Inflation(Bonds):
 
         super(Inflation, self).step()
         if not self.model_bond_volatility:
-            self.inflation_oup.step(norm = self.oup.norm)
+            if self.inflation_oup._path_index < self.inflation_oup._path_len:
+                self.inflation_oup.step()
+            else:
+                self.inflation_oup.step(norm = self.oup.norm)
+
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+
+        super().reset_random(antithetic, quasi, random_state)
+        if not self.model_bond_volatility:
+            self.inflation_oup.reset_random(antithetic, quasi, random_state)
+
+    def set_path_length(self, path_length):
+
+        super().set_path_length(path_length)
+        if not self.model_bond_volatility and not self.static_bonds:
+            self.inflation_oup.set_path_length(path_length)
+
+    def snapshot(self):
+
+        return (super().snapshot(), None if self.model_bond_volatility else self.inflation_oup.snapshot())
+
+    def restore(self, state):
+
+        bonds_state, inflation_oup_state = state
+        super().restore(bonds_state)
+        if not self.model_bond_volatility:
+            self.inflation_oup.restore(inflation_oup_state)
 
     def observe(self):
 
@@ -660,7 +863,7 @@ inflation_rate = {
 @cython.cclass
 class NominalBonds(Bonds):
 
-    @cython.locals(inflation = Inflation)
+    @cython.locals(real_bonds = Bonds, inflation = Inflation)
     def __init__(self, real_bonds, inflation, *, real_bonds_adjust = 0, nominal_bonds_adjust = 0, time_period = 1):
 
         self.real_bonds = real_bonds
@@ -675,6 +878,9 @@ class NominalBonds(Bonds):
 
         self.yield_curve = YieldCurveSum(inflation.nominal_yield_curve, inflation.nominal_yield_curve, weight = 0, offset = self.nominal_bonds_adjust - self.real_bonds_adjust) # Only used by _report() for expected values.
 
+        self._discount_cache = LRUCache('bonds_discount')
+        self._set_grid(real_bonds._grid) # Only the grid durations are used.
+
         self.reset()
 
     def reset(self):
@@ -682,7 +888,8 @@ class NominalBonds(Bonds):
         self.real_bonds.reset()
         self.inflation.reset()
 
-        self._discount_cache = {}
+        self._discount_grid_valid = False
+        self._discount_cache.clear()
 
     def _short_interest_rate(self, next = False):
 
@@ -699,6 +906,30 @@ class NominalBonds(Bonds):
         inflation_pv = self.inflation._log_present_value(t, next)
         return real_pv + inflation_pv - (self.inflation.nominal_premium + self.nominal_bonds_adjust) * t
 
+    def _short_interest_rates(self, sir):
+        '''sir is a pair of arrays of real and inflation short interest
+        rates.
+
+        '''
+
+        real_sir, inflation_sir = sir
+
+        return self.real_bonds._short_interest_rates(real_sir) - self.real_bonds_adjust + self.inflation._short_interest_rates(inflation_sir) + \
+            self.inflation.nominal_premium + self.nominal_bonds_adjust
+
+    def log_present_values(self, durations, next = False, sir = None):
+        '''Vectorized _log_present_value(). sir, if supplied, is a pair of
+        arrays of real and inflation short interest rates.
+
+        '''
+
+        real_sir, inflation_sir = (None, None) if sir is None else sir
+        durations = np.asarray(durations, dtype = float)
+        real_pv = self.real_bonds.log_present_values(durations, next, real_sir)
+        inflation_pv = self.inflation.log_present_values(durations, next, inflation_sir)
+
+        return real_pv + inflation_pv - (self.inflation.nominal_premium + self.nominal_bonds_adjust) * durations
+
     def _yield(self, t):
 
         _yield = super()._yield(t)
@@ -717,12 +948,52 @@ class NominalBonds(Bonds):
 
         return real_sample * inflation_sample * period_inflation_reduction
 
+    def samples(self, durations, sir = None, next_sir = None):
+        '''Vectorized sample(). sir and next_sir, if supplied, are pairs of
+        arrays of real and inflation short interest rates.
+
+        '''
+
+        real_sir, inflation_sir = (None, None) if sir is None else sir
+        real_next_sir, inflation_next_sir = (None, None) if next_sir is None else next_sir
+        real_samples = self.real_bonds.samples(durations, real_sir, real_next_sir)
+        inflation_samples = self.inflation.samples(durations, inflation_sir, inflation_next_sir)
+        inflation_log_pv = self.inflation.log_present_values((self.time_period, ), sir = inflation_sir)
+        period_inflation_reduction = np.power(self.e,
+            inflation_log_pv + (self.inflation.nominal_premium + self.nominal_bonds_adjust - self.real_bonds_adjust) * self.time_period)
+
+        return real_samples * inflation_samples * period_inflation_reduction
+
     def step(self):
 
         self.real_bonds.step()
         self.inflation.step()
 
-        self._discount_cache = {}
+        self._discount_grid_valid = False
+        self._discount_cache.clear()
+
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+
+        self.real_bonds.reset_random(antithetic, quasi, random_state)
+        self.inflation.reset_random(antithetic, quasi, random_state)
+
+    def set_path_length(self, path_length):
+
+        self.real_bonds.set_path_length(path_length)
+        self.inflation.set_path_length(path_length)
+
+    def snapshot(self):
+
+        return (self.real_bonds.snapshot(), self.inflation.snapshot())
+
+    def restore(self, state):
+
+        real_bonds_state, inflation_state = state
+        self.real_bonds.restore(real_bonds_state)
+        self.inflation.restore(inflation_state)
+
+        self._discount_grid_valid = False
+        self._discount_cache.clear()
 
     def observe(self):
 
@@ -792,11 +1063,38 @@ class BondsMeasuredInNominalTerms(Bonds):
 
         return sample / period_inflation
 
+    def samples(self, durations):
+
+        samples = self.bonds.samples(durations)
+        period_inflation = np.exp(self.inflation.log_present_values((self.time_period, )))
+
+        return samples / period_inflation
+
     def step(self):
 
         self.bonds.step()
         self.inflation.step()
 
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+
+        self.bonds.reset_random(antithetic, quasi, random_state)
+        self.inflation.reset_random(antithetic, quasi, random_state)
+
+    def set_path_length(self, path_length):
+
+        self.bonds.set_path_length(path_length)
+        self.inflation.set_path_length(path_length)
+
+    def snapshot(self):
+
+        return (self.bonds.snapshot(), self.inflation.snapshot())
+
+    def restore(self, state):
+
+        bonds_state, inflation_state = state
+        self.bonds.restore(bonds_state)
+        self.inflation.restore(inflation_state)
+
     def _deflate(self, yield_curve):
 
         return YieldCurve('nominal', yield_curve.date, date_str_low = yield_curve.date_low)
@@ -861,6 +1159,27 @@ class BondsSet:
 
                 Advance by time time_period.
 
+            snapshot() and restore(state)
+
+                Capture and reinstate the state of the model. Random
+                number generator state is not captured.
+
+            reset_random(antithetic = False, quasi = None, random_state = None)
+
+                Discard any buffered random numbers, and set whether
+                future stochastic shocks are negated. If quasi is a
+                QuasiStream the shocks for the next quasi.steps steps
+                are taken from it. If random_state is a NumPy
+                RandomState any NumPy drawn shocks are taken from it
+                rather than the NumPy global generator.
+
+            set_path_length(path_length)
+
+                Generate whole short rate paths of path_length steps
+                in one vectorized call at each reset(), with step()
+                then just advancing along the path. Zero, the default,
+                to generate the short rates one step at a time.
+
             discount_rate(t)
 
                 Return the 1 + the annualized spot rate over term t
@@ -875,6 +1194,19 @@ class BondsSet:
                 for duration. Calling with the same value will return
                 the same result, unless step() is also called.
 
+            discount_rates(durations, sir = None) and
+            samples(durations, sir = None, next_sir = None)
+
+                Vectorized versions of discount_rate() and sample()
+                evaluated for an array of durations in one NumPy
+                call. Spot rates and Hull-White B(t) factors are
+                precomputed once per yield curve for durations that
+                are multiples of time_period. If arrays of short
+                interest rates are supplied the result has a row for
+                each short interest rate. For nominal bonds sir and
+                next_sir are pairs of real and inflation short interest
+                rate arrays.
+
             observe()
 
                 Returns current short real interest rate or short
@@ -915,9 +1247,9 @@ class BondsSet:
         if need_real:
             if fixed_real_bonds_rate != -1:
                 adjust = (1 + fixed_real_bonds_rate) * (1 + real_bonds_adjust) - 1
-                yield_curve = YieldCurve('fixed', '2017-12-31', adjust = adjust)
+                yield_curve = get_yield_curve('fixed', '2017-12-31', adjust = adjust)
             else:
-                yield_curve = YieldCurve('real', date_str, date_str_low = date_str_low, adjust = real_bonds_adjust, permit_stale_days = 2)
+                yield_curve = get_yield_curve('real', date_str, date_str_low = date_str_low, adjust = real_bonds_adjust, permit_stale_days = 2)
             self.real = RealBonds(yield_curve = yield_curve, static_bonds = static_bonds, r0_type = real_r0_type, r0 = real_short_rate,
                 standard_error = real_standard_error, time_period = time_period)
         else:
@@ -926,9 +1258,9 @@ class BondsSet:
         if need_inflation:
             if fixed_nominal_bonds_rate != -1:
                 adjust = (1 + fixed_nominal_bonds_rate) * (1 + real_bonds_adjust) - 1
-                nominal_yield_curve = YieldCurve('fixed', '2017-12-31', adjust = adjust)
+                nominal_yield_curve = get_yield_curve('fixed', '2017-12-31', adjust = adjust)
             else:
-                nominal_yield_curve = YieldCurve('nominal', date_str, date_str_low = date_str_low, adjust = real_bonds_adjust, permit_stale_days = 2)
+                nominal_yield_curve = get_yield_curve('nominal', date_str, date_str_low = date_str_low, adjust = real_bonds_adjust, permit_stale_days = 2)
             inflation_risk_premium = - log(1 + inflation_adjust)
             self.inflation = Inflation(self.real, nominal_yield_curve = nominal_yield_curve, inflation_risk_premium = inflation_risk_premium,
                 r0_type = inflation_r0_type, r0 = inflation_short_rate,
@@ -949,6 +1281,14 @@ class BondsSet:
         else:
             self.corporate = None
 
+    def set_path_length(self, path_length):
+        '''Set the path length of all the stochastic bond models.'''
+
+        if self.real:
+            self.real.set_path_length(path_length)
+        if self.inflation:
+            self.inflation.set_path_length(path_length)
+
 def main():
 
     seed(0)
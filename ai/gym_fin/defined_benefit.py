@@ -165,6 +165,18 @@ class DefinedBenefit:
         if self.spia_retired is not None:
             self.spia_retired.set_age(age, alive, alive2)
 
+    def snapshot(self):
+
+        return (None if self.spia_preretirement is None else self.spia_preretirement.clone(),
+                None if self.spia_retired is None else self.spia_retired.clone())
+
+    def restore(self, state):
+
+        spia_preretirement: IncomeAnnuity; spia_retired: IncomeAnnuity
+        spia_preretirement, spia_retired = state
+        self.spia_preretirement = None if spia_preretirement is None else spia_preretirement.clone()
+        self.spia_retired = None if spia_retired is None else spia_retired.clone()
+
     def render(self, cpi):
 
         payout = self.payout(cpi)
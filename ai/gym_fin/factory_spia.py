@@ -11,7 +11,7 @@
 # This file exists to work around a Cython bug.
 # Namely we can't directly perform any the imports below in fin.py because fin.pxd needs to cimport the same imports causing a conflict.
 
-from spia import IncomeAnnuity, LifeTable, YieldCurve
+from spia import IncomeAnnuity, LifeTable, get_yield_curve
 
 def make_income_annuity(*args, **kwargs):
     
@@ -23,4 +23,4 @@ def make_life_table(*args, **kwargs):
 
 def make_yield_curve(*args, **kwargs):
     
-    return YieldCurve(*args, **kwargs)
+    return get_yield_curve(*args, **kwargs)
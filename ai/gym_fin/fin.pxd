@@ -32,6 +32,8 @@ cdef class Fin:
     cdef double _age2
     cdef double _age_retirement
     cdef double _age_start
+    cdef bint _antithetic
+    cdef object _quasi_dead_at
     cdef list _alive_both
     cdef list _alive_count
     cdef list _alive_one
@@ -91,9 +93,10 @@ cdef class Fin:
     cdef list _observation_space_items
     cdef list _observation_space_low
     cdef object _observation_space_low_np
-    cdef list _observation_space_range_exceeded
-    cdef list _observation_space_scale
-    cdef list _observation_space_shift
+    cdef object _observation_space_range_exceeded
+    cdef object _observation_space_scale_np
+    cdef object _observation_space_shift_np
+    cdef object _observe_scratch
     cdef bint _only_alive2
     cdef double _p_fraction
     cdef double _p_plus_income
@@ -106,6 +109,7 @@ cdef class Fin:
     cdef FinParams _params
     cdef dict _params_dict
     cdef Policy _policy
+    cdef object _profiler
     cdef double _preretirement_income_wealth
     cdef double _preretirement_years
     cdef AssetAllocation _prev_asset_allocation
@@ -16,14 +16,19 @@ from os import environ
 from os.path import expanduser
 from random import seed, randint, random, uniform, lognormvariate
 from sys import stderr, stdout
+from time import perf_counter
 
 import numpy as np
 
 import cython
 
+from spia import LRUCache
+
 from ai.gym_fin.asset_classes import AssetClasses
 from ai.gym_fin.factory import make_asset_allocation, make_bonds_set, make_defined_benefit, make_fin_params, make_policy, make_taxes, make_utility
 from ai.gym_fin.factory_spia import make_income_annuity, make_life_table, make_yield_curve
+from ai.gym_fin.persistent_cache import get_persistent_cache
+from ai.gym_fin.profiler import get_profiler
 from ai.gym_fin.returns_equity import ReturnsEquity, ReturnsIID, percentiles_report, returns_report, yields_report
 from ai.gym_fin.returns_sample import ReturnsSample
 
@@ -173,158 +178,216 @@ class Fin:
                 'timestep_ok_fraction': timestep_ok_fraction,
             }
 
-    _vital_stats_cache = {}
+    _survival_cache = LRUCache('fin_survival')
+
+    def _survival_key(self, second, age_start):
+
+        life_table = self._life_table2 if second else self._life_table
+        return (self._params.life_table, self._sex2 if second else self._params.sex, age_start, life_table.age_add,
+            self._params.life_table_date, self._death_age, self._params.life_table_interpolate_q)
 
-    def _compute_vital_stats(self, age_start, age_start2, key):
+    def _survival_q(self, second, age_start, start_decimal_year):
+        '''Annual q values for one individual up to but excluding the first
+        year in which q is 1.
 
-        if self._sex2 or self._info_rollouts or not self._params.probabilistic_life_expectancy:
-            # Can't cache vital stats for couple as would loose random rollouts of couple expectancy.
-            # Additionally would need to save _life_expectancy_one and _life_expectancy_both as they get clobbered below.
-            # Can't cache vital stats if info rollouts as _alive_count wouldn't get updated.
-            key = None
+        '''
+        life_table = self._life_table2 if second else self._life_table
+        key = self._survival_key(second, age_start)
 
         try:
 
-            vs = Fin._vital_stats_cache[key]
+            qs = Fin._survival_cache[key]
 
         except KeyError:
 
-            start_date = datetime.strptime(self._params.life_table_date, '%Y-%m-%d')
-            this_year = datetime(start_date.year, 1, 1)
-            next_year = datetime(start_date.year + 1, 1, 1)
-            start_decimal_year = start_date.year + (start_date - this_year) / (next_year - this_year)
+            years = 128
+            while True:
+                y = np.arange(years)
+                qs = life_table.q_array(age_start + y, years = start_decimal_year + y)
+                dead = np.flatnonzero(qs == 1)
+                if len(dead) > 0:
+                    qs = qs[:dead[0]]
+                    break
+                years *= 2
 
-            alive_both = [1 if self._sex2 else 0] # Probability across all rollouts.
-            alive_one = [0 if self._sex2 else 1] # Probability across all rollouts.
-            _alive = 1
-            _alive2 = 1
+            Fin._survival_cache[key] = qs
 
-            alive_single = [-1 if self._sex2 else 1] # Probability for this couple rollout. -1 if couple.
-            _alive_single = -1 if self._sex2 else 1
-            dead = False
-            dead2 = self._sex2 is None
-            dead_at = random()
-            dead_at2 = random()
-            only_alive2 = False
+        return qs
 
-            alive_count = [2 if self._sex2 else 1] # Mock count of number of individuals alive. Only used for plots, for computations use alive_single probability.
-            _alive_count = 2 if self._sex2 else 1
+    _vital_stats_cache = LRUCache('fin_vital_stats')
 
-            y = 0
-            q_y = -1
-            q = 0
-            q2 = 0
-            remaining_fract = 0
-            a_y = self._params.time_period
-            while True:
-                append_time = a_y - y
-                fract = min(remaining_fract, append_time)
-                prev_alive = _alive
-                prev_alive2 = _alive2
-                q_fract = (1 - q) ** fract
-                _alive *= q_fract
-                q_fract2 = (1 - q2) ** fract
-                _alive2 *= q_fract2
-                if not (dead or dead2):
-                    dead = _alive < dead_at
-                    dead2 = dead if self._params.couple_death_concordant else _alive2 < dead_at2
-                    if dead and dead2:
-                        _alive_single = 0
-                        _alive_count = 0
-                    elif dead:
-                        only_alive2 = True
-                        _alive_single = q_fract2 ** ((dead_at - _alive) / (prev_alive - _alive))
-                        _alive_count = 1
-                    elif dead2:
-                        _alive_single = q_fract ** ((dead_at2 - _alive2) / (prev_alive2 - _alive2))
-                        _alive_count = 1
-                elif dead:
-                    _alive_single *= q_fract2
-                    if _alive2 < dead_at2:
-                        _alive_count = 0
-                elif dead2:
-                    _alive_single *= q_fract
-                    if _alive < dead_at:
-                        _alive_count = 0
-                remaining_fract -= fract
-                y += fract
-                if y >= a_y:
-                    alive_both.append(_alive * _alive2)
-                    alive_one.append(1 - _alive * _alive2 - (1 - _alive) * (1 - _alive2))
-                    alive_single.append(_alive_single)
-                    alive_count.append(_alive_count)
-                    a_y += self._params.time_period
-                if y - q_y >= 1:
-                    q_y += 1
-                    q = self._life_table.q(age_start + q_y, year = start_decimal_year + q_y)
-                    if self._sex2:
-                        q2 = self._life_table2.q(age_start2 + q_y, year = start_decimal_year + q_y)
-                    else:
-                        q2 = 1
-                    remaining_fract = 1
-                    if q == q2 == 1:
-                        break
-
-            alive_either = tuple(alive_one[i] + alive_both[i] for i in range(len(alive_one)))
-
-            life_expectancy_both = self._sums_to_end(alive_both, 0, alive_both)
-            life_expectancy_one = self._sums_to_end(alive_one, 0, alive_either)
-            life_expectancy_single = self._sums_to_end(alive_single, 0, alive_single)
-
-            percentile = 0.8
-            alive_weighted = list(alive_one[i] + alive_both[i] * (1 + self._params.consume_additional) for i in range(len(alive_one)))
-            alive_weighted.append(0)
-            life_percentile = []
-            j = len(alive_weighted) - 1
-            for i in range(len(alive_weighted) - 1, -1, -1):
-                target = (1 - percentile) * alive_weighted[i]
-                while alive_weighted[j] <= target and j >= i:
-                    j -= 1
+    def _compute_vital_stats(self, age_start, age_start2):
+
+        # Deterministic survival curves are cached; the random rollout of death times is performed separately for each episode.
+        couple = self._sex2 is not None
+        key = (self._survival_key(False, age_start), self._survival_key(True, age_start2) if couple else None,
+            self._params.time_period, self._params.consume_additional)
+
+        try:
+
+            vs = Fin._vital_stats_cache[key]
+
+        except KeyError:
+
+            vs = None
+            if self._params.persistent_cache:
                 try:
-                    partial = (alive_weighted[j] - target) / (alive_weighted[j] - alive_weighted[j + 1])
-                except (IndexError, ZeroDivisionError):
-                    partial = 0
-                life_percentile.insert(0, (j - i + 1 + partial) * self._params.time_period)
+                    vs = get_persistent_cache('fin_vital_stats')[key]
+                except KeyError:
+                    pass
+
+            if vs is None:
+
+                start_date = datetime.strptime(self._params.life_table_date, '%Y-%m-%d')
+                this_year = datetime(start_date.year, 1, 1)
+                next_year = datetime(start_date.year + 1, 1, 1)
+                start_decimal_year = start_date.year + (start_date - this_year) / (next_year - this_year)
 
-            alive_single.append(0.0)
-            alive_count.append(0)
+                q = self._survival_q(False, age_start, start_decimal_year)
+                q2 = self._survival_q(True, age_start2, start_decimal_year) if couple else np.zeros(0)
+                vs = self._survival_curves(q, q2, couple)
 
-            if not self._params.probabilistic_life_expectancy:
-                alive_single = [-1 if _alive_count == 2 else _alive_count for _alive_count in alive_count]
+                if self._params.persistent_cache:
+                    get_persistent_cache('fin_vital_stats')[key] = vs
 
-            vs = alive_both, alive_one, only_alive2, alive_single, alive_count, \
-                life_expectancy_both, life_expectancy_one, life_expectancy_single, life_percentile
+            Fin._vital_stats_cache[key] = vs
 
-            if key is not None and len(Fin._vital_stats_cache) < 1000:
-                Fin._vital_stats_cache[key] = vs
+        alive, alive2, q_fract, q_fract2, step_pieces, alive_both, alive_one, life_expectancy_both, life_expectancy_one, life_percentile = vs
+
+        only_alive2, alive_single, alive_count, life_expectancy_single = self._sample_vital_stats(alive, alive2, q_fract, q_fract2, step_pieces, couple)
 
         # np.arrays allow cython.double[:] memory view access which is very fast, but isn't used because memory views can't be pickled.
         # If using np.arrays for memory view access have to ensure returned value is converted to a cython.double otherwise indexing is slow
         # and calculations using numpy.float64 will propagate and are also slow.
         # This can be done by typing the variable the value is assigned to as a cython.double when runing under Cython, or using float() for cPython.
-        self._alive_both, self._alive_one, self._only_alive2, self._alive_single, self._alive_count, \
-            self._life_expectancy_both, self._life_expectancy_one, self._life_expectancy_single, self._life_percentile = vs
+        # Cached lists are shared, but are only ever replaced, never modified in place.
+        self._alive_both = alive_both
+        self._alive_one = alive_one
+        self._only_alive2 = only_alive2
+        self._alive_single = alive_single
+        self._alive_count = alive_count
+        self._life_expectancy_both = life_expectancy_both
+        self._life_expectancy_one = life_expectancy_one
+        self._life_expectancy_single = life_expectancy_single
+        self._life_percentile = life_percentile
+
+    def _survival_curves(self, q, q2, couple):
+
+        time_period = self._params.time_period
+
+        # Annual q values up to the first year in which no one survives.
+        years = max(len(q), len(q2))
+        q = np.concatenate((q, np.ones(years + 1 - len(q))))
+        q2 = np.concatenate((q2, np.ones(years + 1 - len(q2))))
+
+        # Survival is computed over pieces delimited by both time steps and year boundaries, so that q applies to whole pieces.
+        steps = int(floor(years / time_period + 1e-9))
+        step_times = time_period * np.arange(1, steps + 1)
+        times = np.unique(np.round(np.concatenate((step_times, np.arange(1, years + 1))), 9))
+        times = np.concatenate(((0.0, ), times))
+        fract = np.diff(times)
+        year_index = np.floor(times[:-1] + 1e-9).astype(int)
+        q_fract = (1 - q[year_index]) ** fract
+        q_fract2 = (1 - q2[year_index]) ** fract
+        alive = np.concatenate(((1.0, ), np.cumprod(q_fract)))
+        alive2 = np.concatenate(((1.0, ), np.cumprod(q_fract2)))
+        step_pieces = np.concatenate(((0, ), np.searchsorted(times, np.round(step_times, 9) - 1e-9)))
+
+        # Probabilities across all rollouts.
+        alive_both_np = alive[step_pieces] * alive2[step_pieces]
+        alive_one_np = 1 - alive_both_np - (1 - alive[step_pieces]) * (1 - alive2[step_pieces])
+        alive_both_np[0] = 1 if couple else 0
+        alive_one_np[0] = 0 if couple else 1
+        alive_both = alive_both_np.tolist()
+        alive_one = alive_one_np.tolist()
+
+        alive_either = alive_one_np + alive_both_np
+
+        life_expectancy_both = self._sums_to_end(alive_both_np, alive_both_np)
+        life_expectancy_one = self._sums_to_end(alive_one_np, alive_either)
+
+        percentile = 0.8
+        alive_weighted = alive_one_np + alive_both_np * (1 + self._params.consume_additional)
+        alive_weighted = np.concatenate((alive_weighted, (0.0, )))
+        # Last index whose weight exceeds the target, bounded below by the index one before the start.
+        target = (1 - percentile) * alive_weighted
+        i = np.arange(len(alive_weighted))
+        j = np.maximum(np.searchsorted(- alive_weighted, - target, side = 'left') - 1, i - 1)
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            partial = (alive_weighted[j] - target) / (alive_weighted[j] - alive_weighted[j + 1])
+        partial[alive_weighted[j] == alive_weighted[j + 1]] = 0
+        life_percentile = ((j - i + 1 + partial) * time_period).tolist()
+
+        return alive, alive2, q_fract, q_fract2, step_pieces, alive_both, alive_one, life_expectancy_both, life_expectancy_one, life_percentile
+
+    def _sample_vital_stats(self, alive, alive2, q_fract, q_fract2, step_pieces, couple):
+
+        # Random rollout for this episode.
+        # Death times are found by inverse CDF lookup of a uniform draw on the survival curves.
+        if self._quasi_dead_at is not None:
+            dead_at, dead_at2 = self._quasi_dead_at
+            self._quasi_dead_at = None
+        else:
+            dead_at = random()
+            dead_at2 = random()
+        if self._antithetic:
+            dead_at = 1 - dead_at
+            dead_at2 = 1 - dead_at2
+        only_alive2 = False
+        pieces = len(alive)
+        dead_piece = np.searchsorted(- alive, - dead_at, side = 'right') # First piece end at which alive < dead_at, or pieces if none.
+        dead_piece2 = np.searchsorted(- alive2, - dead_at2, side = 'right')
+        alive_single_np = np.empty(pieces) # Probability for this couple rollout. -1 if couple.
+        alive_count_np = np.empty(pieces, dtype = int) # Mock count of number of individuals alive. Only used for plots, for computations use alive_single probability.
+        if couple:
+            if self._params.couple_death_concordant:
+                dead_piece2 = dead_piece
+            first_death = min(dead_piece, dead_piece2)
+            alive_single_np[:first_death] = -1
+            alive_count_np[:first_death] = 2
+            if first_death < pieces:
+                if dead_piece == dead_piece2:
+                    alive_single_np[first_death:] = 0
+                    alive_count_np[first_death:] = 0
+                else:
+                    if dead_piece < dead_piece2:
+                        only_alive2 = True
+                        died, died_at, survivor_q_fract, survivor_death = alive, dead_at, q_fract2, dead_piece2
+                    else:
+                        died, died_at, survivor_q_fract, survivor_death = alive2, dead_at2, q_fract, dead_piece
+                    died_fract = (died_at - died[first_death]) / (died[first_death - 1] - died[first_death])
+                    alive_single_np[first_death:] = np.cumprod(np.concatenate(((survivor_q_fract[first_death - 1] ** died_fract, ),
+                        survivor_q_fract[first_death:])))
+                    alive_count_np[first_death:] = 1
+                    alive_count_np[survivor_death:] = 0
+        else:
+            alive_single_np[:] = alive
+            alive_count_np[:dead_piece] = 1
+            alive_count_np[dead_piece:] = 0
+        alive_single_np = alive_single_np[step_pieces]
+        alive_single = alive_single_np.tolist()
+        alive_count = alive_count_np[step_pieces].tolist()
 
-    def _sums_to_end(self, l, start, divl):
+        life_expectancy_single = self._sums_to_end(alive_single_np, alive_single_np)
 
-        r = [0]
-        s = 0
-        for i in range(len(l) - 1, -1, -1):
-            if i >= start:
-                try:
-                    s += l[i]
-                except TypeError:
-                    s = None
-            try:
-                v = s / divl[i] * self._params.time_period
-            except TypeError:
-                v = None
-            except ZeroDivisionError:
-                assert s == 0
-                v = 0
-            r.insert(0, v)
+        alive_single.append(0.0)
+        alive_count.append(0)
 
-        return r
+        if not self._params.probabilistic_life_expectancy:
+            alive_single = [-1 if _alive_count == 2 else _alive_count for _alive_count in alive_count]
+
+        return only_alive2, alive_single, alive_count, life_expectancy_single
+
+    def _sums_to_end(self, l, divl):
+
+        # Reversed cumulative sum gives the same summation order as accumulating from the end.
+        s = np.cumsum(l[::-1])[::-1]
+        divl = np.asarray(divl, dtype = float)
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            r = s / divl * self._params.time_period
+        r[divl == 0] = 0
+
+        return r.tolist() + [0]
 
     def __init__(self, fin_env, direct_action, params_dict):
 
@@ -351,15 +414,19 @@ class Fin:
         self._observation_space_high_np = observation_space_high
         self._observation_space_low = observation_space_low.tolist()
         self._observation_space_high = observation_space_high.tolist()
-        self._observation_space_scale = observation_space_scale.tolist()
-        self._observation_space_shift = observation_space_shift.tolist()
+        self._observation_space_scale_np = observation_space_scale
+        self._observation_space_shift_np = observation_space_shift
         self._observation_space_extreme_range = observation_space_extreme_range.tolist()
-        self._observation_space_range_exceeded = observation_space_range_exceeded.tolist()
+        self._observation_space_range_exceeded = observation_space_range_exceeded
+        self._observe_scratch = np.zeros(len(self._observation_space_items))
 
         self._info_rewards = False
         self._info_rollouts = False
         self._info_strategy = False
 
+        self._antithetic = False
+        self._quasi_dead_at = None
+
         self._env_timesteps = 0
 
         self._init_done = False
@@ -374,6 +441,8 @@ class Fin:
 
         self._warnings = {}
 
+        self._profiler = get_profiler()
+
         assert self._params.sex in ('male', 'female'), 'sex must be male or female.'
         assert self._params.sex2 in ('male', 'female'), 'sex2 must be male or female.'
 
@@ -409,18 +478,35 @@ class Fin:
             inflation_standard_error = self._params.inflation_standard_error if self._params.returns_standard_error else 0,
             time_period = self._params.time_period)
         self._bonds_stepper = self._bonds.nominal
+        path_length: cython.int
+        path_length = ceil((self._params.age_end - self._params.age_start) / self._params.time_period)
+        if self._params.stocks_paths:
+            self._stocks.set_path_length(path_length)
+        if self._params.bonds_paths:
+            self._bonds.set_path_length(path_length)
         self._bonds_zero = make_yield_curve('fixed', self._params.life_table_date)
         self._bonds_constant_inflation = make_yield_curve('fixed', self._params.life_table_date, adjust = log(self._bonds.inflation.inflation_long_run_expectation()))
 
         if self._params.iid_bonds:
+            if self._params.persistent_cache:
+                # Key identifies the bonds model parameters so the sample buffer can be shared by the persistent cache.
+                iid_bonds_key = (self._params.iid_bonds_type, self._params.fixed_real_bonds_rate, self._params.fixed_nominal_bonds_rate,
+                    self._params.real_bonds_adjust, self._params.inflation_adjust, self._params.nominal_bonds_adjust, self._params.corporate_nominal_spread,
+                    self._params.static_bonds, self._params.bonds_date, self._params.bonds_date_start,
+                    self._params.real_short_rate_type, self._params.inflation_short_rate_type,
+                    self._params.real_short_rate_value, self._params.inflation_short_rate_value,
+                    self._params.bonds_standard_error if self._params.returns_standard_error else 0,
+                    self._params.inflation_standard_error if self._params.returns_standard_error else 0)
+            else:
+                iid_bonds_key = None
             if self._params.iid_bonds_type == 'real':
                 self._iid_bonds = ReturnsSample(self._bonds.real, self._params.iid_bonds_duration,
                     self._params.bonds_standard_error if self._params.returns_standard_error else 0,
-                    stepper = self._bonds_stepper, time_period = self._params.time_period)
+                    stepper = self._bonds_stepper, time_period = self._params.time_period, key = iid_bonds_key)
             elif self._params.iid_bonds_type == 'nominal':
                 self._iid_bonds = ReturnsSample(self._bonds.nominal, self._params.iid_bonds_duration,
                     self._params.bonds_standard_error if self._params.returns_standard_error else 0,
-                    stepper = self._bonds_stepper, time_period = self._params.time_period)
+                    stepper = self._bonds_stepper, time_period = self._params.time_period, key = iid_bonds_key)
 
         if self._params.display_returns:
 
@@ -586,6 +672,10 @@ class Fin:
         if not self._init_done:
             self._init()
 
+        profiler = self._profiler
+        if profiler is not None:
+            t = t_start = perf_counter()
+
         self._sex2 = self._params.sex2 if random() < self._params.couple_probability else None
 
         self._age = self._age_start
@@ -614,8 +704,13 @@ class Fin:
 
         self._preretirement_years = ceil(max(0, self._age_retirement - self._age) / self._params.time_period) * self._params.time_period
 
-        key = (self._age, self.life_table.age_add)
-        self._compute_vital_stats(self._age, self._age2, key)
+        if profiler is not None:
+            t = profiler.lap('reset.life_tables', t)
+
+        self._compute_vital_stats(self._age, self._age2)
+
+        if profiler is not None:
+            t = profiler.lap('reset.vital_stats', t)
 
         # Number of steps that can be taken.
         self._anticipated_episode_length = len(self._alive_single)
@@ -646,6 +741,9 @@ class Fin:
         self._date_start = datetime.strptime(self._date, '%Y-%m-%d').date()
         self._cpi = 1
 
+        if profiler is not None:
+            t = profiler.lap('reset.preretirement_life_tables', t)
+
         self._stocks.reset()
         self._iid_bonds.reset()
 
@@ -653,6 +751,9 @@ class Fin:
 
         self._episode_length = 0
 
+        if profiler is not None:
+            t = profiler.lap('reset.returns', t)
+
         found = False
         last_rough_ce_estimate_individual = None
         for i in range(1000):
@@ -787,8 +888,14 @@ class Fin:
 
         #print('wealth:', self._net_wealth_pretax, self._raw_preretirement_income_wealth, self._retired_income_wealth_pretax, self._p_wealth)
 
+        if profiler is not None:
+            t = profiler.lap('reset.wealth', t)
+
         self._pre_calculate()
 
+        if profiler is not None:
+            t = profiler.lap('reset.pre_calculate', t)
+
         self._set_reward_level()
 
         self._policy = make_policy(self, self._params)
@@ -799,6 +906,8 @@ class Fin:
         self._prev_nominal_spias_purchase = 0.0
         self._prev_consume_rate = 0.0
         self._prev_reward = 0.0
+        self._prev_ret = 0.0
+        self._prev_inflation = 0.0
 
         if self._params.verbose:
             print()
@@ -806,6 +915,13 @@ class Fin:
             print('Guaranteed income fraction:', gi_fraction)
             self.render()
 
+        if profiler is not None:
+            t = profiler.lap('reset.reward_level', t)
+            observation = self._observe()
+            t = profiler.lap('reset.observe', t)
+            profiler.lap('reset', t_start)
+            return observation
+
         return self._observe()
 
     def _set_reward_level(self):
@@ -1317,13 +1433,22 @@ class Fin:
         if not self._init_done:
             self._reset()
 
+        t: cython.double; t_start: cython.double
+        profiler = self._profiler
+        if profiler is not None:
+            t = t_start = perf_counter()
+
         if self._direct_action:
             decoded_action = action
         elif action is None:
             decoded_action = None
         else:
             decoded_action = self._decode_action(action, self._prev_asset_allocation)
+        if profiler is not None:
+            t = profiler.lap('step.decode_action', t)
         policified_action = self._policy.policy(decoded_action)
+        if profiler is not None:
+            t = profiler.lap('step.policy', t)
         consume_fraction: cython.double; asset_allocation: AssetAllocation
         consume_fraction, real_spias_fraction, nominal_spias_fraction, asset_allocation, real_bonds_duration, nominal_bonds_duration = policified_action
 
@@ -1342,6 +1467,8 @@ class Fin:
         consume_rate = consume / self._params.time_period
         real_spias_purchase = real_tax_free_spias + real_tax_deferred_spias + real_taxable_spias
         nominal_spias_purchase = nominal_tax_free_spias + nominal_tax_deferred_spias + nominal_taxable_spias
+        if profiler is not None:
+            t = profiler.lap('step.spend', t)
 
         if real_spias_purchase > 0:
             self._add_spias('cpi', real_tax_free_spias, real_tax_deferred_spias, real_taxable_spias)
@@ -1349,7 +1476,12 @@ class Fin:
         if nominal_spias_purchase > 0:
             self._add_spias(self._params.nominal_spias_adjust, nominal_tax_free_spias, nominal_tax_deferred_spias, nominal_taxable_spias)
 
+        if profiler is not None and (real_spias_purchase > 0 or nominal_spias_purchase > 0):
+            t = profiler.lap('step.add_spias', t)
+
         self._allocate_aa(p_tax_free, p_tax_deferred, p_taxable, self._regular_tax_rate, self._capital_gains_tax_rate, asset_allocation)
+        if profiler is not None:
+            t = profiler.lap('step.allocate_aa', t)
 
         inflation: cython.double
         inflation = self._bonds.inflation.inflation()
@@ -1401,12 +1533,16 @@ class Fin:
         self._p_tax_free = new_p_tax_free
         self._p_tax_deferred = new_p_tax_deferred
         self._p_taxable = new_p_taxable
+        if profiler is not None:
+            t = profiler.lap('step.returns', t)
 
         charitable_contributions = max(0, consume_rate - self._consume_charitable) * self._params.consume_charitable_tax_deductability
 
         taxes: cython.double
         taxes = self._taxes.tax(regular_income, social_security, charitable_contributions, not self._couple, inflation) - self._taxes_paid
         self._taxes_due += taxes
+        if profiler is not None:
+            t = profiler.lap('step.taxes', t)
         # if self._age_retirement - self._params.time_period <= self._age < self._age_retirement:
         #     # Forgive taxes due that can't immediately be repaid upon retirement.
         #     # Otherwise when training if have no investment assets at retirement (consumption greater than income) we would be expected to pay the
@@ -1499,21 +1635,33 @@ class Fin:
                 'portfolio_wealth': self._p_wealth,
             })
 
+        if profiler is not None:
+            t = profiler.lap('step.reward', t)
+
         self._step()
+        if profiler is not None:
+            t = profiler.lap('step.advance', t)
         self._bonds_stepper.step()
+        if profiler is not None:
+            t = profiler.lap('step.bonds_step', t)
 
         alive_single: cython.double; done: cython.bint
         alive_single = self._alive_single[self._episode_length]
         done = alive_single == 0.0
         if done:
             # Return any valid value.
+            observation = np.empty(len(self._observation_space_items), dtype = np.float32)
             if self._params.observation_space_ignores_range:
-                observation = np.repeat(-1, len(self._observation_space_low)).astype(np.float32)
+                observation[:] = -1
             else:
-                observation = np.array(self._observation_space_low, dtype = np.float32)
+                observation[:] = self._observation_space_low_np
         else:
             self._pre_calculate()
+            if profiler is not None:
+                t = profiler.lap('step.pre_calculate', t)
             observation = self._observe()
+            if profiler is not None:
+                t = profiler.lap('step.observe', t)
 
         self._prev_asset_allocation = asset_allocation
         swap = self._prev_taxable_assets
@@ -1531,6 +1679,9 @@ class Fin:
         if self._params.verbose:
             self.render()
 
+        if profiler is not None:
+            profiler.lap('step', t_start)
+
         return observation, reward, done, info
 
     @cython.locals(steps = cython.int, force_family_unit = cython.bint, forced_family_unit_couple = cython.bint)
@@ -1586,10 +1737,16 @@ class Fin:
         if not self._income_preretirement_years2 > 0:
             self._income_preretirement2 = 0
 
+        t: cython.double
+        profiler = self._profiler
+        if profiler is not None:
+            t = perf_counter()
         retired = self._preretirement_years == 0
         db: DefinedBenefit
         for db in self._defined_benefits.values():
             db.step(self._age, retired, self._couple or alive_single != 0 and not self._only_alive2, self._couple or alive_single != 0 and self._only_alive2)
+        if profiler is not None:
+            profiler.lap('step.advance.defined_benefits', t)
 
         self._episode_length += steps
         self._env_timesteps += steps
@@ -1640,6 +1797,83 @@ class Fin:
         self._pre_calculate()
         return self._observe()
 
+    def snapshot(self):
+        '''Return a picklable snapshot of the state of the current episode.
+
+        Useful for branching many continuations from a common episode
+        prefix. Must be taken on an episode that is not done. Vital
+        statistics, life tables, and utility are immutable and so are
+        shared with the episode. Defined benefit income annuities are
+        copied. Random number generator state is not captured, so
+        continuations restored from the same snapshot diverge.
+
+        '''
+
+        assert self._init_done
+
+        return {
+            'episode': (self._sex2, self._age, self._age2, self._age_retirement, self._preretirement_years, self._anticipated_episode_length,
+                self._couple, self._only_alive2, self._have_401k, self._have_401k2, self._gamma, self._consume_charitable, self._date, self._date_start,
+                self._cpi, self._episode_length, self._start_income_preretirement, self._start_income_preretirement2, self._income_preretirement_years,
+                self._income_preretirement_years2, self._income_preretirement, self._income_preretirement2, self._consume_preretirement,
+                self._p_tax_free, self._p_tax_deferred, self._p_taxable, self._taxes_due, self._consume_scale, self._reward_scale),
+            'prev': (self._prev_asset_allocation.clone(), self._prev_taxable_assets.clone(), self._prev_real_spias_purchase,
+                self._prev_nominal_spias_purchase, self._prev_consume_rate, self._prev_reward, self._prev_ret, self._prev_inflation),
+            'vital_stats': (self._alive_single, self._alive_count, self._alive_both, self._alive_one, self._life_expectancy_both, self._life_expectancy_one,
+                self._life_expectancy_single, self._life_percentile),
+            'life_tables': (self._life_table, self._life_table2, self._life_table_preretirement, self._life_table2_preretirement),
+            'utility': self._utility,
+            'policy': self._policy.snapshot(),
+            'bonds': self._bonds_stepper.snapshot(),
+            'stocks': self._stocks.snapshot(),
+            'iid_bonds': self._iid_bonds.snapshot(),
+            'taxes': self._taxes.snapshot(),
+            'defined_benefits': {key: db.snapshot() for key, db in self._defined_benefits.items()},
+        }
+
+    def restore(self, snapshot):
+        '''Restore the episode state from snapshot() and return the
+        corresponding observation. The snapshot may have been taken by
+        a different Fin object having the same parameters.
+
+        '''
+
+        if not self._init_done:
+            self._init()
+
+        prev_asset_allocation: AssetAllocation; prev_taxable_assets: AssetAllocation
+
+        self._sex2, self._age, self._age2, self._age_retirement, self._preretirement_years, self._anticipated_episode_length, \
+            self._couple, self._only_alive2, self._have_401k, self._have_401k2, self._gamma, self._consume_charitable, self._date, self._date_start, \
+            self._cpi, self._episode_length, self._start_income_preretirement, self._start_income_preretirement2, self._income_preretirement_years, \
+            self._income_preretirement_years2, self._income_preretirement, self._income_preretirement2, self._consume_preretirement, \
+            self._p_tax_free, self._p_tax_deferred, self._p_taxable, self._taxes_due, self._consume_scale, self._reward_scale = snapshot['episode']
+        prev_asset_allocation, prev_taxable_assets, self._prev_real_spias_purchase, \
+            self._prev_nominal_spias_purchase, self._prev_consume_rate, self._prev_reward, self._prev_ret, self._prev_inflation = snapshot['prev']
+        self._prev_asset_allocation = prev_asset_allocation.clone()
+        self._prev_taxable_assets = prev_taxable_assets.clone()
+        self._alive_single, self._alive_count, self._alive_both, self._alive_one, self._life_expectancy_both, self._life_expectancy_one, \
+            self._life_expectancy_single, self._life_percentile = snapshot['vital_stats']
+        self._life_table, self._life_table2, self._life_table_preretirement, self._life_table2_preretirement = snapshot['life_tables']
+        self._utility = snapshot['utility']
+
+        self._policy = make_policy(self, self._params)
+        self._policy.restore(snapshot['policy'])
+        self._bonds_stepper.restore(snapshot['bonds'])
+        self._stocks.restore(snapshot['stocks'])
+        self._iid_bonds.restore(snapshot['iid_bonds'])
+        self._taxes.restore(snapshot['taxes'])
+
+        self._defined_benefits = {}
+        for key, db_state in snapshot['defined_benefits'].items():
+            type_of_funds, real, _ = key
+            db = make_defined_benefit(self, self._params, real = real, type_of_funds = type_of_funds)
+            db.restore(db_state)
+            self._defined_benefits[key] = db
+
+        self._pre_calculate()
+        return self._observe()
+
     def render(self, mode = 'human'):
 
         print('    ', self._prev_asset_allocation, self._prev_consume_rate, self._prev_real_spias_purchase, self._prev_nominal_spias_purchase, self._prev_reward)
@@ -1659,6 +1893,37 @@ class Fin:
 
         return
 
+    def set_random_stream(self, antithetic = False, quasi = None, quasi_episode = 0, random_state = None):
+        '''Discard any random numbers buffered by the returns and bonds
+        models, so that subsequent draws come solely from the current
+        state of the Python global random number generator and the NumPy
+        RandomState random_state, or the NumPy global generator if it is
+        None. Used to give each episode its own seeded random number
+        stream.
+
+        If antithetic is true, market shocks are negated and mortality
+        uniforms mirrored, while episode parameters remain unchanged.
+
+        If quasi is a QuasiRandom, the mortality uniforms and market
+        shocks of the next episode are instead taken from its point for
+        episode sequence number quasi_episode.
+
+        '''
+
+        if not self._init_done:
+            self._init()
+
+        self._antithetic = antithetic
+        if quasi is not None:
+            steps = ceil((self._params.age_end - self._params.age_start) / self._params.time_period) + 1
+            quasi = quasi.stream(quasi_episode, steps, random_state)
+            self._quasi_dead_at = quasi.uniforms(2).tolist() # Low numbered coordinates are the most evenly distributed.
+        else:
+            self._quasi_dead_at = None
+        self._stocks.reset_random(antithetic, quasi, random_state)
+        self._iid_bonds.reset_random(antithetic, quasi, random_state)
+        self._bonds_stepper.reset_random(antithetic, quasi, random_state)
+
     def _pre_calculate_wealth(self):
 
         self._pv_preretirement_income = [0.0] * len(TaxStatus)
@@ -1818,7 +2083,7 @@ class Fin:
 
         return spia
 
-    _spia_years_cache = {}
+    _spia_years_cache = LRUCache('fin_spia_years', 10000)
 
     def _compute_spia_years(self):
 
@@ -1856,11 +2121,20 @@ class Fin:
             k_age = self._age if self._couple or not self._only_alive2 else -1
             k_age2 = self._age2 if self._couple or self._only_alive2 else -1
             k_date = self._date
-            key = (k_age, k_age2, self._date)
+            key = (k_age, k_age2, self._date, self._params.life_table_spia, self._params.sex, self._sex2, self._params.time_period, self._params.consume_additional)
+                # Key identifies the scenario across models so it can be shared by the persistent cache.
             try:
                 spia_expectancy_years = Fin._spia_years_cache[key]
             except KeyError:
-                spia_expectancy_years = self._compute_spia_years()
+                if self._params.persistent_cache:
+                    persistent_cache = get_persistent_cache('fin_spia_years')
+                    try:
+                        spia_expectancy_years = persistent_cache[key]
+                    except KeyError:
+                        spia_expectancy_years = self._compute_spia_years()
+                        persistent_cache[key] = spia_expectancy_years
+                else:
+                    spia_expectancy_years = self._compute_spia_years()
                 Fin._spia_years_cache[key] = spia_expectancy_years
 
             max_age: cython.double; final_spias_purchase_bool: cython.bint; final_spias_purchase: cython.double
@@ -1907,7 +2181,8 @@ class Fin:
         # Want to populate observe in a Cython efficient manner. Makes use of a Cython memory view.
         observe_len: cython.int; observe: cython.float[:]; i : cython.int
         observe_len = len(self._observation_space_items)
-        observe = np.zeros(observe_len, dtype = np.float32)
+        observe_np = np.empty(observe_len, dtype = np.float32)
+        observe = observe_np
         i = 0
         # Scenario description observations.
         observe[i] = couple; i += 1
@@ -1931,24 +2206,23 @@ class Fin:
         observe[i] = real_interest_rate; i += 1
         assert i == observe_len
 
-        ok: cython.bint; ob: cython.double; lo: cython.double; hi: cython.double; element_ok: cython.bint
-
-        ok = True
-        for i in range(observe_len):
-            # Inner loop is performance critical.
-            ob = observe[i]
-            lo = self._observation_space_low[i]
-            hi = self._observation_space_high[i]
-            try:
-                element_ok = lo <= ob <= hi
-            except FloatingPointError:
-                self._warn('Invalid observation.', observe)
-                assert False, 'Invalid observation.'
-                element_ok = False # Cython - prevent checking that element_ok is defined on next line.
-            if not element_ok:
-                ok = False
+        # Range check and rescale the whole observation at once.
+        # A float64 scratch copy of the float32 observation is used so results are identical to elementwise double precision computation.
+        scratch = self._observe_scratch
+        scratch[:] = observe_np
+        try:
+            in_range = (self._observation_space_low_np <= scratch) & (scratch <= self._observation_space_high_np)
+        except FloatingPointError:
+            self._warn('Invalid observation.', observe)
+            assert False, 'Invalid observation.'
+        ok: cython.bint
+        ok = in_range.all()
+        if not ok:
+            # Rare; warnings are only counted and evaluated for the out of range elements.
+            out_of_range = ~ in_range
+            self._observation_space_range_exceeded += out_of_range
+            for i in np.flatnonzero(out_of_range).tolist():
                 item = self._observation_space_items[i]
-                self._observation_space_range_exceeded[i] += 1
                 if self._observation_space_range_exceeded[i] > 1 + 1e-4 * self._env_timesteps:
                     self._warn('Frequently out of range ' + item + '.', 'frequency:', self._observation_space_range_exceeded[i] / self._env_timesteps,
                         timestep_ok_fraction = 1e-3)
@@ -1962,20 +2236,18 @@ class Fin:
                         assert False, 'Undetected invalid observation.'
         if self._params.observation_space_ignores_range:
             try:
-                for i in range(len(observe)):
-                    observe[i] = observe[i] * self._observation_space_scale[i] + self._observation_space_shift[i]
-                scaled_obs = observe
+                np.multiply(scratch, self._observation_space_scale_np, out = scratch)
+                np.add(scratch, self._observation_space_shift_np, out = scratch)
             except FloatingPointError:
                 assert False, 'Overflow in observation rescaling.'
-        else:
-            scaled_obs = observe
+            observe_np[:] = scratch
         if not ok:
             if self._params.observation_space_clip:
                 if self._params.observation_space_ignores_range:
-                    scaled_obs = np.clip(scaled_obs, -1, 1)
+                    np.clip(observe_np, -1, 1, out = observe_np)
                 else:
-                    scaled_obs = np.clip(scaled_obs, self._observation_space_low_np, self._observation_space_high_np)
-        return scaled_obs
+                    np.clip(observe_np, self._observation_space_low_np, self._observation_space_high_np, out = observe_np)
+        return observe_np
 
     def decode_observation(self, obs):
 
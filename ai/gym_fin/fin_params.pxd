@@ -161,6 +161,7 @@ cdef class FinParams:
     cdef double p_taxable_stocks_weight_low
     cdef double p_weighted_high
     cdef double p_weighted_low
+    cdef bint persistent_cache
     cdef bint preretirement_spias
     cdef bint probabilistic_life_expectancy
     cdef double qualified_dividends_bonds
@@ -188,6 +189,7 @@ cdef class FinParams:
     cdef double spias_permitted_from_age
     cdef double spias_permitted_to_age
     cdef bint static_bonds
+    cdef bint bonds_paths
     cdef bint stocks
     cdef double stocks_alpha
     cdef double stocks_beta
@@ -195,6 +197,7 @@ cdef class FinParams:
     cdef double stocks_gamma
     cdef double stocks_mean_reversion_rate
     cdef str stocks_model
+    cdef bint stocks_paths
     cdef double stocks_mu
     cdef double stocks_price_exaggeration
     cdef double stocks_price_high
@@ -176,6 +176,7 @@ class FinParams:
         self.p_taxable_stocks_weight_low = params['p_taxable_stocks_weight_low']
         self.p_weighted_high = params['p_weighted_high']
         self.p_weighted_low = params['p_weighted_low']
+        self.persistent_cache = params['persistent_cache']
         self.preretirement_spias = params['preretirement_spias']
         self.probabilistic_life_expectancy = params['probabilistic_life_expectancy']
         self.qualified_dividends_bonds = params['qualified_dividends_bonds']
@@ -203,6 +204,7 @@ class FinParams:
         self.spias_permitted_from_age = params['spias_permitted_from_age']
         self.spias_permitted_to_age = params['spias_permitted_to_age']
         self.static_bonds = params['static_bonds']
+        self.bonds_paths = params['bonds_paths']
         self.stocks = params['stocks']
         self.stocks_alpha = params['stocks_alpha']
         self.stocks_beta = params['stocks_beta']
@@ -210,6 +212,7 @@ class FinParams:
         self.stocks_gamma = params['stocks_gamma']
         self.stocks_mean_reversion_rate = params['stocks_mean_reversion_rate']
         self.stocks_model = params['stocks_model']
+        self.stocks_paths = params['stocks_paths']
         self.stocks_mu = params['stocks_mu']
         self.stocks_price_exaggeration = params['stocks_price_exaggeration']
         self.stocks_price_high = params['stocks_price_high']
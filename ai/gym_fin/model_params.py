@@ -42,6 +42,7 @@ class ModelParams(object):
         self._boolean_flag('warn_to_stderr', False, True) # Display warning messages on stderr or stdout.
             # Stdout when training because Ray buffers both stdout and stderr, so that warning is concordant with any verbose output on stdout.
         self._boolean_flag('display-returns', False, True) # Display yield and return statistics.
+        self._boolean_flag('persistent-cache', False) # Share vital statistics, SPIA expectancy, and IID bonds sample caches across processes using files in ~/.cache/aiplanner.
 
         self._param('debug-dummy-float', 0.0) # Occasionally useful for debugging.
 
@@ -275,6 +276,8 @@ class ModelParams(object):
         self._boolean_flag('static-bonds', False)
             # Whether to model real bonds and inflation and thus nominal bonds and SPIAs as static (that is using a yield curve that does not vary over time).
             # Does not remove side-effects of potential for temporal variability in bond prices; simply does not step bonds over time.
+        self._boolean_flag('bonds-paths', False)
+            # Whether to generate whole episode real short rate and inflation paths in one vectorized call at reset rather than one step at a time.
         self._param('fixed-real-bonds-rate', -1) # Rate to model real bonds with a fixed mean yield curve (does not favor duration) when not -1.
         self._param('fixed-nominal-bonds-rate', -1)
             # Rate to model nominal bonds in determining inflation with a fixed mean yield curve (does not favor duration) when not -1.
@@ -321,6 +324,7 @@ class ModelParams(object):
             # normal_residuals - normal residuals applied to a monthly GJR-GARCH volatility model.
             # bootstrap - bootrapped residuals applied to a monthly GJR-GARCH volatility model.
             # iid - geometric Brownian motion.
+        self._boolean_flag('stocks-paths', False) # Whether to generate whole episode GJR-GARCH stock return paths in one vectorized call at reset.
         self._param('stocks-bootstrap-years', 0) # Mean bootstrap residual block size in years for bootstrap stocks.
             # A value of zero results in residuals being drawn at random.
             # A value other than zero may result in unwanted corelations between volatility and next period return depending on the bootstrap data used.
@@ -18,6 +18,15 @@ cdef class OUProcess:
     cdef double _e
     cdef int _last_randnorm
     cdef list _randnorm
+    cdef bint _antithetic
+    cdef object _random_state
+    cdef double _erd
+    cdef double _sr
+    cdef int _path_length
+    cdef list _path
+    cdef list _path_norms
+    cdef int _path_index
+    cdef int _path_len
     cdef double x
     cdef double next_x
     cdef double norm
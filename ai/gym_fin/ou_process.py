@@ -11,6 +11,7 @@
 from math import exp, sqrt
 
 import numpy as np
+from scipy.signal import lfilter
 
 import cython
 
@@ -27,27 +28,85 @@ class OUProcess:
 
         self._e = exp(1)
         self._last_randnorm = 0
+        self._antithetic = False
+        self._random_state = np.random
+
+        # By https://en.wikipedia.org/wiki/Hull%E2%80%93White_model one-factor model r(t) distribution for theta constant:
+        self._erd = self._e ** (- self._rev * self.time_period)
+        self._sr = sqrt((1 - self._erd ** 2) / (2 * self._rev))
+
+        self._path_length = 0
+        self._path = None
+        self._path_norms = None
+        self._path_index = 0
+        self._path_len = 0
 
         self.reset(mu = mu, x = x, norm = norm)
 
     @cython.locals(mu = cython.double)
     def reset(self, mu, x, norm):
-        '''Reset the process to mean mu, initial x, initial stochastic shock norm.'''
+        '''Reset the process to mean mu, initial x, initial stochastic shock norm.
+
+        If a path length has been set, the whole path is generated
+        now, and norm may alternatively be a sequence of the shocks to
+        use for the path.
+
+        '''
 
         self._mu = mu
 
         self.next_x = self._mu if x is None else x
 
-        self.step(norm = norm)
+        self._path_len = 0
+        if self._path_length > 0:
+            if norm is None:
+                norms = self._draw_norms(self._path_length + 1)
+            elif isinstance(norm, (float, int)):
+                norms = [norm] + self._draw_norms(self._path_length)
+            else:
+                norms = list(norm)
+            self.set_path(self.generate_paths(self.next_x, norms, mu = self._mu).tolist(), norms)
+            self.step()
+        else:
+            self.step(norm = norm)
+
+    def _draw_norms(self, n):
+        '''Return a list of the next n buffered stochastic shocks.'''
+
+        norms: list; k: cython.int
+        norms = []
+        while n > 0:
+            if self._last_randnorm == 0:
+                self._refill()
+            k = min(n, self._last_randnorm)
+            norms.extend(reversed(self._randnorm[self._last_randnorm - k:self._last_randnorm]))
+            self._last_randnorm -= k
+            n -= k
+
+        return norms
+
+    def _refill(self):
+
+        randnorm = self._random_state.normal(0, 1, size = 10000) # Numpy randnorms are fast.
+        if self._antithetic:
+            randnorm = - randnorm
+        self._randnorm = randnorm.tolist()
+            # .tolist() prevents slow np.ndarray indexing and prevents np.float64 values from propagating.
+        self._last_randnorm = len(self._randnorm)
 
     def step(self, *, norm = None):
         '''Step the process under stochastic shock norm (generated if not supplied).'''
 
+        if norm is None and self._path_index < self._path_len:
+            self.x = self.next_x
+            self.norm = self._path_norms[self._path_index]
+            self.next_x = self._path[self._path_index]
+            self._path_index += 1
+            return
+
         if norm is None:
             if self._last_randnorm == 0:
-                self._randnorm = np.random.normal(0, 1, size = 10000).tolist() # Numpy randnorms are fast.
-                    # .tolist() prevents slow np.ndarray indexing and prevents np.float64 values from propagating.
-                self._last_randnorm = len(self._randnorm)
+                self._refill()
             self._last_randnorm -= 1
             self.norm = self._randnorm[self._last_randnorm]
         else:
@@ -55,8 +114,74 @@ class OUProcess:
 
         self.x = self.next_x
 
-        # By https://en.wikipedia.org/wiki/Hull%E2%80%93White_model one-factor model r(t) distribution for theta constant:
-        erd = self._e ** (- self._rev * self.time_period)
-        sr: cython.double
-        sr = sqrt((1 - erd ** 2) / (2 * self._rev))
-        self.next_x = self.x * erd + self._mu * (1 - erd) + self._sigma * sr * self.norm
+        self.next_x = self.x * self._erd + self._mu * (1 - self._erd) + self._sigma * self._sr * self.norm
+
+    def generate_paths(self, x, norms, *, mu = None):
+        '''Return the values of next_x for the sequence of stochastic shocks
+        norms applied to the process starting from x. norms may also be
+        an [N, T] array and x an array of N starting values, in which case
+        an [N, T] array of paths is returned. Does not alter the state of
+        the process.
+
+        '''
+
+        norms = np.asarray(norms, dtype = float)
+        x = np.asarray(x, dtype = float)
+        mu = self._mu if mu is None else mu
+        c = mu * (1 - self._erd) + self._sigma * self._sr * norms
+        zi = (self._erd * x)[..., np.newaxis]
+        path, _ = lfilter((1.0, ), (1.0, - self._erd), c, zi = zi)
+
+        return path
+
+    def set_path_length(self, path_length):
+        '''Generate paths of path_length steps, beyond the initial step, at
+        each reset. Zero to step the process one step at a time. Steps
+        beyond the end of a path are generated one step at a time.
+
+        '''
+
+        self._path_length = path_length
+
+    def set_path(self, path, norms):
+        '''Use the previously generated values of next_x path, and
+        corresponding stochastic shocks norms, for the next len(path)
+        steps. Allows a path to be reused, for instance across
+        environments differing only in their utility function.
+
+        '''
+
+        self._path = list(path)
+        self._path_norms = list(norms)
+        self._path_index = 0
+        self._path_len = len(path)
+
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+        '''Discard any buffered stochastic shocks, and set whether future
+        shocks are negated. If quasi is a QuasiStream take the shocks for
+        the next quasi.steps steps from it. If random_state is a NumPy
+        RandomState draw pseudo-random shocks from it rather than the
+        NumPy global generator.
+
+        '''
+
+        self._last_randnorm = 0
+        self._path_len = 0
+        self._antithetic = antithetic
+        self._random_state = np.random if random_state is None else random_state
+        if quasi is not None:
+            randnorm = quasi.normals(quasi.steps + 1) # Plus one for the reset.
+            if antithetic:
+                randnorm = - randnorm
+            self._randnorm = randnorm[::-1].tolist() # Buffer is consumed from the end.
+            self._last_randnorm = len(self._randnorm)
+
+    def snapshot(self):
+        '''Return the state of the process as a tuple.'''
+
+        return (self._mu, self.x, self.next_x, self.norm, self._path, self._path_norms, self._path_index, self._path_len)
+
+    def restore(self, state):
+        '''Restore the process to a state returned by snapshot().'''
+
+        self._mu, self.x, self.next_x, self.norm, self._path, self._path_norms, self._path_index, self._path_len = state
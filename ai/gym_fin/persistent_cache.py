@@ -0,0 +1,233 @@
+# AIPlanner - Deep Learning Financial Planner
+# Copyright (C) 2023 Gordon Irlam
+#
+# All rights reserved. This program may not be used, copied, modified,
+# or redistributed without permission.
+#
+# This program is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.
+
+from fcntl import flock, LOCK_EX, LOCK_UN
+from glob import glob
+from hashlib import sha1
+from mmap import ACCESS_READ, mmap
+from os import close, fstat, makedirs, O_APPEND, O_CREAT, O_RDWR, open as os_open, stat, unlink, write
+from os.path import dirname, expanduser, join, normpath
+from pickle import dumps, HIGHEST_PROTOCOL, loads
+from struct import calcsize, pack, unpack_from
+
+import spia
+from spia import LRUCache
+from spia.fetch_yield_curve import datadir
+
+cachedir = '~/.cache/aiplanner'
+
+_digest = None
+
+def cache_digest():
+    '''Return a hex digest identifying the code and data that cached
+    values are computed from. Cached values computed by different code
+    or from different interest rate data are never shared.
+
+    The code is the source of the gym_fin and spia packages, and the
+    data is the name, size, and modification time of the interest rate
+    data files.
+
+    '''
+
+    global _digest
+
+    if _digest is None:
+        h = sha1()
+        for package_dir in (dirname(__file__), dirname(spia.__file__)):
+            for fname in sorted(glob(join(package_dir, '*.py')) + glob(join(package_dir, '*.pxd')) + glob(join(package_dir, '*.npz'))):
+                with open(fname, 'rb') as f:
+                    h.update(f.read())
+        for fname in sorted(glob(join(normpath(expanduser(datadir)), '*', '*'))):
+            try:
+                st = stat(fname)
+            except OSError:
+                continue
+            h.update(repr((fname, st.st_size, st.st_mtime_ns)).encode())
+        _digest = h.hexdigest()
+
+    return _digest
+
+_caches = {}
+
+def get_persistent_cache(name):
+    '''Return the process wide PersistentCache of the given name.'''
+
+    try:
+        return _caches[name]
+    except KeyError:
+        cache = PersistentCache(name)
+        _caches[name] = cache
+        return cache
+
+class PersistentCache(object):
+    '''Append only on disk key value store shared by all processes on a host.
+
+    Records are a key digest and a pickled value prefixed by their
+    lengths. The key digest is a hash of repr(key), which unlike a
+    pickle is the same for equal keys of the strs, numbers, and tuples
+    of them used as keys. Each record is appended using a single write while holding
+    an exclusive lock, so records from concurrent writers don't
+    interleave. Readers memory map the file and index any records
+    appended since they last looked, ignoring a trailing partially
+    written record. Values are only unpickled when looked up, and a
+    bounded number of unpickled values are kept in memory.
+
+    The file name contains a digest of the code and data the values are
+    computed from, so stale values are never used. The file name and
+    header also contain a format version number.
+
+    When the file would exceed max_size it is replaced by an empty
+    file. Processes notice the replacement and switch to the new file.
+
+    '''
+
+    version = 3 # Version 2 indexed records by pickled key.
+    magic = b'AIPlanner cache\n'
+    header_format = '<16sI'
+    record_format = '<II'
+
+    def __init__(self, name, *, directory = cachedir, max_size = 1 << 30, capacity = 1000):
+
+        self.max_size = max_size
+
+        directory = expanduser(directory)
+        makedirs(directory, exist_ok = True)
+        self.path = join(directory, name + '-v' + str(self.version) + '-' + cache_digest()[:16] + '.cache')
+
+        self._values = LRUCache('persistent_cache_' + name, capacity)
+        self._fd = None
+        self._open()
+
+    def __del__(self):
+
+        self._close()
+
+    def _open(self):
+
+        self._close()
+
+        self._fd = os_open(self.path, O_RDWR | O_CREAT | O_APPEND, 0o644)
+        self._mm = None
+        self._index = {}
+        self._values.clear()
+        self._offset = calcsize(self.header_format)
+        self._valid = True
+
+        flock(self._fd, LOCK_EX)
+        try:
+            if fstat(self._fd).st_size == 0:
+                write(self._fd, pack(self.header_format, self.magic, self.version))
+        finally:
+            flock(self._fd, LOCK_UN)
+
+        self._load()
+
+    def _close(self):
+
+        try:
+            if self._mm is not None:
+                self._mm.close()
+            close(self._fd)
+        except (AttributeError, TypeError, OSError):
+            pass
+
+    def _replaced(self):
+        # Whether the file has been replaced, or removed, since we opened it.
+
+        try:
+            return stat(self.path).st_ino != fstat(self._fd).st_ino
+        except OSError:
+            return True
+
+    def _load(self):
+
+        size = fstat(self._fd).st_size
+        if not self._valid or size <= self._offset:
+            return
+
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = mm = mmap(self._fd, 0, access = ACCESS_READ)
+        size = len(mm)
+
+        record_size = calcsize(self.record_format)
+        if self._offset == calcsize(self.header_format):
+            magic, version = unpack_from(self.header_format, mm)
+            if magic != self.magic or version != self.version:
+                self._valid = False
+                return
+        offset = self._offset
+        while offset + record_size <= size:
+            key_length, value_length = unpack_from(self.record_format, mm, offset)
+            value_offset = offset + record_size + key_length
+            if value_offset + value_length > size:
+                break # Record still being written.
+            self._index[mm[offset + record_size:value_offset]] = (value_offset, value_length)
+            offset = value_offset + value_length
+        self._offset = offset
+
+    def _key_digest(self, key):
+        # Pickles of equal keys can differ, depending on whether their component objects are shared, so aren't used.
+
+        return sha1(repr(key).encode()).digest()
+
+    def __getitem__(self, key):
+
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        key_digest = self._key_digest(key)
+        try:
+            value_offset, value_length = self._index[key_digest]
+        except KeyError:
+            if self._replaced():
+                self._open()
+            else:
+                self._load()
+            value_offset, value_length = self._index[key_digest]
+
+        value = loads(self._mm[value_offset:value_offset + value_length])
+        self._values[key] = value
+
+        return value
+
+    def __setitem__(self, key, value):
+
+        self._values[key] = value
+
+        if not self._valid:
+            return
+
+        key_digest = self._key_digest(key)
+        pickled_value = dumps(value, protocol = HIGHEST_PROTOCOL)
+        record = pack(self.record_format, len(key_digest), len(pickled_value)) + key_digest + pickled_value
+        if calcsize(self.header_format) + len(record) > self.max_size:
+            return
+
+        while True:
+            flock(self._fd, LOCK_EX)
+            try:
+                if not self._replaced():
+                    if fstat(self._fd).st_size + len(record) > self.max_size:
+                        unlink(self.path) # Start afresh; other processes notice the file has been replaced.
+                    else:
+                        write(self._fd, record)
+                        return
+            finally:
+                flock(self._fd, LOCK_UN)
+            self._open()
+
+    def __len__(self):
+
+        self._load()
+
+        return len(self._index)
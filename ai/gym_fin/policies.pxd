@@ -16,6 +16,7 @@ cdef class Policy:
     cdef FinParams params
     cdef double consume_rate_initial
     cdef double p_initial
+    cdef double life_expectancy_initial
     cdef double consume_prev
     cdef bint annuitized
 
@@ -22,6 +22,20 @@ class Policy:
         self.env = env
         self.params = params
 
+        self.consume_rate_initial = 0
+        self.p_initial = 0
+        self.life_expectancy_initial = 0
+        self.consume_prev = 0
+        self.annuitized = False
+
+    def snapshot(self):
+
+        return (self.consume_rate_initial, self.p_initial, self.life_expectancy_initial, self.consume_prev, self.annuitized)
+
+    def restore(self, state):
+
+        self.consume_rate_initial, self.p_initial, self.life_expectancy_initial, self.consume_prev, self.annuitized = state
+
     def _pmt(self, rate, nper, pv):
 
         try:
@@ -0,0 +1,80 @@
+# AIPlanner - Deep Learning Financial Planner
+# Copyright (C) 2023 Gordon Irlam
+#
+# All rights reserved. This program may not be used, copied, modified,
+# or redistributed without permission.
+#
+# This program is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.
+
+from time import perf_counter
+
+_profiler = None
+
+class PhaseProfiler(object):
+    '''Accumulate wall time and call counts for named phases of the
+    Fin step and reset code.
+
+    '''
+
+    def __init__(self):
+
+        self.times = {}
+        self.counts = {}
+
+    def lap(self, phase, start):
+        '''Charge the time since start to phase, and return the current time
+        for use as the start of the next phase.
+
+        '''
+
+        now = perf_counter()
+        try:
+            self.times[phase] += now - start
+            self.counts[phase] += 1
+        except KeyError:
+            self.times[phase] = now - start
+            self.counts[phase] = 1
+
+        return now
+
+    def stats(self):
+
+        return {phase: {'time': self.times[phase], 'count': self.counts[phase]} for phase in self.times}
+
+    def clear(self):
+
+        self.times.clear()
+        self.counts.clear()
+
+def enable_profiling(enable = True):
+    '''Enable or disable phase profiling of subsequently initialized Fin
+    environments in this process.
+
+    '''
+
+    global _profiler
+
+    if enable:
+        if _profiler is None:
+            _profiler = PhaseProfiler()
+    else:
+        _profiler = None
+
+def get_profiler():
+    '''Return the process wide PhaseProfiler, or None if profiling is not
+    enabled.
+
+    '''
+
+    return _profiler
+
+def profile_stats():
+
+    return {} if _profiler is None else _profiler.stats()
+
+def clear_profile_stats():
+
+    if _profiler is not None:
+        _profiler.clear()
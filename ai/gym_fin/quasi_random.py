@@ -0,0 +1,86 @@
+# AIPlanner - Deep Learning Financial Planner
+# Copyright (C) 2023 Gordon Irlam
+#
+# All rights reserved. This program may not be used, copied, modified,
+# or redistributed without permission.
+#
+# This program is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+class QuasiRandom(object):
+    '''Scrambled Sobol low discrepancy sequence with one point per
+    episode.
+
+    Each point has dimensions coordinates. Points are generated in
+    blocks of a power of 2 so as to preserve the balance properties of
+    the sequence.
+
+    '''
+
+    def __init__(self, dimensions, *, seed = None, block_log2 = 8):
+
+        self.dimensions = dimensions
+        self.block_size = 1 << block_log2
+
+        self._engine = qmc.Sobol(dimensions, scramble = True, seed = seed)
+        self._block = -1
+        self._points = None
+
+    def stream(self, episode, steps, random_state = None):
+        '''Return a QuasiStream for the given episode sequence number of at
+        most steps time steps. Pseudo-random numbers beyond the point's
+        coordinates are drawn from the NumPy RandomState random_state,
+        or the NumPy global generator if it is None.
+
+        '''
+
+        block = episode // self.block_size
+        if block != self._block:
+            if block != self._block + 1:
+                self._engine.reset()
+                if block > 0:
+                    self._engine.fast_forward(block * self.block_size)
+            self._points = self._engine.random(self.block_size)
+                # Not random_base2(), which requires the total number of points generated so far to be a power of 2.
+            self._block = block
+
+        return QuasiStream(self._points[episode % self.block_size], steps, random_state)
+
+class QuasiStream(object):
+    '''The coordinates of a single low discrepancy point, handed out in
+    order to the stochastic processes of an episode.
+
+    Once the coordinates are exhausted pseudo-random numbers from
+    random_state, or the NumPy global generator if it is None, are
+    returned instead.
+
+    '''
+
+    def __init__(self, point, steps, random_state = None):
+
+        self.steps = steps
+        self._point = point
+        self._offset = 0
+        self._random_state = np.random if random_state is None else random_state
+
+    def uniforms(self, n):
+        '''Return an array of n uniform deviates.'''
+
+        u = self._point[self._offset:self._offset + n]
+        self._offset += len(u)
+        if len(u) < n:
+            u = np.concatenate((u, self._random_state.uniform(size = n - len(u))))
+
+        return u
+
+    def normals(self, n):
+        '''Return an array of n standard normal deviates.'''
+
+        u = np.clip(self.uniforms(n), 1e-12, 1 - 1e-12)
+
+        return ndtri(u)
@@ -30,13 +30,17 @@ cdef class ReturnsIID(Returns):
     cdef double sigma
     cdef double period_mu
     cdef double period_sigma
+    cdef int last_randnorm
+    cdef list randnorm
+    cdef bint antithetic
 
     cdef object sample(self)
 
     cdef object observe(self)
 
 cdef tuple z_hist
-cdef tuple sigma_hist
+cdef object z_hist_array
+cdef object sigma_hist
 cdef double sigma_average
 
 cdef class ReturnsEquity(Returns):
@@ -68,6 +72,17 @@ cdef class ReturnsEquity(Returns):
     cdef list randints
     cdef int last_randnorm
     cdef list randnorm
+    cdef int last_randz
+    cdef list randz
+    cdef bint antithetic
+    cdef object random_state
+    cdef int path_length
+    cdef int path_index
+    cdef int path_len
+    cdef list path_returns
+    cdef list path_sigma_t
+    cdef list path_log_above_trend
+    cdef list path_log_price_noise
     cdef double sigma_t
 
     cdef double period_mu
@@ -11,11 +11,14 @@
 # Have Cython cimport problems if ReturnsIID and ReturnsEquity are defined in separate files.
 
 from csv import reader
+from hashlib import sha1
 from math import exp, log, sqrt
+from os.path import exists, splitext
 from random import expovariate,  lognormvariate, normalvariate, uniform
 from statistics import mean,stdev
 
 import numpy as np
+from scipy.signal import lfilter
 
 import cython
 
@@ -34,6 +37,38 @@ class Returns:
 
         return (1, 1)
 
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+        '''Discard any buffered random numbers, and set whether future
+        stochastic shocks are negated. If quasi is a QuasiStream the
+        shocks for the next quasi.steps steps are taken from it. If
+        random_state is a NumPy RandomState random numbers drawn using
+        NumPy are taken from it rather than the NumPy global generator.
+
+        '''
+
+        assert False
+
+    def set_path_length(self, path_length):
+        '''Generate the returns for path_length steps at each reset, rather
+        than one step at a time. Zero to sample one step at a time.
+
+        '''
+
+        assert False
+
+    def snapshot(self):
+        '''Return the state of the returns model as a tuple. Random number
+        generator state is not captured.
+
+        '''
+
+        assert False
+
+    def restore(self, state):
+        '''Restore the returns model to a state returned by snapshot().'''
+
+        assert False
+
 @cython.cclass
 class ReturnsIID(Returns):
 
@@ -44,6 +79,9 @@ class ReturnsIID(Returns):
         self.standard_error = standard_error
         self.time_period = time_period
 
+        self.antithetic = False
+        self.last_randnorm = 0
+
         self.reset()
 
     def reset(self):
@@ -60,20 +98,112 @@ class ReturnsIID(Returns):
     def sample(self):
         '''Sample the returns, also of necessity steps the returns.'''
 
-        sample = lognormvariate(self.period_mu, self.period_sigma)
+        sample: cython.double
+        if self.last_randnorm > 0:
+            self.last_randnorm -= 1
+            sample = exp(self.period_mu + self.randnorm[self.last_randnorm] * self.period_sigma)
+        elif self.antithetic:
+            sample = exp(self.period_mu - normalvariate(0, 1) * self.period_sigma)
+        else:
+            sample = lognormvariate(self.period_mu, self.period_sigma)
 
         return sample
 
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+
+        self.antithetic = antithetic
+        self.last_randnorm = 0
+        if quasi is not None:
+            randnorm = quasi.normals(quasi.steps)
+            if antithetic:
+                randnorm = - randnorm
+            self.randnorm = randnorm[::-1].tolist() # Buffer is consumed from the end.
+            self.last_randnorm = len(self.randnorm)
+
+    def set_path_length(self, path_length):
+
+        pass # IID samples are cheap to generate one at a time.
+
+    def snapshot(self):
+
+        return (self.period_mu, )
+
+    def restore(self, state):
+
+        self.period_mu, = state
+
 z_hist = None
+z_hist_array = None
 sigma_hist = None
 sigma_average = -1
 
+def residuals_digest(csv_bytes):
+    '''Return the hex digest of the standardized residuals CSV contents
+    csv_bytes used to name the corresponding .npy file.
+
+    '''
+
+    return sha1(csv_bytes).hexdigest()
+
+def load_standardized_residuals(fname):
+    '''Return the [N, 2] array of historical standardized residual and
+    annualized sigma_t pairs.
+
+    If the .npy form produced by equity_model/residuals_npy.py from the
+    current contents of the CSV file fname exists alongside it, it is
+    memory mapped read only, so that its pages are shared by every env
+    and worker process on the host. The .npy file name includes a digest
+    of the CSV contents it was produced from, so a stale .npy file is
+    never used. Otherwise the CSV file is parsed.
+
+    '''
+
+    with open(fname, 'rb') as f:
+        digest = residuals_digest(f.read())
+    npy_fname = splitext(fname)[0] + '-' + digest + '.npy'
+    if exists(npy_fname):
+        return np.load(npy_fname, mmap_mode = 'r')
+
+    with open(fname) as f:
+        r = reader(f)
+        data = tuple((float(d[0]), float(d[1])) for d in r)
+
+    return np.array(data)
+
+def garch_variances(a, sigma2_0, omega, sigma2_max):
+    '''Run the GJR-GARCH variance recursion sigma2[k + 1] = omega + a[k] *
+    sigma2[k], capped at sigma2_max, for the [N, M] array of
+    coefficients a and starting variances sigma2_0. Returns the [N, M +
+    1] array of variances. Loops over time, while vectorizing across
+    episodes.
+
+    '''
+
+    n, m = a.shape
+    if n == 1:
+        # Python floats are faster than NumPy for a single episode.
+        a_list = a[0].tolist()
+        s2 = float(sigma2_0[0])
+        sigma2_list = [s2]
+        for k in range(m):
+            s2 = omega + a_list[k] * s2
+            if s2 > sigma2_max:
+                s2 = sigma2_max
+            sigma2_list.append(s2)
+        return np.array((sigma2_list, ))
+    else:
+        sigma2 = np.empty((n, m + 1))
+        sigma2[:, 0] = sigma2_0
+        for k in range(m):
+            sigma2[:, k + 1] = np.minimum(omega + a[:, k] * sigma2[:, k], sigma2_max)
+        return sigma2
+
 @cython.cclass
 class ReturnsEquity(Returns):
 
     def __init__(self, params, std_res_fname):
 
-        global z_hist, sigma_hist, sigma_average
+        global z_hist, z_hist_array, sigma_hist, sigma_average
 
         self.params = params
 
@@ -83,12 +213,11 @@ class ReturnsEquity(Returns):
 
         if z_hist is None:
             if self.bootstrap or self.params.stocks_sigma_level_type == 'sample':
-                with open(std_res_fname) as f:
-                    r = reader(f)
-                    data = tuple(r)
-                z_hist = tuple(float(d[0]) for d in data)
-                sigma_hist = tuple(float(d[1]) for d in data)
-                sigma_average = sqrt(mean(sigma ** 2 for sigma in sigma_hist))
+                residuals = load_standardized_residuals(std_res_fname)
+                z_hist_array = residuals[:, 0]
+                sigma_hist = residuals[:, 1]
+                z_hist = tuple(z_hist_array.tolist()) # Per step sampling indexes a tuple, as np.ndarray indexing is slow.
+                sigma_average = sqrt(mean(sigma ** 2 for sigma in sigma_hist.tolist()))
             else:
                 z_hist = (0.0, ) # Dummy.
 
@@ -123,10 +252,21 @@ class ReturnsEquity(Returns):
 
         self.last_randint = 0
         self.last_randnorm = 0
+        self.last_randz = 0
+        self.antithetic = False
+        self.random_state = np.random
+
+        self.path_length = 0
+        self.path_index = 0
+        self.path_len = 0
+        self.path_returns = None
+        self.path_sigma_t = None
+        self.path_log_above_trend = None
+        self.path_log_price_noise = None
 
         if self.params.stocks_sigma_level_type == 'sample':
             # Allow to run through resets. Better than using sigma_hist on each reset as sigma_hist isn't an exact representation of the GJR-GARCH sigma distribution.
-            self.sigma_t = sigma_hist[self.t] / sigma_average * self.sigma_period
+            self.sigma_t = float(sigma_hist[self.t]) / sigma_average * self.sigma_period
             self._set_price() # Price also runs through resets.
 
         self.reset()
@@ -146,6 +286,10 @@ class ReturnsEquity(Returns):
         if self.params.stocks_sigma_level_type != 'sample':
             self._set_price()
 
+        self.path_len = 0
+        if self.path_length > 0:
+            self._generate_path()
+
     def _set_price(self):
 
         self.log_price_noise = normalvariate(0, self.price_noise_sigma)
@@ -155,10 +299,18 @@ class ReturnsEquity(Returns):
     def sample(self):
         '''Sample the returns, also of necessity steps the returns.'''
 
-        ret: cython.double; len_z_hist: cython.int; periods: cython.int; z_t: cython.double
+        ret: cython.double; len_z_hist: cython.int; periods: cython.int; z_t: cython.double; i: cython.int
 
         global z_hist, sigma_hist, sigma_average
 
+        if self.path_index < self.path_len:
+            i = self.path_index
+            self.path_index += 1
+            self.sigma_t = self.path_sigma_t[i]
+            self.log_above_trend = self.path_log_above_trend[i]
+            self.log_price_noise = self.path_log_price_noise[i]
+            return self.path_returns[i]
+
         ret = 0
         sigma2_t = self.sigma_t ** 2
         len_z_hist = len(z_hist)
@@ -166,13 +318,21 @@ class ReturnsEquity(Returns):
         for _ in range(periods):
             while self.block_size == 0:
                 if self.last_randint == 0:
-                    self.randints = np.random.randint(len_z_hist, size = 10000).tolist() # Numpy randints are fast.
+                    self.randints = self.random_state.randint(len_z_hist, size = 10000).tolist() # Numpy randints are fast.
                         # .tolist() prevents slow np.ndarray indexing and prevents np.int64 values from propagating.
                     self.last_randint = len(self.randints)
                 self.last_randint -= 1
                 self.t = self.randints[self.last_randint]
                 self.block_size = 1 if self.bootstrap_years == 0 else int(expovariate(1 / (self.bootstrap_years * self.periods_per_year)) + 0.5)
-            z_t = z_hist[self.t] if self.bootstrap else normalvariate(0, 1)
+            if self.bootstrap:
+                z_t = z_hist[self.t] # Historical residuals are asymmetric, so they are not negated for antithetic variates.
+            elif self.last_randz > 0:
+                self.last_randz -= 1
+                z_t = self.randz[self.last_randz]
+            elif self.antithetic:
+                z_t = - normalvariate(0, 1)
+            else:
+                z_t = normalvariate(0, 1)
             if self.bootstrap:
                 self.t = (self.t + 1) % len_z_hist
                 self.block_size -= 1
@@ -194,14 +354,138 @@ class ReturnsEquity(Returns):
         sample = self.e ** ret
 
         if self.last_randnorm == 0:
-            self.randnorm = np.random.normal(0, self.price_noise_sigma, size = 10000).tolist() # Numpy randnorms are fast.
-                # .tolist() prevents slow np.ndarray indexing and prevents np.float64 values from propagating.
-            self.last_randnorm = len(self.randnorm)
+            self._refill_randnorm()
         self.last_randnorm -= 1
         self.log_price_noise = self.randnorm[self.last_randnorm]
 
         return sample
 
+    def _refill_randnorm(self):
+
+        randnorm = self.random_state.normal(0, self.price_noise_sigma, size = 10000) # Numpy randnorms are fast.
+        if self.antithetic:
+            randnorm = - randnorm
+        self.randnorm = randnorm.tolist()
+            # .tolist() prevents slow np.ndarray indexing and prevents np.float64 values from propagating.
+        self.last_randnorm = len(self.randnorm)
+
+    def _bootstrap_indices(self, months, t, block_size):
+        '''Return an array of the indexes into the historical residuals for
+        the next months months of a bootstrap that is block_size months
+        into a block at index t, along with the final t and block_size.
+
+        '''
+
+        len_z_hist: cython.int
+        len_z_hist = len(z_hist)
+        starts = [t]
+        lengths = [block_size]
+        total = block_size
+        mean_block = self.bootstrap_years * self.periods_per_year
+        while total < months:
+            count = int((months - total) / max(1, mean_block)) + 1
+            new_starts = self.random_state.randint(len_z_hist, size = count)
+            if self.bootstrap_years == 0:
+                new_lengths = np.ones(count, dtype = int)
+            else:
+                new_lengths = (self.random_state.exponential(mean_block, size = count) + 0.5).astype(int)
+                new_starts = new_starts[new_lengths > 0] # Zero length blocks get redrawn.
+                new_lengths = new_lengths[new_lengths > 0]
+            starts.extend(new_starts.tolist())
+            lengths.extend(new_lengths.tolist())
+            total += int(new_lengths.sum())
+
+        lengths = np.array(lengths)
+        ends = np.cumsum(lengths)
+        offsets = np.arange(ends[-1]) - np.repeat(ends - lengths, lengths)
+        indices = (np.repeat(starts, lengths) + offsets) % len_z_hist
+        used = indices[:months]
+        last_block = np.searchsorted(ends, months, side = 'right') if months > 0 else 0
+        if last_block < len(ends) and ends[last_block] > months:
+            t_end = int(indices[months])
+            block_size_end = int(ends[last_block] - months)
+        else:
+            t_end = int((used[-1] + 1) % len_z_hist) if months > 0 else t
+            block_size_end = 0
+
+        return used, t_end, block_size_end
+
+    def generate_paths(self, n, steps, *, sigma_t = None, log_above_trend = None):
+        '''Generate n episodes of steps time steps of returns starting from
+        the current state, or from the arrays of initial sigma_t and
+        log_above_trend values if supplied. Does not alter the state of
+        the returns model, except for consuming random numbers.
+
+        Returns the tuple (returns, sigma_t, log_above_trend, t,
+        block_size) where the first three are [n, steps] arrays of the
+        return factor for each step and the state after each step, and
+        the last two are the final bootstrap states.
+
+        '''
+
+        global z_hist, z_hist_array
+
+        periods = int(self.time_period * self.periods_per_year + 0.5)
+        months = steps * periods
+        sigma_t = np.full(n, self.sigma_t) if sigma_t is None else np.asarray(sigma_t, dtype = float)
+        log_above_trend = np.full(n, self.log_above_trend) if log_above_trend is None else np.asarray(log_above_trend, dtype = float)
+
+        t_end = [self.t] * n
+        block_size_end = [self.block_size] * n
+        if self.bootstrap:
+            z = np.empty((n, months))
+            for j in range(n):
+                indices, t_end[j], block_size_end[j] = self._bootstrap_indices(months, self.t, self.block_size)
+                z[j] = z_hist_array[indices]
+        else:
+            z = self.random_state.standard_normal((n, months))
+            if self.antithetic:
+                z = - z
+            if n == 1 and self.last_randz > 0:
+                k = min(months, self.last_randz)
+                z[0, :k] = self.randz[self.last_randz - k:self.last_randz][::-1]
+                self.last_randz -= k
+
+        a = (self.alpha + self.gamma * (z < 0)) * z ** 2 + self.beta
+        sigma2 = garch_variances(a, sigma_t ** 2, self.omega, self.sigma_max ** 2)
+        sigma = np.sqrt(sigma2)
+        sigma[:, 0] = sigma_t # Avoid rounding error.
+        epsilon = sigma[:, :-1] * z
+
+        # Log above trend after each month, L[k + 1] = (1 - rr) * (L[k] + price_exaggeration * epsilon[k]).
+        decay = 1 - self.period_mean_reversion_rate
+        above, _ = lfilter((decay * self.price_exaggeration, ), (1.0, - decay), epsilon, zi = (decay * log_above_trend)[:, np.newaxis])
+        above_before = np.hstack((log_above_trend[:, np.newaxis], above[:, :-1]))
+        r = self.period_mu - sigma2[:, :-1] / 2 + epsilon - self.period_mean_reversion_rate * (above_before + self.price_exaggeration * epsilon)
+
+        returns = np.exp(r.reshape(n, steps, periods).sum(axis = 2))
+
+        return returns, sigma[:, periods::periods], above[:, periods - 1::periods], t_end, block_size_end
+
+    def _generate_path(self):
+
+        returns, sigma_t, log_above_trend, t_end, block_size_end = self.generate_paths(1, self.path_length)
+
+        noise = []
+        while len(noise) < self.path_length:
+            if self.last_randnorm == 0:
+                self._refill_randnorm()
+            self.last_randnorm -= 1
+            noise.append(self.randnorm[self.last_randnorm])
+
+        self.path_returns = returns[0].tolist()
+        self.path_sigma_t = sigma_t[0].tolist()
+        self.path_log_above_trend = log_above_trend[0].tolist()
+        self.path_log_price_noise = noise
+        self.path_index = 0
+        self.path_len = self.path_length
+        self.t = t_end[0]
+        self.block_size = block_size_end[0]
+
+    def set_path_length(self, path_length):
+
+        self.path_length = path_length
+
     def observe(self):
 
         obs_above_trend = self.e ** (self.log_above_trend + self.log_price_noise)
@@ -209,6 +493,34 @@ class ReturnsEquity(Returns):
 
         return obs_above_trend, obs_sigma_level
 
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+
+        self.block_size = 0 # Start a new bootstrap block drawn from the current random number generator state.
+        self.last_randint = 0
+        self.last_randnorm = 0
+        self.last_randz = 0
+        self.path_len = 0
+        self.antithetic = antithetic
+        self.random_state = np.random if random_state is None else random_state
+        if quasi is not None:
+            sign = -1 if antithetic else 1
+            if not self.bootstrap:
+                periods = int(self.time_period * self.periods_per_year + 0.5)
+                self.randz = (sign * quasi.normals(quasi.steps * periods))[::-1].tolist() # Buffers are consumed from the end.
+                self.last_randz = len(self.randz)
+            self.randnorm = (sign * self.price_noise_sigma * quasi.normals(quasi.steps))[::-1].tolist()
+            self.last_randnorm = len(self.randnorm)
+
+    def snapshot(self):
+
+        return (self.period_mu, self.sigma_t, self.log_price_noise, self.log_above_trend, self.t, self.block_size,
+            self.path_returns, self.path_sigma_t, self.path_log_above_trend, self.path_log_price_noise, self.path_index, self.path_len)
+
+    def restore(self, state):
+
+        self.period_mu, self.sigma_t, self.log_price_noise, self.log_above_trend, self.t, self.block_size, \
+            self.path_returns, self.path_sigma_t, self.path_log_above_trend, self.path_log_price_noise, self.path_index, self.path_len = state
+
 def _report(name, rets):
 
     avg = mean(rets) - 1
@@ -8,22 +8,88 @@
 # implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
 # PURPOSE.
 
+from hashlib import sha1
 from math import exp
-from random import choice, normalvariate
+from os import getpid, makedirs, replace
+from os.path import expanduser, join
+from random import choice, getstate, normalvariate, seed, setstate
+
+import numpy as np
+
+from ai.gym_fin.persistent_cache import cache_digest, cachedir
+
+version = 1 # Bump whenever the format of the sample buffer files changes.
+
+_buffers = {}
+
+def _shared_buffer(key, generate):
+    '''Return the read only sample buffer for key, shared across
+    instances within a process, and across processes on a host by
+    memory mapping an .npy file in the cache directory. Calls generate()
+    to create the buffer if it isn't cached. The file name includes the
+    digest of the code and data the buffer is generated from.
+
+    '''
+
+    try:
+        return _buffers[key]
+    except KeyError:
+        pass
+
+    directory = expanduser(cachedir)
+    path = join(directory, 'returns_sample-v' + str(version) + '-' + cache_digest()[:16] + '-' + sha1(repr(key).encode()).hexdigest() + '.npy')
+    try:
+        buffer = np.load(path, mmap_mode = 'r')
+    except (OSError, ValueError):
+        makedirs(directory, exist_ok = True)
+        tmp_path = path + '.' + str(getpid()) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.array(generate()))
+        replace(tmp_path, path) # Atomic, so concurrent readers never see a partial file.
+        buffer = np.load(path, mmap_mode = 'r')
+
+    _buffers[key] = buffer
+
+    return buffer
 
 class ReturnsSample(object):
 
-    def __init__(self, returns, duration, standard_error, *, stepper, time_period, sample_size = 100000):
+    def __init__(self, returns, duration, standard_error, *, stepper, time_period, sample_size = 100000, key = None):
         # Need a large sample size to avoid introducing any returns bias due to large standard deviation of returns.
+        # If key is not None it must identify the parameters of the returns model, and the buffer is then shared rather than generated.
 
         self.standard_error = standard_error
         self.time_period = time_period
 
-        buffer = []
-        for _ in range(sample_size):
-            buffer.append(returns.sample(duration))
-            stepper.step()
-        self.buffer = tuple(buffer)
+        def generate():
+            buffer = []
+            for _ in range(sample_size):
+                buffer.append(returns.sample(duration))
+                stepper.step()
+            return buffer
+
+        def generate_seeded(key):
+            # Generate from a random number stream seeded from the key, leaving the stepper state and global random number generators as they were.
+            stepper_state = stepper.snapshot()
+            python_state = getstate()
+            entropy = int.from_bytes(sha1(repr(key).encode()).digest()[:4], 'little')
+            seed(entropy)
+            stepper.reset_random(random_state = np.random.RandomState(entropy))
+            try:
+                return generate()
+            finally:
+                setstate(python_state)
+                stepper.restore(stepper_state)
+
+        if key is None:
+            self.buffer = tuple(generate())
+        else:
+            key = (key, duration, time_period, sample_size)
+            self.buffer = _shared_buffer(key, lambda: generate_seeded(key))
+            stepper.reset_random()
+                # Discard any shocks buffered before or during generation, so results are the same whether or not the buffer was already cached.
+        self.samples = []
+        self.random_state = np.random
 
         self.reset()
 
@@ -33,4 +99,23 @@ class ReturnsSample(object):
 
     def sample(self):
 
-        return choice(self.buffer) * self.adjust
+        if isinstance(self.buffer, tuple):
+            return choice(self.buffer) * self.adjust
+
+        if not self.samples:
+            self.samples = self.buffer[self.random_state.randint(len(self.buffer), size = 1000)].tolist()
+                # Indexing a shared np.ndarray one element at a time is slow.
+        return self.samples.pop() * self.adjust
+
+    def reset_random(self, antithetic = False, quasi = None, random_state = None):
+
+        self.samples = [] # Samples are drawn from a fixed buffer, and there is no natural antithetic sample.
+        self.random_state = np.random if random_state is None else random_state
+
+    def snapshot(self):
+
+        return (self.adjust, )
+
+    def restore(self, state):
+
+        self.adjust, = state
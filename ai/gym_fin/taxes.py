@@ -275,6 +275,19 @@ class Taxes(object):
         self.non_qualified_dividends = 0
         self.charitable_contributions_carry = 0
 
+    def snapshot(self):
+
+        return (self.value.clone(), self.basis.clone(), self.cpi, self.cg_carry, self.capital_gains, self.qualified_dividends, self.non_qualified_dividends,
+            self.charitable_contributions_carry)
+
+    def restore(self, state):
+
+        value: AssetAllocation; basis: AssetAllocation
+        value, basis, self.cpi, self.cg_carry, self.capital_gains, self.qualified_dividends, self.non_qualified_dividends, \
+            self.charitable_contributions_carry = state
+        self.value = value.clone()
+        self.basis = basis.clone()
+
     @cython.locals(ac = cython.int, amount = cython.double, new_value = cython.double, ret = cython.double, dividend_yield = cython.double, qualified = cython.double)
     def buy_sell(self, ac, amount, new_value, ret, dividend_yield, qualified):
 
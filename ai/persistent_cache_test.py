@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+# AIPlanner - Deep Learning Financial Planner
+# Copyright (C) 2023 Gordon Irlam
+#
+# All rights reserved. This program may not be used, copied, modified,
+# or redistributed without permission.
+#
+# This program is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.
+
+# Check PersistentCache values written by one process are found by a fresh process using equal but separately constructed keys.
+
+from multiprocessing import get_context
+from tempfile import TemporaryDirectory
+
+from gym_fin.persistent_cache import PersistentCache
+
+def lookup(directory):
+
+    cache = PersistentCache('test', directory = directory)
+    key = ('real' * 3, ''.join(['realreal', 'real']), 1.5, (2, 'nominal'))
+        # Distinct str objects, unlike the key as written, so pickles of the two keys differ.
+    assert len(cache) == 1, 'Unexpected number of records'
+    assert cache[key] == [1, 2, 3], 'Wrong value'
+    try:
+        cache[key + (0, )]
+        assert False, 'Unexpected value'
+    except KeyError:
+        pass
+
+def main():
+
+    with TemporaryDirectory() as directory:
+
+        cache = PersistentCache('test', directory = directory)
+        s = 'real' * 3
+        cache[(s, s, 1.5, (2, 'nominal'))] = [1, 2, 3]
+
+        process = get_context('spawn').Process(target = lookup, args = (directory, ))
+        process.start()
+        process.join()
+        assert process.exitcode == 0, 'Lookup in a fresh process failed'
+
+    print('OK')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+# AIPlanner - Deep Learning Financial Planner
+# Copyright (C) 2023 Gordon Irlam
+#
+# All rights reserved. This program may not be used, copied, modified,
+# or redistributed without permission.
+#
+# This program is distributed WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.
+
+# Check QuasiRandom hands out the points of a single Sobol sequence irrespective of the order episodes are requested in.
+
+import numpy as np
+from scipy.stats import qmc
+
+from gym_fin.quasi_random import QuasiRandom
+
+def main():
+
+    dimensions = 64
+    steps = 100
+    block_log2 = 4
+    episodes = 5 << block_log2 # More than 2 blocks.
+
+    expected = qmc.Sobol(dimensions, scramble = True, seed = 0).random_base2(7)[:episodes]
+
+    def check(order):
+        quasi = QuasiRandom(dimensions, seed = 0, block_log2 = block_log2)
+        for episode in order:
+            stream = quasi.stream(episode, steps)
+            assert np.array_equal(stream.uniforms(dimensions), expected[episode]), 'Wrong point for episode ' + str(episode)
+
+    check(range(episodes)) # Sequential.
+    check(range(0, episodes, 3)) # Skipping episodes and blocks.
+    check(reversed(range(episodes))) # Backwards.
+    check(np.random.default_rng(0).permutation(episodes).tolist()) # Arbitrary.
+
+    quasi = QuasiRandom(dimensions, seed = 0, block_log2 = block_log2)
+    stream = quasi.stream(0, steps, np.random.RandomState(0))
+    u = stream.uniforms(dimensions + 10)
+    assert np.array_equal(u[dimensions:], np.random.RandomState(0).uniform(size = 10)), 'Wrong pseudo-random continuation'
+
+    print('OK')
+
+if __name__ == '__main__':
+    main()
@@ -25,8 +25,9 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from .life_table import LifeTable, UnableToAdjust
+from .life_table import LifeTable, UnableToAdjust, get_mortality_table
+from .lru_cache import LRUCache, cache_stats, set_cache_capacity
 from .income_annuity import IncomeAnnuity
-from .yield_curve import YieldCurve, NoData
+from .yield_curve import YieldCurve, NoData, get_yield_curve, pars_to_spots, spots_to_pars, spots_to_forwards, forwards_to_spots
 
 from .income_annuity import Scenario # Depreciated. Use IncomeAnnuity,
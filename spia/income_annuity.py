@@ -29,8 +29,11 @@
 
 from argparse import ArgumentParser
 from calendar import monthrange
+from copy import copy
 import math
 
+import numpy as np
+
 try:
     import cython
 except ImportError:
@@ -46,6 +49,23 @@ except ImportError:
         def double():
             pass
 
+def _q_by_year(life_table1, age1, life_table2, age2, start):
+    '''Return lists of the q values of each individual for successive
+    contract years up to and including the first year in which both q
+    values are 1.
+
+    '''
+
+    years = 128
+    while True:
+        y = np.arange(years)
+        q1 = life_table1.q_array(age1 + y, years = start + y, contract_ages = y) if life_table1 is not None else np.ones(years)
+        q2 = life_table2.q_array(age2 + y, years = start + y, contract_ages = y) if life_table2 is not None else np.ones(years)
+        dead = np.flatnonzero((q1 == 1) & (q2 == 1))
+        if len(dead) > 0:
+            return q1[:dead[0] + 1].tolist(), q2[:dead[0] + 1].tolist()
+        years *= 2
+
 @cython.cclass
 class IncomeAnnuity:
 
@@ -247,6 +267,7 @@ class IncomeAnnuity:
         q_y: cython.int
         q_y = -1
         a_p = 0.0
+        q1_list, q2_list = _q_by_year(self.life_table1, current_age1, self.life_table2, current_age2, start)
         while True:
             if p >= a_p:
                 if self.life_table1 is not None:
@@ -257,8 +278,8 @@ class IncomeAnnuity:
             if remaining <= 0:
                 q_y += 1
                 q1: cython.double; q2: cython.double
-                q1 = self.life_table1.q(current_age1 + q_y, year = start + q_y, contract_age = q_y) if self.life_table1 is not None else 1
-                q2 = self.life_table2.q(current_age2 + q_y, year = start + q_y, contract_age = q_y) if self.life_table2 is not None else 1
+                q1 = q1_list[q_y]
+                q2 = q2_list[q_y]
                 if q1 == q2 == 1:
                     break
                 remaining = self.frequency
@@ -294,6 +315,28 @@ class IncomeAnnuity:
 
         return start, alive1_array, alive2_array, alive1_delay_array, alive2_delay_array
 
+    def clone(self):
+        '''Return a copy of the income annuity that can be aged and added to
+        independently of the original.
+
+        Yield curve, life tables, and computed vital statistics are
+        shared with the original as they are never modified in place.
+
+        '''
+
+        c: IncomeAnnuity
+        c = copy(self)
+        if self.sched_alive is not None:
+            # Aged at least once.
+            if self._vital_stats is self:
+                c._vital_stats = c
+            c.sched_alive = list(self.sched_alive)
+            if self.life_table1 is not None and self.life_table2 is not None:
+                c.sched_alive1_only = list(self.sched_alive1_only)
+                c.sched_alive2_only = list(self.sched_alive2_only)
+
+        return c
+
     @cython.locals(age = cython.double, alive = cython.bint, alive2 = cython.bint, delay_calcs = cython.bint)
     def set_age(self, age, alive = True, alive2 = True, delay_calcs = False):
 
@@ -25,8 +25,6 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from spia.income_annuity cimport IncomeAnnuity
-
 cdef class LifeTable:
 
     cdef str table
@@ -52,10 +50,15 @@ cdef class LifeTable:
     cdef tuple table_ae_summary
     cdef dict table_ae_full
     cdef tuple projection_scale
+    cdef tuple _q_grid_key
+    cdef tuple _q_grid_period
+    cdef object _q_array_cohort
 
     # Worthwhile cdef'ing a few methods because they are called so frequently.
     # Return object so that exceptions can propagate.
 
+    cdef object _q_grid(self, double year, double contract_age)
+
     cdef object _q_int(self, double year, int age, double contract_age)
 
     cdef object q(self, double age, double year = ?, double contract_age = ?)
@@ -25,7 +25,12 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from bisect import bisect_right
+from calendar import monthrange
 import math
+from os.path import dirname, join
+
+import numpy as np
 
 try:
     import cython
@@ -42,76 +47,55 @@ except ImportError:
         def double():
             pass
 
-from .factory import make_income_annuity
-from .yield_curve import YieldCurve
+from .lru_cache import LRUCache
+from .yield_curve import get_yield_curve
 
 iam2012_date = 2012
 
-iam2012_basic_1000_q = {
-    'male': (
-        1.783, 0.446, 0.306, 0.254, 0.193, 0.186, 0.184, 0.177, 0.159, 0.143,
-        0.126, 0.123, 0.147, 0.188, 0.236, 0.282, 0.325, 0.364, 0.399, 0.430,
-        0.459, 0.492, 0.526, 0.569, 0.616, 0.669, 0.728, 0.764, 0.789, 0.808,
-        0.824, 0.834, 0.838, 0.828, 0.808, 0.789, 0.783, 0.800, 0.837, 0.889,
-        0.955, 1.029, 1.110, 1.188, 1.268, 1.355, 1.464, 1.615, 1.808, 2.032,
-        2.285, 2.557, 2.828, 3.088, 3.345, 3.616, 3.922, 4.272, 4.681, 5.146,
-        5.662, 6.237, 6.854, 7.510, 8.220, 9.007, 9.497, 10.085, 10.787, 11.625,
-        12.619, 13.798, 15.195, 16.834, 18.733, 20.905, 23.367, 26.155, 29.306, 32.858,
-        36.927, 41.703, 46.957, 52.713, 59.148, 66.505, 75.015, 84.823, 95.987, 108.482,
-        122.214, 136.799, 152.409, 169.078, 186.882, 205.844, 219.247, 238.612, 258.341, 278.219,
-        298.452, 323.610, 344.191, 364.633, 384.783, 400.000, 400.000, 400.000, 400.000, 400.000,
-        400.000, 400.000, 400.000, 400.000, 400.000, 400.000, 400.000, 400.000, 400.000, 400.000,
-        400.000,
-    ),
-    'female': (
-        1.801, 0.450, 0.287, 0.199, 0.152, 0.139, 0.130, 0.122, 0.105, 0.098,
-        0.094, 0.096, 0.105, 0.120, 0.146, 0.174, 0.199, 0.220, 0.234, 0.245,
-        0.253, 0.260, 0.266, 0.272, 0.275, 0.277, 0.284, 0.290, 0.300, 0.313,
-        0.333, 0.357, 0.375, 0.390, 0.405, 0.424, 0.447, 0.476, 0.514, 0.560,
-        0.613, 0.667, 0.723, 0.774, 0.823, 0.866, 0.917, 0.983, 1.072, 1.168,
-        1.290, 1.453, 1.622, 1.792, 1.972, 2.166, 2.393, 2.666, 3.000, 3.393,
-        3.844, 4.352, 4.899, 5.482, 6.118, 6.829, 7.279, 7.821, 8.475, 9.234,
-        10.083, 11.011, 12.030, 13.154, 14.415, 15.869, 17.555, 19.500, 21.758, 24.412,
-        27.579, 31.501, 36.122, 41.477, 47.589, 54.441, 61.972, 70.155, 78.963, 88.336,
-        98.197, 108.323, 119.188, 131.334, 145.521, 162.722, 182.120, 199.661, 217.946, 236.834,
-        256.357, 283.802, 304.716, 325.819, 346.936, 367.898, 387.607, 400.000, 400.000, 400.000,
-        400.000, 400.000, 400.000, 400.000, 400.000, 400.000, 400.000, 400.000, 400.000, 400.000,
-        400.000,
-    ),
-}
-
-projection_scale_g2 = {
-    'male': (
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.011, 0.011, 0.012, 0.012, 0.013, 0.013, 0.014, 0.014, 0.015,
-        0.015, 0.015, 0.015, 0.015, 0.015, 0.015, 0.015, 0.015, 0.015, 0.015,
-        0.015, 0.015, 0.015, 0.015, 0.015, 0.015, 0.015, 0.015, 0.015, 0.015,
-        0.015, 0.014, 0.013, 0.013, 0.012, 0.011, 0.010, 0.009, 0.009, 0.008,
-        0.007, 0.007, 0.006, 0.005, 0.005, 0.004, 0.004, 0.003, 0.003, 0.002,
-        0.002, 0.002, 0.001, 0.001, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000,
-        0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000,
-        0.000,
-    ),
-    'female': (
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010, 0.010,
-        0.010, 0.010, 0.011, 0.011, 0.011, 0.012, 0.012, 0.012, 0.012, 0.013,
-        0.013, 0.013, 0.013, 0.013, 0.013, 0.013, 0.013, 0.013, 0.013, 0.013,
-        0.013, 0.013, 0.013, 0.013, 0.013, 0.013, 0.013, 0.013, 0.013, 0.013,
-        0.013, 0.012, 0.012, 0.011, 0.010, 0.010, 0.009, 0.008, 0.007, 0.007,
-        0.006, 0.006, 0.005, 0.005, 0.004, 0.004, 0.004, 0.003, 0.003, 0.002,
-        0.002, 0.002, 0.001, 0.001, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000,
-        0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000,
-        0.000,
-    ),
-}
+# The larger mortality tables are stored in life_table.npz as arrays named <table>-<sex>:
+#
+#     iam2012_basic_1000_q: Society of Actuaries Individual Annuitant Mortality Basic Table 2012. Deaths per 1000 by age.
+#
+#     projection_scale_g2: Society of Actuaries Projection Scale G2. Annual mortality improvement by age.
+#
+#     ssa_as120_q: U.S. Social Security Administration Actuarial Study 120 cohort life table. Indexed by the birth cohort, and then age.
+#
+#     ssa_as120_cohort_years: The birth cohorts of ssa_as120_q.
+#
+#     ssa2010_q: Social Security Administration period table, 2010.
+
+_mortality_tables_path = join(dirname(__file__), 'life_table.npz')
+_mortality_tables = {}
+_mortality_tuples = {}
+
+def get_mortality_table(table, sex):
+    '''Return the read only NumPy array for the mortality table 'table'
+    and 'sex'. Tables are loaded on first use.
+
+    '''
+
+    key = table + '-' + sex
+    try:
+        return _mortality_tables[key]
+    except KeyError:
+        with np.load(_mortality_tables_path) as tables:
+            array = tables[key]
+        array.flags.writeable = False
+        _mortality_tables[key] = array
+        return array
+
+def _mortality_tuple(table, sex):
+    # Tuples are faster to index than arrays for scalar lookups.
+    key = (table, sex)
+    try:
+        return _mortality_tuples[key]
+    except KeyError:
+        if table == 'ssa_as120_q':
+            value = dict(zip(get_mortality_table('ssa_as120_cohort_years', sex).tolist(), (tuple(q) for q in get_mortality_table(table, sex).tolist())))
+        else:
+            value = tuple(get_mortality_table(table, sex).tolist())
+        _mortality_tuples[key] = value
+        return value
 
 # SOA 2005-08 Individual Payout Annuity Experience Report Table 3a Immediate annuity, nonrefund, 2012IAM "G2 for 5", aggregated according to annual income, all ages, contract years and actual / expected
 
@@ -160,636 +144,13 @@ aer2005_13_actual_expected = {
     }
 }
 
-ssa_as120_q = {
-    'male': {
-        1900 : (
-            0.14596, 0.03282, 0.01634, 0.01052, 0.00875, 0.00628, 0.00462, 0.00326, 0.00256, 0.00203,
-            0.00211, 0.00217, 0.00212, 0.00239, 0.00254, 0.00267, 0.00320, 0.00378, 0.00913, 0.00531,
-            0.00507, 0.00437, 0.00449, 0.00472, 0.00456, 0.00462, 0.00467, 0.00457, 0.00494, 0.00504,
-            0.00491, 0.00496, 0.00472, 0.00486, 0.00521, 0.00553, 0.00605, 0.00601, 0.00555, 0.00563,
-            0.00595, 0.00627, 0.00654, 0.00701, 0.00721, 0.00775, 0.00795, 0.00869, 0.00947, 0.01020,
-            0.01094, 0.01211, 0.01313, 0.01410, 0.01446, 0.01556, 0.01698, 0.01859, 0.01984, 0.02158,
-            0.02392, 0.02562, 0.02813, 0.03112, 0.03302, 0.03554, 0.03827, 0.03986, 0.04376, 0.04579,
-            0.04887, 0.05267, 0.05730, 0.06049, 0.06249, 0.06575, 0.07065, 0.07488, 0.07999, 0.08371,
-            0.09204, 0.09753, 0.10240, 0.11353, 0.12095, 0.13187, 0.14038, 0.15028, 0.16689, 0.17336,
-            0.18509, 0.19691, 0.21241, 0.23458, 0.25351, 0.27339, 0.29246, 0.31316, 0.33011, 0.35368,
-            0.37561, 0.39247, 0.41986, 0.44411, 0.46967, 0.49678, 0.52404, 0.55161, 0.57962, 0.60819,
-            0.63746, 0.66752, 0.69852, 0.73053, 0.76365, 0.79799, 0.83363, 0.87066, 0.90919, 0.94927,
-        ),
-        1910 : (
-            0.12006, 0.02284, 0.01104, 0.00833, 0.00580, 0.00410, 0.00353, 0.00283, 0.00355, 0.00235,
-            0.00216, 0.00214, 0.00194, 0.00218, 0.00233, 0.00261, 0.00284, 0.00300, 0.00352, 0.00370,
-            0.00374, 0.00381, 0.00356, 0.00359, 0.00374, 0.00379, 0.00396, 0.00385, 0.00341, 0.00331,
-            0.00340, 0.00345, 0.00353, 0.00358, 0.00375, 0.00411, 0.00372, 0.00381, 0.00399, 0.00415,
-            0.00436, 0.00486, 0.00519, 0.00559, 0.00567, 0.00617, 0.00681, 0.00750, 0.00817, 0.00913,
-            0.01033, 0.01104, 0.01228, 0.01335, 0.01412, 0.01520, 0.01676, 0.01804, 0.02036, 0.02185,
-            0.02348, 0.02473, 0.02704, 0.02852, 0.02970, 0.03122, 0.03341, 0.03514, 0.03771, 0.03964,
-            0.04312, 0.04553, 0.04792, 0.05286, 0.05641, 0.06095, 0.06523, 0.06982, 0.07540, 0.07903,
-            0.08448, 0.09042, 0.09652, 0.10764, 0.11561, 0.12587, 0.13612, 0.14854, 0.16026, 0.17820,
-            0.19257, 0.20698, 0.22877, 0.24908, 0.27105, 0.29359, 0.31553, 0.33642, 0.35583, 0.37338,
-            0.39134, 0.40980, 0.42883, 0.44849, 0.46882, 0.48990, 0.51178, 0.53451, 0.55816, 0.58277,
-            0.60840, 0.63511, 0.66295, 0.69197, 0.72225, 0.75383, 0.78679, 0.82118, 0.85707, 0.89447,
-        ),
-        1920 : (
-            0.08594, 0.01538, 0.00752, 0.00564, 0.00388, 0.00301, 0.00263, 0.00222, 0.00196, 0.00176,
-            0.00153, 0.00149, 0.00151, 0.00162, 0.00182, 0.00205, 0.00237, 0.00251, 0.00233, 0.00234,
-            0.00244, 0.00265, 0.00287, 0.00353, 0.00369, 0.00359, 0.00231, 0.00217, 0.00210, 0.00206,
-            0.00213, 0.00222, 0.00227, 0.00232, 0.00230, 0.00243, 0.00256, 0.00288, 0.00311, 0.00337,
-            0.00375, 0.00411, 0.00451, 0.00501, 0.00557, 0.00608, 0.00681, 0.00746, 0.00842, 0.00904,
-            0.00972, 0.01033, 0.01125, 0.01196, 0.01272, 0.01340, 0.01422, 0.01495, 0.01598, 0.01702,
-            0.01844, 0.01955, 0.02090, 0.02277, 0.02459, 0.02656, 0.02839, 0.03025, 0.03234, 0.03397,
-            0.03617, 0.03867, 0.04202, 0.04590, 0.04795, 0.05184, 0.05578, 0.05989, 0.06478, 0.07083,
-            0.07576, 0.08171, 0.09118, 0.09965, 0.10968, 0.12086, 0.13313, 0.14650, 0.16098, 0.17651,
-            0.19307, 0.21059, 0.22904, 0.24838, 0.26858, 0.28845, 0.30765, 0.32584, 0.34266, 0.35777,
-            0.37351, 0.38990, 0.40699, 0.42481, 0.44340, 0.46279, 0.48302, 0.50413, 0.52617, 0.54913,
-            0.57310, 0.59814, 0.62429, 0.65158, 0.68010, 0.70987, 0.74096, 0.77342, 0.80734, 0.84276,
-        ),
-        1930 : (
-            0.06495, 0.01013, 0.00467, 0.00341, 0.00293, 0.00222, 0.00191, 0.00157, 0.00124, 0.00107,
-            0.00102, 0.00098, 0.00098, 0.00113, 0.00133, 0.00146, 0.00158, 0.00158, 0.00165, 0.00171,
-            0.00180, 0.00199, 0.00214, 0.00217, 0.00198, 0.00189, 0.00177, 0.00172, 0.00167, 0.00176,
-            0.00183, 0.00186, 0.00197, 0.00214, 0.00238, 0.00255, 0.00278, 0.00307, 0.00341, 0.00375,
-            0.00402, 0.00422, 0.00455, 0.00490, 0.00520, 0.00549, 0.00586, 0.00619, 0.00664, 0.00713,
-            0.00774, 0.00825, 0.00871, 0.00941, 0.01017, 0.01115, 0.01177, 0.01261, 0.01376, 0.01477,
-            0.01576, 0.01683, 0.01778, 0.01947, 0.02093, 0.02239, 0.02406, 0.02588, 0.02748, 0.02931,
-            0.03125, 0.03341, 0.03655, 0.03918, 0.04201, 0.04523, 0.04902, 0.05332, 0.05816, 0.06363,
-            0.06978, 0.07671, 0.08453, 0.09336, 0.10327, 0.11424, 0.12620, 0.13909, 0.15284, 0.16744,
-            0.18289, 0.19919, 0.21638, 0.23447, 0.25348, 0.27216, 0.29020, 0.30727, 0.32302, 0.33712,
-            0.35183, 0.36720, 0.38326, 0.40001, 0.41752, 0.43580, 0.45488, 0.47481, 0.49564, 0.51738,
-            0.54009, 0.56381, 0.58858, 0.61446, 0.64148, 0.66972, 0.69920, 0.73001, 0.76220, 0.79580,
-        ),
-        1940 : (
-            0.05286, 0.00552, 0.00248, 0.00199, 0.00145, 0.00128, 0.00106, 0.00085, 0.00074, 0.00070,
-            0.00060, 0.00060, 0.00063, 0.00074, 0.00083, 0.00103, 0.00121, 0.00144, 0.00147, 0.00160,
-            0.00167, 0.00175, 0.00185, 0.00187, 0.00186, 0.00185, 0.00187, 0.00189, 0.00198, 0.00206,
-            0.00209, 0.00212, 0.00222, 0.00230, 0.00232, 0.00237, 0.00239, 0.00258, 0.00272, 0.00282,
-            0.00302, 0.00321, 0.00329, 0.00354, 0.00388, 0.00424, 0.00456, 0.00496, 0.00543, 0.00587,
-            0.00625, 0.00663, 0.00716, 0.00791, 0.00851, 0.00909, 0.00962, 0.01026, 0.01099, 0.01190,
-            0.01268, 0.01358, 0.01468, 0.01589, 0.01718, 0.01862, 0.02021, 0.02191, 0.02371, 0.02564,
-            0.02785, 0.03030, 0.03281, 0.03533, 0.03799, 0.04108, 0.04469, 0.04872, 0.05317, 0.05813,
-            0.06369, 0.07003, 0.07739, 0.08598, 0.09574, 0.10653, 0.11818, 0.13057, 0.14363, 0.15737,
-            0.17185, 0.18711, 0.20325, 0.22031, 0.23835, 0.25608, 0.27319, 0.28936, 0.30428, 0.31763,
-            0.33157, 0.34613, 0.36134, 0.37722, 0.39382, 0.41115, 0.42925, 0.44816, 0.46792, 0.48855,
-            0.51011, 0.53264, 0.55617, 0.58075, 0.60642, 0.63324, 0.66128, 0.69056, 0.72124, 0.75314,
-        ),
-        1950 : (
-            0.03279, 0.00239, 0.00153, 0.00108, 0.00078, 0.00067, 0.00059, 0.00058, 0.00051, 0.00049,
-            0.00043, 0.00041, 0.00047, 0.00057, 0.00079, 0.00102, 0.00129, 0.00151, 0.00178, 0.00202,
-            0.00209, 0.00218, 0.00227, 0.00226, 0.00208, 0.00203, 0.00184, 0.00187, 0.00181, 0.00188,
-            0.00189, 0.00185, 0.00186, 0.00187, 0.00197, 0.00214, 0.00238, 0.00262, 0.00282, 0.00298,
-            0.00309, 0.00323, 0.00359, 0.00390, 0.00414, 0.00436, 0.00436, 0.00452, 0.00476, 0.00510,
-            0.00545, 0.00597, 0.00604, 0.00645, 0.00691, 0.00743, 0.00800, 0.00862, 0.00929, 0.01003,
-            0.01086, 0.01179, 0.01283, 0.01398, 0.01527, 0.01669, 0.01825, 0.01989, 0.02160, 0.02341,
-            0.02548, 0.02776, 0.03009, 0.03241, 0.03486, 0.03774, 0.04111, 0.04481, 0.04882, 0.05329,
-            0.05827, 0.06406, 0.07100, 0.07931, 0.08889, 0.09945, 0.11076, 0.12265, 0.13506, 0.14803,
-            0.16165, 0.17601, 0.19122, 0.20737, 0.22454, 0.24142, 0.25770, 0.27308, 0.28726, 0.29993,
-            0.31317, 0.32699, 0.34144, 0.35653, 0.37229, 0.38876, 0.40597, 0.42395, 0.44278, 0.46236,
-            0.48291, 0.50434, 0.52673, 0.55012, 0.57458, 0.60012, 0.62683, 0.65471, 0.68387, 0.71433,
-        ),
-        1960 : (
-            0.02937, 0.00174, 0.00105, 0.00082, 0.00071, 0.00062, 0.00056, 0.00050, 0.00048, 0.00041,
-            0.00035, 0.00032, 0.00041, 0.00060, 0.00082, 0.00103, 0.00121, 0.00148, 0.00163, 0.00176,
-            0.00189, 0.00183, 0.00177, 0.00167, 0.00168, 0.00166, 0.00174, 0.00174, 0.00183, 0.00197,
-            0.00204, 0.00211, 0.00221, 0.00241, 0.00253, 0.00260, 0.00238, 0.00218, 0.00225, 0.00239,
-            0.00258, 0.00279, 0.00296, 0.00321, 0.00347, 0.00375, 0.00404, 0.00428, 0.00447, 0.00462,
-            0.00478, 0.00498, 0.00526, 0.00561, 0.00604, 0.00653, 0.00708, 0.00767, 0.00831, 0.00900,
-            0.00977, 0.01064, 0.01161, 0.01271, 0.01393, 0.01529, 0.01676, 0.01830, 0.01990, 0.02158,
-            0.02350, 0.02561, 0.02776, 0.02990, 0.03217, 0.03485, 0.03800, 0.04140, 0.04504, 0.04908,
-            0.05358, 0.05890, 0.06545, 0.07348, 0.08282, 0.09311, 0.10406, 0.11547, 0.12728, 0.13955,
-            0.15240, 0.16595, 0.18033, 0.19565, 0.21203, 0.22811, 0.24364, 0.25830, 0.27183, 0.28385,
-            0.29647, 0.30962, 0.32337, 0.33773, 0.35274, 0.36842, 0.38482, 0.40194, 0.41984, 0.43854,
-            0.45809, 0.47852, 0.49987, 0.52218, 0.54551, 0.56987, 0.59535, 0.62197, 0.64981, 0.67891,
-        ),
-        1970 : (
-            0.02246, 0.00128, 0.00090, 0.00071, 0.00056, 0.00049, 0.00044, 0.00041, 0.00035, 0.00028,
-            0.00023, 0.00023, 0.00027, 0.00041, 0.00059, 0.00080, 0.00109, 0.00122, 0.00140, 0.00144,
-            0.00156, 0.00163, 0.00160, 0.00167, 0.00165, 0.00160, 0.00143, 0.00134, 0.00128, 0.00131,
-            0.00135, 0.00142, 0.00140, 0.00147, 0.00156, 0.00167, 0.00179, 0.00193, 0.00209, 0.00226,
-            0.00244, 0.00262, 0.00282, 0.00302, 0.00324, 0.00347, 0.00370, 0.00390, 0.00405, 0.00417,
-            0.00431, 0.00450, 0.00475, 0.00507, 0.00546, 0.00592, 0.00643, 0.00697, 0.00755, 0.00819,
-            0.00889, 0.00969, 0.01059, 0.01163, 0.01279, 0.01409, 0.01548, 0.01693, 0.01842, 0.01998,
-            0.02176, 0.02373, 0.02572, 0.02771, 0.02981, 0.03232, 0.03527, 0.03842, 0.04174, 0.04542,
-            0.04951, 0.05442, 0.06061, 0.06836, 0.07743, 0.08743, 0.09801, 0.10896, 0.12021, 0.13185,
-            0.14401, 0.15683, 0.17046, 0.18504, 0.20068, 0.21604, 0.23087, 0.24486, 0.25774, 0.26923,
-            0.28123, 0.29377, 0.30687, 0.32058, 0.33490, 0.34985, 0.36549, 0.38184, 0.39893, 0.41679,
-            0.43546, 0.45497, 0.47536, 0.49668, 0.51897, 0.54227, 0.56662, 0.59208, 0.61870, 0.64653,
-        ),
-        1980 : (
-            0.01398, 0.00097, 0.00064, 0.00052, 0.00036, 0.00034, 0.00030, 0.00030, 0.00026, 0.00022,
-            0.00016, 0.00018, 0.00023, 0.00040, 0.00063, 0.00083, 0.00098, 0.00107, 0.00112, 0.00117,
-            0.00127, 0.00139, 0.00137, 0.00135, 0.00128, 0.00121, 0.00114, 0.00110, 0.00110, 0.00112,
-            0.00116, 0.00120, 0.00126, 0.00134, 0.00143, 0.00153, 0.00165, 0.00178, 0.00192, 0.00208,
-            0.00224, 0.00240, 0.00258, 0.00276, 0.00294, 0.00315, 0.00336, 0.00353, 0.00367, 0.00378,
-            0.00391, 0.00409, 0.00432, 0.00461, 0.00498, 0.00540, 0.00587, 0.00637, 0.00691, 0.00749,
-            0.00813, 0.00886, 0.00971, 0.01069, 0.01179, 0.01303, 0.01435, 0.01572, 0.01712, 0.01858,
-            0.02023, 0.02207, 0.02392, 0.02578, 0.02773, 0.03009, 0.03286, 0.03579, 0.03885, 0.04222,
-            0.04597, 0.05052, 0.05639, 0.06385, 0.07264, 0.08233, 0.09254, 0.10304, 0.11377, 0.12484,
-            0.13637, 0.14853, 0.16149, 0.17538, 0.19034, 0.20503, 0.21921, 0.23259, 0.24491, 0.25587,
-            0.26733, 0.27931, 0.29183, 0.30492, 0.31861, 0.33291, 0.34786, 0.36349, 0.37983, 0.39691,
-            0.41477, 0.43345, 0.45297, 0.47338, 0.49471, 0.51702, 0.54035, 0.56473, 0.59023, 0.61690,
-        ),
-        1990 : (
-            0.01028, 0.00075, 0.00049, 0.00039, 0.00031, 0.00026, 0.00024, 0.00020, 0.00018, 0.00015,
-            0.00013, 0.00012, 0.00018, 0.00028, 0.00043, 0.00059, 0.00074, 0.00087, 0.00097, 0.00105,
-            0.00113, 0.00120, 0.00123, 0.00121, 0.00115, 0.00108, 0.00102, 0.00099, 0.00099, 0.00102,
-            0.00105, 0.00109, 0.00115, 0.00122, 0.00131, 0.00140, 0.00151, 0.00162, 0.00175, 0.00189,
-            0.00204, 0.00219, 0.00234, 0.00251, 0.00267, 0.00286, 0.00305, 0.00321, 0.00333, 0.00344,
-            0.00356, 0.00373, 0.00394, 0.00422, 0.00455, 0.00494, 0.00538, 0.00585, 0.00634, 0.00687,
-            0.00746, 0.00813, 0.00893, 0.00986, 0.01092, 0.01209, 0.01335, 0.01465, 0.01597, 0.01733,
-            0.01888, 0.02060, 0.02233, 0.02407, 0.02590, 0.02812, 0.03073, 0.03347, 0.03629, 0.03940,
-            0.04286, 0.04711, 0.05267, 0.05985, 0.06835, 0.07772, 0.08756, 0.09764, 0.10790, 0.11844,
-            0.12940, 0.14098, 0.15332, 0.16659, 0.18091, 0.19499, 0.20858, 0.22140, 0.23318, 0.24367,
-            0.25463, 0.26610, 0.27808, 0.29061, 0.30371, 0.31740, 0.33173, 0.34670, 0.36235, 0.37872,
-            0.39583, 0.41373, 0.43244, 0.45201, 0.47247, 0.49386, 0.51625, 0.53965, 0.56411, 0.58969,
-        ),
-        2000 : (
-            0.00759, 0.00055, 0.00034, 0.00027, 0.00021, 0.00018, 0.00016, 0.00015, 0.00013, 0.00011,
-            0.00009, 0.00009, 0.00014, 0.00024, 0.00038, 0.00053, 0.00067, 0.00079, 0.00089, 0.00096,
-            0.00104, 0.00110, 0.00113, 0.00111, 0.00106, 0.00099, 0.00094, 0.00091, 0.00091, 0.00093,
-            0.00097, 0.00100, 0.00105, 0.00112, 0.00119, 0.00128, 0.00138, 0.00149, 0.00160, 0.00173,
-            0.00186, 0.00200, 0.00214, 0.00229, 0.00244, 0.00261, 0.00278, 0.00293, 0.00304, 0.00314,
-            0.00326, 0.00341, 0.00361, 0.00386, 0.00418, 0.00454, 0.00495, 0.00538, 0.00584, 0.00633,
-            0.00687, 0.00749, 0.00824, 0.00912, 0.01014, 0.01126, 0.01246, 0.01370, 0.01494, 0.01622,
-            0.01768, 0.01929, 0.02092, 0.02255, 0.02426, 0.02636, 0.02883, 0.03140, 0.03402, 0.03691,
-            0.04011, 0.04409, 0.04939, 0.05629, 0.06450, 0.07355, 0.08304, 0.09271, 0.10253, 0.11258,
-            0.12304, 0.13408, 0.14586, 0.15856, 0.17230, 0.18581, 0.19885, 0.21115, 0.22245, 0.23250,
-            0.24300, 0.25399, 0.26548, 0.27750, 0.29006, 0.30319, 0.31693, 0.33130, 0.34631, 0.36202,
-            0.37845, 0.39563, 0.41361, 0.43238, 0.45204, 0.47260, 0.49409, 0.51656, 0.54008, 0.56469,
-        ),
-        2010 : (
-            0.00587, 0.00040, 0.00026, 0.00022, 0.00017, 0.00014, 0.00013, 0.00012, 0.00011, 0.00009,
-            0.00007, 0.00008, 0.00012, 0.00022, 0.00035, 0.00049, 0.00062, 0.00073, 0.00082, 0.00089,
-            0.00096, 0.00102, 0.00104, 0.00102, 0.00097, 0.00091, 0.00086, 0.00083, 0.00083, 0.00086,
-            0.00089, 0.00092, 0.00096, 0.00102, 0.00109, 0.00118, 0.00126, 0.00136, 0.00147, 0.00158,
-            0.00170, 0.00183, 0.00196, 0.00209, 0.00223, 0.00238, 0.00254, 0.00268, 0.00278, 0.00288,
-            0.00299, 0.00313, 0.00331, 0.00355, 0.00385, 0.00419, 0.00457, 0.00497, 0.00539, 0.00585,
-            0.00635, 0.00693, 0.00763, 0.00847, 0.00944, 0.01053, 0.01167, 0.01284, 0.01402, 0.01523,
-            0.01660, 0.01811, 0.01965, 0.02119, 0.02280, 0.02479, 0.02713, 0.02954, 0.03200, 0.03469,
-            0.03768, 0.04142, 0.04647, 0.05310, 0.06103, 0.06977, 0.07890, 0.08820, 0.09761, 0.10722,
-            0.11721, 0.12776, 0.13904, 0.15121, 0.16442, 0.17740, 0.18993, 0.20175, 0.21261, 0.22225,
-            0.23234, 0.24289, 0.25392, 0.26545, 0.27752, 0.29013, 0.30333, 0.31713, 0.33157, 0.34667,
-            0.36246, 0.37897, 0.39625, 0.41432, 0.43323, 0.45300, 0.47368, 0.49531, 0.51795, 0.54163,
-        ),
-        2020 : (
-            0.00486, 0.00034, 0.00023, 0.00019, 0.00014, 0.00013, 0.00012, 0.00011, 0.00009, 0.00008,
-            0.00006, 0.00006, 0.00010, 0.00019, 0.00032, 0.00045, 0.00057, 0.00068, 0.00076, 0.00082,
-            0.00088, 0.00094, 0.00096, 0.00094, 0.00090, 0.00084, 0.00079, 0.00077, 0.00077, 0.00079,
-            0.00081, 0.00084, 0.00089, 0.00094, 0.00101, 0.00108, 0.00116, 0.00125, 0.00134, 0.00145,
-            0.00156, 0.00168, 0.00179, 0.00192, 0.00204, 0.00218, 0.00233, 0.00246, 0.00256, 0.00264,
-            0.00274, 0.00288, 0.00305, 0.00328, 0.00355, 0.00387, 0.00423, 0.00461, 0.00500, 0.00542,
-            0.00588, 0.00642, 0.00708, 0.00789, 0.00882, 0.00986, 0.01096, 0.01208, 0.01319, 0.01433,
-            0.01563, 0.01706, 0.01851, 0.01996, 0.02149, 0.02338, 0.02560, 0.02788, 0.03018, 0.03271,
-            0.03550, 0.03904, 0.04385, 0.05023, 0.05789, 0.06632, 0.07512, 0.08406, 0.09309, 0.10230,
-            0.11187, 0.12197, 0.13278, 0.14447, 0.15718, 0.16968, 0.18174, 0.19311, 0.20355, 0.21282,
-            0.22252, 0.23266, 0.24326, 0.25436, 0.26597, 0.27811, 0.29080, 0.30408, 0.31798, 0.33251,
-            0.34771, 0.36362, 0.38025, 0.39766, 0.41586, 0.43491, 0.45483, 0.47568, 0.49749, 0.52031,
-        ),
-        2030 : (
-            0.00408, 0.00030, 0.00020, 0.00016, 0.00012, 0.00011, 0.00010, 0.00010, 0.00008, 0.00006,
-            0.00005, 0.00005, 0.00009, 0.00017, 0.00029, 0.00041, 0.00052, 0.00062, 0.00070, 0.00076,
-            0.00081, 0.00086, 0.00089, 0.00087, 0.00083, 0.00077, 0.00073, 0.00071, 0.00070, 0.00072,
-            0.00075, 0.00078, 0.00081, 0.00086, 0.00092, 0.00099, 0.00106, 0.00115, 0.00124, 0.00133,
-            0.00143, 0.00154, 0.00165, 0.00176, 0.00188, 0.00201, 0.00214, 0.00226, 0.00235, 0.00244,
-            0.00253, 0.00266, 0.00282, 0.00303, 0.00329, 0.00359, 0.00393, 0.00428, 0.00465, 0.00504,
-            0.00547, 0.00597, 0.00660, 0.00737, 0.00827, 0.00926, 0.01032, 0.01138, 0.01244, 0.01353,
-            0.01475, 0.01611, 0.01748, 0.01885, 0.02030, 0.02210, 0.02421, 0.02637, 0.02854, 0.03092,
-            0.03355, 0.03690, 0.04150, 0.04764, 0.05503, 0.06316, 0.07165, 0.08026, 0.08892, 0.09777,
-            0.10694, 0.11664, 0.12703, 0.13827, 0.15052, 0.16257, 0.17419, 0.18515, 0.19521, 0.20413,
-            0.21346, 0.22323, 0.23344, 0.24413, 0.25530, 0.26699, 0.27923, 0.29202, 0.30542, 0.31942,
-            0.33408, 0.34941, 0.36544, 0.38223, 0.39979, 0.41815, 0.43737, 0.45750, 0.47854, 0.50055,
-        ),
-        2040 : (
-            0.00343, 0.00026, 0.00017, 0.00014, 0.00011, 0.00010, 0.00009, 0.00008, 0.00007, 0.00005,
-            0.00004, 0.00004, 0.00008, 0.00015, 0.00026, 0.00038, 0.00048, 0.00058, 0.00065, 0.00070,
-            0.00075, 0.00080, 0.00082, 0.00080, 0.00076, 0.00071, 0.00067, 0.00065, 0.00065, 0.00067,
-            0.00069, 0.00072, 0.00075, 0.00080, 0.00085, 0.00091, 0.00098, 0.00106, 0.00114, 0.00123,
-            0.00132, 0.00142, 0.00152, 0.00162, 0.00173, 0.00185, 0.00197, 0.00208, 0.00217, 0.00225,
-            0.00234, 0.00246, 0.00261, 0.00281, 0.00305, 0.00334, 0.00366, 0.00399, 0.00433, 0.00469,
-            0.00509, 0.00557, 0.00616, 0.00690, 0.00776, 0.00872, 0.00973, 0.01076, 0.01177, 0.01279,
-            0.01395, 0.01524, 0.01654, 0.01785, 0.01923, 0.02094, 0.02295, 0.02501, 0.02706, 0.02930,
-            0.03179, 0.03497, 0.03938, 0.04529, 0.05241, 0.06027, 0.06846, 0.07675, 0.08509, 0.09359,
-            0.10241, 0.11172, 0.12172, 0.13255, 0.14437, 0.15600, 0.16722, 0.17779, 0.18750, 0.19610,
-            0.20509, 0.21451, 0.22435, 0.23465, 0.24544, 0.25671, 0.26851, 0.28087, 0.29378, 0.30729,
-            0.32144, 0.33624, 0.35172, 0.36792, 0.38488, 0.40262, 0.42117, 0.44059, 0.46093, 0.48220,
-        ),
-        2050 : (
-            0.00289, 0.00023, 0.00015, 0.00012, 0.00010, 0.00008, 0.00008, 0.00008, 0.00006, 0.00005,
-            0.00003, 0.00003, 0.00007, 0.00014, 0.00024, 0.00035, 0.00045, 0.00053, 0.00060, 0.00064,
-            0.00069, 0.00074, 0.00075, 0.00074, 0.00070, 0.00066, 0.00062, 0.00060, 0.00060, 0.00061,
-            0.00064, 0.00066, 0.00069, 0.00073, 0.00078, 0.00084, 0.00090, 0.00097, 0.00105, 0.00113,
-            0.00122, 0.00131, 0.00140, 0.00150, 0.00159, 0.00171, 0.00182, 0.00192, 0.00201, 0.00208,
-            0.00217, 0.00228, 0.00242, 0.00261, 0.00284, 0.00311, 0.00342, 0.00373, 0.00405, 0.00439,
-            0.00476, 0.00520, 0.00576, 0.00647, 0.00730, 0.00823, 0.00920, 0.01018, 0.01114, 0.01212,
-            0.01322, 0.01445, 0.01569, 0.01693, 0.01824, 0.01988, 0.02180, 0.02376, 0.02570, 0.02783,
-            0.03019, 0.03322, 0.03744, 0.04314, 0.05002, 0.05760, 0.06551, 0.07350, 0.08154, 0.08972,
-            0.09821, 0.10718, 0.11682, 0.12727, 0.13869, 0.14992, 0.16076, 0.17099, 0.18036, 0.18865,
-            0.19733, 0.20642, 0.21592, 0.22587, 0.23628, 0.24717, 0.25856, 0.27049, 0.28297, 0.29603,
-            0.30969, 0.32399, 0.33895, 0.35461, 0.37100, 0.38815, 0.40609, 0.42488, 0.44453, 0.46510,
-        ),
-        2060 : (
-            0.00243, 0.00020, 0.00013, 0.00011, 0.00008, 0.00008, 0.00007, 0.00007, 0.00006, 0.00004,
-            0.00003, 0.00003, 0.00006, 0.00012, 0.00022, 0.00032, 0.00041, 0.00049, 0.00055, 0.00060,
-            0.00064, 0.00068, 0.00070, 0.00068, 0.00065, 0.00061, 0.00058, 0.00055, 0.00055, 0.00057,
-            0.00059, 0.00061, 0.00064, 0.00068, 0.00072, 0.00077, 0.00083, 0.00090, 0.00097, 0.00104,
-            0.00112, 0.00121, 0.00129, 0.00138, 0.00147, 0.00158, 0.00168, 0.00178, 0.00186, 0.00193,
-            0.00201, 0.00212, 0.00226, 0.00243, 0.00265, 0.00291, 0.00319, 0.00349, 0.00379, 0.00410,
-            0.00445, 0.00487, 0.00541, 0.00609, 0.00689, 0.00778, 0.00872, 0.00966, 0.01058, 0.01151,
-            0.01255, 0.01372, 0.01491, 0.01609, 0.01734, 0.01891, 0.02075, 0.02261, 0.02446, 0.02649,
-            0.02872, 0.03162, 0.03568, 0.04117, 0.04781, 0.05514, 0.06278, 0.07050, 0.07825, 0.08613,
-            0.09432, 0.10297, 0.11227, 0.12237, 0.13342, 0.14429, 0.15477, 0.16466, 0.17372, 0.18174,
-            0.19013, 0.19890, 0.20808, 0.21770, 0.22777, 0.23829, 0.24930, 0.26084, 0.27290, 0.28553,
-            0.29875, 0.31257, 0.32705, 0.34221, 0.35806, 0.37465, 0.39202, 0.41020, 0.42922, 0.44914,
-        ),
-        2070 : (
-            0.00205, 0.00018, 0.00012, 0.00010, 0.00007, 0.00007, 0.00006, 0.00006, 0.00005, 0.00003,
-            0.00002, 0.00002, 0.00005, 0.00011, 0.00020, 0.00029, 0.00038, 0.00045, 0.00051, 0.00055,
-            0.00059, 0.00063, 0.00064, 0.00063, 0.00060, 0.00056, 0.00053, 0.00051, 0.00051, 0.00052,
-            0.00054, 0.00056, 0.00059, 0.00062, 0.00067, 0.00072, 0.00077, 0.00083, 0.00089, 0.00096,
-            0.00104, 0.00112, 0.00120, 0.00128, 0.00136, 0.00146, 0.00156, 0.00165, 0.00172, 0.00179,
-            0.00187, 0.00197, 0.00210, 0.00227, 0.00247, 0.00272, 0.00299, 0.00327, 0.00355, 0.00385,
-            0.00417, 0.00457, 0.00508, 0.00573, 0.00651, 0.00737, 0.00827, 0.00918, 0.01005, 0.01094,
-            0.01194, 0.01305, 0.01418, 0.01532, 0.01651, 0.01801, 0.01977, 0.02156, 0.02332, 0.02525,
-            0.02738, 0.03015, 0.03405, 0.03936, 0.04578, 0.05287, 0.06025, 0.06771, 0.07519, 0.08280,
-            0.09070, 0.09906, 0.10805, 0.11782, 0.12851, 0.13904, 0.14920, 0.15877, 0.16754, 0.17529,
-            0.18341, 0.19189, 0.20078, 0.21009, 0.21982, 0.23000, 0.24067, 0.25183, 0.26351, 0.27574,
-            0.28853, 0.30191, 0.31593, 0.33060, 0.34597, 0.36203, 0.37886, 0.39647, 0.41490, 0.43420,
-        ),
-        2080 : (
-            0.00173, 0.00016, 0.00010, 0.00009, 0.00007, 0.00006, 0.00006, 0.00005, 0.00004, 0.00003,
-            0.00002, 0.00002, 0.00004, 0.00010, 0.00018, 0.00027, 0.00035, 0.00042, 0.00047, 0.00051,
-            0.00055, 0.00058, 0.00059, 0.00058, 0.00055, 0.00052, 0.00049, 0.00047, 0.00047, 0.00048,
-            0.00050, 0.00052, 0.00054, 0.00058, 0.00062, 0.00066, 0.00071, 0.00077, 0.00083, 0.00089,
-            0.00096, 0.00103, 0.00111, 0.00118, 0.00126, 0.00135, 0.00145, 0.00153, 0.00160, 0.00167,
-            0.00174, 0.00184, 0.00196, 0.00212, 0.00232, 0.00255, 0.00281, 0.00308, 0.00334, 0.00362,
-            0.00392, 0.00429, 0.00478, 0.00541, 0.00616, 0.00699, 0.00786, 0.00873, 0.00957, 0.01042,
-            0.01137, 0.01244, 0.01352, 0.01460, 0.01574, 0.01718, 0.01888, 0.02059, 0.02227, 0.02411,
-            0.02615, 0.02880, 0.03256, 0.03768, 0.04389, 0.05075, 0.05789, 0.06511, 0.07234, 0.07970,
-            0.08734, 0.09542, 0.10411, 0.11357, 0.12394, 0.13415, 0.14400, 0.15328, 0.16177, 0.16928,
-            0.17713, 0.18535, 0.19396, 0.20296, 0.21239, 0.22226, 0.23259, 0.24340, 0.25471, 0.26656,
-            0.27896, 0.29193, 0.30552, 0.31973, 0.33462, 0.35021, 0.36651, 0.38359, 0.40147, 0.42017,
-        ),
-        2090 : (
-            0.00147, 0.00014, 0.00009, 0.00008, 0.00006, 0.00005, 0.00005, 0.00005, 0.00004, 0.00003,
-            0.00001, 0.00001, 0.00004, 0.00009, 0.00017, 0.00025, 0.00032, 0.00039, 0.00044, 0.00047,
-            0.00050, 0.00054, 0.00055, 0.00054, 0.00051, 0.00048, 0.00045, 0.00044, 0.00044, 0.00045,
-            0.00046, 0.00048, 0.00050, 0.00053, 0.00057, 0.00061, 0.00066, 0.00071, 0.00077, 0.00083,
-            0.00089, 0.00096, 0.00103, 0.00110, 0.00117, 0.00126, 0.00135, 0.00142, 0.00149, 0.00155,
-            0.00162, 0.00172, 0.00184, 0.00199, 0.00217, 0.00240, 0.00264, 0.00290, 0.00314, 0.00341,
-            0.00369, 0.00404, 0.00451, 0.00511, 0.00583, 0.00664, 0.00748, 0.00832, 0.00912, 0.00993,
-            0.01085, 0.01186, 0.01290, 0.01394, 0.01503, 0.01641, 0.01804, 0.01968, 0.02129, 0.02305,
-            0.02500, 0.02755, 0.03117, 0.03612, 0.04213, 0.04878, 0.05570, 0.06268, 0.06968, 0.07680,
-            0.08419, 0.09201, 0.10044, 0.10961, 0.11967, 0.12958, 0.13913, 0.14813, 0.15637, 0.16365,
-            0.17126, 0.17922, 0.18756, 0.19629, 0.20543, 0.21500, 0.22500, 0.23549, 0.24647, 0.25795,
-            0.26998, 0.28256, 0.29669, 0.31152, 0.32710, 0.34345, 0.36062, 0.37866, 0.39759, 0.41747,
-        ),
-        2100 : (
-            0.00124, 0.00012, 0.00008, 0.00007, 0.00005, 0.00005, 0.00005, 0.00004, 0.00004, 0.00002,
-            0.00001, 0.00001, 0.00003, 0.00008, 0.00015, 0.00023, 0.00030, 0.00036, 0.00040, 0.00043,
-            0.00047, 0.00050, 0.00051, 0.00050, 0.00047, 0.00044, 0.00042, 0.00040, 0.00040, 0.00041,
-            0.00043, 0.00044, 0.00047, 0.00049, 0.00053, 0.00057, 0.00061, 0.00066, 0.00071, 0.00076,
-            0.00082, 0.00089, 0.00095, 0.00102, 0.00109, 0.00117, 0.00125, 0.00133, 0.00139, 0.00145,
-            0.00152, 0.00161, 0.00172, 0.00187, 0.00204, 0.00226, 0.00249, 0.00273, 0.00296, 0.00321,
-            0.00348, 0.00381, 0.00425, 0.00484, 0.00554, 0.00632, 0.00713, 0.00793, 0.00871, 0.00948,
-            0.01036, 0.01133, 0.01232, 0.01332, 0.01437, 0.01570, 0.01726, 0.01884, 0.02038, 0.02207,
-            0.02394, 0.02639, 0.02988, 0.03467, 0.04050, 0.04694, 0.05365, 0.06041, 0.06719, 0.07409,
-            0.08125, 0.08883, 0.09699, 0.10590, 0.11567, 0.12529, 0.13457, 0.14331, 0.15131, 0.15836,
-            0.16574, 0.17347, 0.18214, 0.19125, 0.20081, 0.21085, 0.22139, 0.23246, 0.24408, 0.25629,
-            0.26910, 0.28256, 0.29669, 0.31152, 0.32710, 0.34345, 0.36062, 0.37866, 0.39759, 0.41747,
-        ),
-    },
-    'female': {
-        1900 : (
-            0.11969, 0.03061, 0.01489, 0.01011, 0.00823, 0.00585, 0.00428, 0.00306, 0.00232, 0.00186,
-            0.00203, 0.00198, 0.00195, 0.00227, 0.00233, 0.00256, 0.00304, 0.00364, 0.00785, 0.00518,
-            0.00535, 0.00458, 0.00468, 0.00479, 0.00471, 0.00477, 0.00487, 0.00458, 0.00472, 0.00476,
-            0.00445, 0.00447, 0.00432, 0.00426, 0.00437, 0.00458, 0.00494, 0.00482, 0.00451, 0.00448,
-            0.00460, 0.00469, 0.00476, 0.00503, 0.00505, 0.00526, 0.00539, 0.00575, 0.00592, 0.00628,
-            0.00656, 0.00727, 0.00765, 0.00805, 0.00807, 0.00837, 0.00914, 0.00990, 0.01038, 0.01108,
-            0.01237, 0.01331, 0.01474, 0.01606, 0.01674, 0.01794, 0.01949, 0.02081, 0.02165, 0.02296,
-            0.02513, 0.02737, 0.03027, 0.03229, 0.03419, 0.03628, 0.03935, 0.04218, 0.04627, 0.04954,
-            0.05620, 0.06011, 0.06453, 0.07291, 0.07979, 0.08888, 0.09660, 0.10639, 0.11968, 0.12690,
-            0.13718, 0.14864, 0.16007, 0.18423, 0.20021, 0.22006, 0.23851, 0.25991, 0.27881, 0.30675,
-            0.32915, 0.34475, 0.37260, 0.39781, 0.42451, 0.45317, 0.48253, 0.51270, 0.54382, 0.57602,
-            0.60944, 0.64414, 0.68038, 0.71823, 0.75783, 0.79799, 0.83363, 0.87066, 0.90919, 0.94927,
-        ),
-        1910 : (
-            0.09826, 0.02159, 0.00987, 0.00782, 0.00536, 0.00372, 0.00311, 0.00243, 0.00332, 0.00205,
-            0.00184, 0.00178, 0.00164, 0.00186, 0.00203, 0.00238, 0.00267, 0.00283, 0.00330, 0.00346,
-            0.00341, 0.00351, 0.00335, 0.00326, 0.00331, 0.00336, 0.00357, 0.00333, 0.00298, 0.00285,
-            0.00277, 0.00273, 0.00264, 0.00280, 0.00282, 0.00288, 0.00280, 0.00279, 0.00284, 0.00283,
-            0.00297, 0.00318, 0.00332, 0.00346, 0.00351, 0.00365, 0.00399, 0.00436, 0.00466, 0.00494,
-            0.00543, 0.00588, 0.00638, 0.00685, 0.00722, 0.00751, 0.00808, 0.00876, 0.00982, 0.01041,
-            0.01123, 0.01197, 0.01272, 0.01350, 0.01414, 0.01465, 0.01575, 0.01694, 0.01831, 0.01951,
-            0.02194, 0.02346, 0.02529, 0.02808, 0.03057, 0.03347, 0.03654, 0.03991, 0.04363, 0.04707,
-            0.05072, 0.05507, 0.06040, 0.06893, 0.07585, 0.08466, 0.09392, 0.10383, 0.11634, 0.13286,
-            0.14762, 0.16227, 0.18119, 0.20041, 0.22104, 0.24247, 0.26366, 0.28420, 0.30367, 0.32165,
-            0.34031, 0.35969, 0.37992, 0.40106, 0.42317, 0.44633, 0.47062, 0.49612, 0.52290, 0.55105,
-            0.58064, 0.61177, 0.64453, 0.67903, 0.71533, 0.75357, 0.78679, 0.82118, 0.85707, 0.89447,
-        ),
-        1920 : (
-            0.06773, 0.01418, 0.00650, 0.00521, 0.00350, 0.00267, 0.00225, 0.00178, 0.00156, 0.00134,
-            0.00116, 0.00117, 0.00116, 0.00124, 0.00143, 0.00161, 0.00187, 0.00195, 0.00191, 0.00187,
-            0.00191, 0.00192, 0.00190, 0.00190, 0.00182, 0.00171, 0.00163, 0.00156, 0.00145, 0.00142,
-            0.00143, 0.00146, 0.00148, 0.00149, 0.00149, 0.00158, 0.00166, 0.00188, 0.00196, 0.00208,
-            0.00235, 0.00246, 0.00273, 0.00301, 0.00324, 0.00359, 0.00393, 0.00422, 0.00467, 0.00487,
-            0.00528, 0.00556, 0.00577, 0.00624, 0.00652, 0.00686, 0.00726, 0.00760, 0.00813, 0.00862,
-            0.00954, 0.01030, 0.01112, 0.01218, 0.01314, 0.01423, 0.01551, 0.01666, 0.01760, 0.01886,
-            0.02032, 0.02207, 0.02413, 0.02659, 0.02868, 0.03149, 0.03450, 0.03748, 0.04127, 0.04622,
-            0.05102, 0.05613, 0.06343, 0.07024, 0.07814, 0.08701, 0.09691, 0.10801, 0.12038, 0.13401,
-            0.14886, 0.16486, 0.18192, 0.20000, 0.21903, 0.23808, 0.25681, 0.27490, 0.29199, 0.30770,
-            0.32423, 0.34161, 0.35990, 0.37917, 0.39944, 0.42079, 0.44327, 0.46700, 0.49196, 0.51820,
-            0.54586, 0.57501, 0.60573, 0.63810, 0.67224, 0.70820, 0.74096, 0.77342, 0.80734, 0.84276,
-        ),
-        1930 : (
-            0.05179, 0.00908, 0.00409, 0.00303, 0.00261, 0.00195, 0.00157, 0.00122, 0.00096, 0.00076,
-            0.00073, 0.00068, 0.00064, 0.00077, 0.00083, 0.00090, 0.00092, 0.00098, 0.00097, 0.00092,
-            0.00092, 0.00091, 0.00090, 0.00084, 0.00082, 0.00085, 0.00085, 0.00092, 0.00094, 0.00100,
-            0.00106, 0.00112, 0.00120, 0.00131, 0.00146, 0.00157, 0.00165, 0.00183, 0.00202, 0.00219,
-            0.00232, 0.00250, 0.00266, 0.00282, 0.00296, 0.00307, 0.00324, 0.00341, 0.00367, 0.00380,
-            0.00418, 0.00446, 0.00467, 0.00518, 0.00553, 0.00603, 0.00632, 0.00692, 0.00773, 0.00825,
-            0.00891, 0.00961, 0.01023, 0.01131, 0.01213, 0.01314, 0.01428, 0.01533, 0.01675, 0.01825,
-            0.01981, 0.02142, 0.02372, 0.02578, 0.02803, 0.03066, 0.03370, 0.03707, 0.04078, 0.04491,
-            0.04965, 0.05502, 0.06094, 0.06745, 0.07476, 0.08303, 0.09239, 0.10288, 0.11450, 0.12722,
-            0.14100, 0.15582, 0.17166, 0.18850, 0.20635, 0.22420, 0.24176, 0.25872, 0.27471, 0.28936,
-            0.30481, 0.32109, 0.33823, 0.35631, 0.37537, 0.39545, 0.41662, 0.43894, 0.46245, 0.48726,
-            0.51339, 0.54093, 0.56997, 0.60059, 0.63288, 0.66690, 0.69920, 0.73001, 0.76220, 0.79580,
-        ),
-        1940 : (
-            0.04163, 0.00497, 0.00208, 0.00164, 0.00129, 0.00100, 0.00076, 0.00058, 0.00051, 0.00046,
-            0.00040, 0.00037, 0.00043, 0.00043, 0.00042, 0.00048, 0.00055, 0.00063, 0.00060, 0.00063,
-            0.00063, 0.00064, 0.00071, 0.00074, 0.00076, 0.00077, 0.00082, 0.00083, 0.00091, 0.00096,
-            0.00101, 0.00108, 0.00115, 0.00119, 0.00119, 0.00121, 0.00126, 0.00134, 0.00142, 0.00153,
-            0.00164, 0.00172, 0.00183, 0.00197, 0.00216, 0.00234, 0.00252, 0.00277, 0.00303, 0.00323,
-            0.00356, 0.00381, 0.00413, 0.00453, 0.00491, 0.00537, 0.00571, 0.00628, 0.00671, 0.00736,
-            0.00797, 0.00863, 0.00949, 0.01037, 0.01132, 0.01240, 0.01358, 0.01483, 0.01614, 0.01753,
-            0.01912, 0.02090, 0.02273, 0.02461, 0.02661, 0.02895, 0.03168, 0.03467, 0.03791, 0.04148,
-            0.04561, 0.05039, 0.05585, 0.06212, 0.06929, 0.07742, 0.08651, 0.09656, 0.10754, 0.11946,
-            0.13232, 0.14614, 0.16096, 0.17679, 0.19367, 0.21054, 0.22714, 0.24315, 0.25823, 0.27208,
-            0.28667, 0.30205, 0.31827, 0.33537, 0.35339, 0.37239, 0.39242, 0.41354, 0.43580, 0.45928,
-            0.48404, 0.51015, 0.53766, 0.56667, 0.59728, 0.62954, 0.66128, 0.69056, 0.72124, 0.75314,
-        ),
-        1950 : (
-            0.02551, 0.00223, 0.00128, 0.00092, 0.00064, 0.00054, 0.00044, 0.00041, 0.00035, 0.00032,
-            0.00030, 0.00028, 0.00028, 0.00033, 0.00038, 0.00044, 0.00055, 0.00060, 0.00067, 0.00071,
-            0.00071, 0.00071, 0.00074, 0.00073, 0.00070, 0.00069, 0.00068, 0.00069, 0.00072, 0.00071,
-            0.00075, 0.00076, 0.00078, 0.00081, 0.00089, 0.00095, 0.00101, 0.00115, 0.00125, 0.00131,
-            0.00138, 0.00148, 0.00166, 0.00183, 0.00200, 0.00217, 0.00229, 0.00247, 0.00263, 0.00290,
-            0.00315, 0.00350, 0.00364, 0.00395, 0.00430, 0.00470, 0.00514, 0.00563, 0.00615, 0.00672,
-            0.00734, 0.00804, 0.00880, 0.00964, 0.01055, 0.01157, 0.01268, 0.01384, 0.01505, 0.01633,
-            0.01779, 0.01941, 0.02109, 0.02280, 0.02462, 0.02678, 0.02931, 0.03202, 0.03489, 0.03804,
-            0.04168, 0.04599, 0.05111, 0.05718, 0.06423, 0.07221, 0.08104, 0.09066, 0.10106, 0.11226,
-            0.12431, 0.13727, 0.15119, 0.16613, 0.18213, 0.19814, 0.21388, 0.22906, 0.24335, 0.25646,
-            0.27029, 0.28486, 0.30023, 0.31643, 0.33352, 0.35153, 0.37053, 0.39058, 0.41170, 0.43398,
-            0.45748, 0.48227, 0.50841, 0.53598, 0.56505, 0.59572, 0.62683, 0.65471, 0.68387, 0.71433,
-        ),
-        1960 : (
-            0.02262, 0.00152, 0.00091, 0.00069, 0.00053, 0.00047, 0.00041, 0.00035, 0.00033, 0.00028,
-            0.00025, 0.00025, 0.00027, 0.00031, 0.00037, 0.00042, 0.00049, 0.00058, 0.00060, 0.00060,
-            0.00060, 0.00058, 0.00057, 0.00056, 0.00057, 0.00056, 0.00060, 0.00065, 0.00069, 0.00072,
-            0.00075, 0.00079, 0.00082, 0.00091, 0.00100, 0.00109, 0.00111, 0.00113, 0.00124, 0.00134,
-            0.00147, 0.00164, 0.00174, 0.00186, 0.00197, 0.00208, 0.00221, 0.00234, 0.00248, 0.00264,
-            0.00281, 0.00301, 0.00326, 0.00355, 0.00389, 0.00427, 0.00469, 0.00515, 0.00564, 0.00616,
-            0.00673, 0.00737, 0.00808, 0.00887, 0.00973, 0.01070, 0.01175, 0.01284, 0.01397, 0.01515,
-            0.01651, 0.01801, 0.01956, 0.02113, 0.02281, 0.02482, 0.02718, 0.02966, 0.03222, 0.03504,
-            0.03828, 0.04221, 0.04702, 0.05289, 0.05979, 0.06758, 0.07612, 0.08534, 0.09520, 0.10577,
-            0.11710, 0.12928, 0.14240, 0.15652, 0.17173, 0.18694, 0.20189, 0.21631, 0.22989, 0.24233,
-            0.25546, 0.26930, 0.28389, 0.29929, 0.31552, 0.33265, 0.35071, 0.36976, 0.38986, 0.41105,
-            0.43341, 0.45700, 0.48189, 0.50813, 0.53583, 0.56503, 0.59535, 0.62197, 0.64981, 0.67891,
-        ),
-        1970 : (
-            0.01759, 0.00109, 0.00071, 0.00050, 0.00041, 0.00036, 0.00030, 0.00026, 0.00025, 0.00020,
-            0.00019, 0.00018, 0.00019, 0.00022, 0.00030, 0.00037, 0.00045, 0.00050, 0.00053, 0.00053,
-            0.00050, 0.00051, 0.00049, 0.00052, 0.00054, 0.00056, 0.00056, 0.00055, 0.00056, 0.00059,
-            0.00063, 0.00069, 0.00073, 0.00079, 0.00087, 0.00096, 0.00105, 0.00115, 0.00125, 0.00135,
-            0.00146, 0.00157, 0.00167, 0.00176, 0.00184, 0.00193, 0.00204, 0.00215, 0.00228, 0.00242,
-            0.00257, 0.00276, 0.00299, 0.00326, 0.00357, 0.00393, 0.00432, 0.00474, 0.00519, 0.00567,
-            0.00619, 0.00678, 0.00743, 0.00818, 0.00900, 0.00993, 0.01092, 0.01195, 0.01301, 0.01411,
-            0.01537, 0.01677, 0.01821, 0.01967, 0.02122, 0.02311, 0.02531, 0.02760, 0.02992, 0.03245,
-            0.03537, 0.03897, 0.04350, 0.04917, 0.05589, 0.06346, 0.07171, 0.08053, 0.08991, 0.09989,
-            0.11058, 0.12207, 0.13447, 0.14786, 0.16233, 0.17681, 0.19105, 0.20477, 0.21769, 0.22953,
-            0.24201, 0.25519, 0.26908, 0.28374, 0.29920, 0.31551, 0.33272, 0.35088, 0.37003, 0.39024,
-            0.41157, 0.43405, 0.45779, 0.48284, 0.50927, 0.53715, 0.56657, 0.59208, 0.61870, 0.64653,
-        ),
-        1980 : (
-            0.01125, 0.00083, 0.00054, 0.00035, 0.00028, 0.00024, 0.00021, 0.00019, 0.00019, 0.00017,
-            0.00015, 0.00014, 0.00016, 0.00021, 0.00028, 0.00036, 0.00041, 0.00045, 0.00044, 0.00046,
-            0.00045, 0.00045, 0.00045, 0.00045, 0.00046, 0.00047, 0.00048, 0.00050, 0.00052, 0.00056,
-            0.00060, 0.00064, 0.00069, 0.00076, 0.00083, 0.00091, 0.00100, 0.00108, 0.00117, 0.00126,
-            0.00136, 0.00146, 0.00155, 0.00163, 0.00170, 0.00178, 0.00188, 0.00199, 0.00210, 0.00223,
-            0.00237, 0.00255, 0.00276, 0.00301, 0.00330, 0.00363, 0.00400, 0.00439, 0.00479, 0.00523,
-            0.00571, 0.00625, 0.00687, 0.00757, 0.00836, 0.00925, 0.01019, 0.01117, 0.01216, 0.01320,
-            0.01437, 0.01568, 0.01702, 0.01838, 0.01983, 0.02161, 0.02368, 0.02580, 0.02791, 0.03021,
-            0.03286, 0.03618, 0.04047, 0.04593, 0.05245, 0.05979, 0.06774, 0.07619, 0.08511, 0.09457,
-            0.10468, 0.11555, 0.12730, 0.14003, 0.15382, 0.16763, 0.18121, 0.19430, 0.20662, 0.21791,
-            0.22982, 0.24237, 0.25563, 0.26962, 0.28437, 0.29994, 0.31637, 0.33370, 0.35200, 0.37131,
-            0.39168, 0.41319, 0.43587, 0.45982, 0.48508, 0.51176, 0.53990, 0.56473, 0.59023, 0.61690,
-        ),
-        1990 : (
-            0.00815, 0.00067, 0.00040, 0.00027, 0.00025, 0.00020, 0.00017, 0.00016, 0.00014, 0.00013,
-            0.00012, 0.00011, 0.00014, 0.00017, 0.00023, 0.00029, 0.00035, 0.00039, 0.00041, 0.00041,
-            0.00041, 0.00041, 0.00041, 0.00041, 0.00042, 0.00043, 0.00044, 0.00046, 0.00048, 0.00052,
-            0.00055, 0.00059, 0.00064, 0.00070, 0.00077, 0.00085, 0.00092, 0.00100, 0.00108, 0.00116,
-            0.00125, 0.00135, 0.00143, 0.00150, 0.00157, 0.00165, 0.00174, 0.00184, 0.00194, 0.00206,
-            0.00220, 0.00236, 0.00255, 0.00278, 0.00306, 0.00337, 0.00371, 0.00407, 0.00445, 0.00485,
-            0.00529, 0.00579, 0.00636, 0.00704, 0.00779, 0.00864, 0.00954, 0.01047, 0.01141, 0.01239,
-            0.01349, 0.01471, 0.01597, 0.01725, 0.01860, 0.02028, 0.02223, 0.02421, 0.02615, 0.02826,
-            0.03068, 0.03377, 0.03783, 0.04308, 0.04939, 0.05649, 0.06415, 0.07225, 0.08075, 0.08974,
-            0.09933, 0.10965, 0.12081, 0.13293, 0.14611, 0.15930, 0.17227, 0.18478, 0.19656, 0.20734,
-            0.21871, 0.23072, 0.24339, 0.25676, 0.27087, 0.28577, 0.30148, 0.31807, 0.33557, 0.35406,
-            0.37355, 0.39414, 0.41587, 0.43881, 0.46301, 0.48858, 0.51555, 0.53965, 0.56411, 0.58969,
-        ),
-        2000 : (
-            0.00623, 0.00046, 0.00028, 0.00020, 0.00015, 0.00014, 0.00013, 0.00012, 0.00012, 0.00011,
-            0.00010, 0.00010, 0.00012, 0.00015, 0.00021, 0.00027, 0.00032, 0.00036, 0.00038, 0.00038,
-            0.00037, 0.00038, 0.00038, 0.00038, 0.00039, 0.00040, 0.00041, 0.00042, 0.00045, 0.00048,
-            0.00051, 0.00055, 0.00059, 0.00065, 0.00071, 0.00078, 0.00085, 0.00093, 0.00100, 0.00108,
-            0.00116, 0.00125, 0.00132, 0.00139, 0.00146, 0.00153, 0.00162, 0.00171, 0.00181, 0.00191,
-            0.00204, 0.00219, 0.00237, 0.00259, 0.00284, 0.00313, 0.00345, 0.00379, 0.00414, 0.00451,
-            0.00491, 0.00537, 0.00592, 0.00656, 0.00729, 0.00810, 0.00897, 0.00985, 0.01074, 0.01166,
-            0.01270, 0.01385, 0.01503, 0.01623, 0.01751, 0.01910, 0.02094, 0.02280, 0.02460, 0.02654,
-            0.02877, 0.03165, 0.03551, 0.04057, 0.04667, 0.05353, 0.06091, 0.06867, 0.07679, 0.08535,
-            0.09447, 0.10429, 0.11492, 0.12649, 0.13909, 0.15172, 0.16414, 0.17611, 0.18738, 0.19771,
-            0.20859, 0.22008, 0.23222, 0.24503, 0.25854, 0.27282, 0.28788, 0.30378, 0.32057, 0.33828,
-            0.35700, 0.37674, 0.39760, 0.41960, 0.44283, 0.46736, 0.49327, 0.51656, 0.54008, 0.56469,
-        ),
-        2010 : (
-            0.00495, 0.00035, 0.00022, 0.00016, 0.00012, 0.00011, 0.00011, 0.00010, 0.00010, 0.00009,
-            0.00008, 0.00008, 0.00010, 0.00014, 0.00019, 0.00024, 0.00029, 0.00033, 0.00035, 0.00035,
-            0.00035, 0.00035, 0.00035, 0.00035, 0.00036, 0.00037, 0.00038, 0.00039, 0.00041, 0.00044,
-            0.00047, 0.00051, 0.00055, 0.00060, 0.00066, 0.00073, 0.00079, 0.00086, 0.00093, 0.00100,
-            0.00108, 0.00116, 0.00123, 0.00129, 0.00135, 0.00142, 0.00150, 0.00159, 0.00168, 0.00178,
-            0.00190, 0.00204, 0.00221, 0.00241, 0.00265, 0.00292, 0.00322, 0.00354, 0.00386, 0.00420,
-            0.00457, 0.00500, 0.00551, 0.00613, 0.00683, 0.00762, 0.00845, 0.00930, 0.01014, 0.01101,
-            0.01199, 0.01308, 0.01419, 0.01533, 0.01653, 0.01804, 0.01979, 0.02154, 0.02321, 0.02502,
-            0.02709, 0.02979, 0.03347, 0.03833, 0.04423, 0.05085, 0.05796, 0.06541, 0.07317, 0.08135,
-            0.09005, 0.09940, 0.10956, 0.12062, 0.13270, 0.14480, 0.15671, 0.16819, 0.17901, 0.18890,
-            0.19934, 0.21037, 0.22202, 0.23430, 0.24727, 0.26097, 0.27544, 0.29071, 0.30683, 0.32385,
-            0.34182, 0.36080, 0.38082, 0.40198, 0.42433, 0.44791, 0.47283, 0.49531, 0.51795, 0.54163,
-        ),
-        2020 : (
-            0.00411, 0.00029, 0.00019, 0.00014, 0.00010, 0.00010, 0.00009, 0.00009, 0.00009, 0.00008,
-            0.00007, 0.00007, 0.00008, 0.00012, 0.00017, 0.00022, 0.00027, 0.00031, 0.00032, 0.00032,
-            0.00032, 0.00032, 0.00032, 0.00033, 0.00033, 0.00034, 0.00035, 0.00036, 0.00038, 0.00041,
-            0.00044, 0.00047, 0.00051, 0.00056, 0.00061, 0.00067, 0.00073, 0.00080, 0.00086, 0.00093,
-            0.00100, 0.00107, 0.00114, 0.00120, 0.00126, 0.00132, 0.00140, 0.00148, 0.00157, 0.00166,
-            0.00177, 0.00190, 0.00206, 0.00225, 0.00247, 0.00273, 0.00302, 0.00331, 0.00361, 0.00393,
-            0.00427, 0.00467, 0.00515, 0.00574, 0.00642, 0.00718, 0.00798, 0.00879, 0.00960, 0.01042,
-            0.01135, 0.01238, 0.01344, 0.01451, 0.01565, 0.01709, 0.01875, 0.02040, 0.02197, 0.02366,
-            0.02559, 0.02814, 0.03165, 0.03633, 0.04202, 0.04842, 0.05527, 0.06243, 0.06987, 0.07769,
-            0.08600, 0.09495, 0.10466, 0.11526, 0.12685, 0.13848, 0.14992, 0.16095, 0.17133, 0.18084,
-            0.19087, 0.20147, 0.21265, 0.22446, 0.23694, 0.25011, 0.26402, 0.27871, 0.29421, 0.31059,
-            0.32788, 0.34615, 0.36543, 0.38580, 0.40731, 0.43002, 0.45401, 0.47568, 0.49749, 0.52031,
-        ),
-        2030 : (
-            0.00345, 0.00026, 0.00016, 0.00012, 0.00009, 0.00008, 0.00008, 0.00008, 0.00007, 0.00007,
-            0.00006, 0.00006, 0.00007, 0.00011, 0.00015, 0.00020, 0.00025, 0.00029, 0.00030, 0.00030,
-            0.00030, 0.00030, 0.00030, 0.00030, 0.00031, 0.00032, 0.00033, 0.00034, 0.00036, 0.00038,
-            0.00041, 0.00044, 0.00047, 0.00052, 0.00057, 0.00063, 0.00068, 0.00074, 0.00080, 0.00086,
-            0.00093, 0.00100, 0.00106, 0.00112, 0.00117, 0.00124, 0.00131, 0.00138, 0.00146, 0.00155,
-            0.00166, 0.00178, 0.00193, 0.00211, 0.00232, 0.00256, 0.00283, 0.00311, 0.00339, 0.00368,
-            0.00400, 0.00437, 0.00483, 0.00540, 0.00605, 0.00679, 0.00756, 0.00834, 0.00911, 0.00989,
-            0.01077, 0.01174, 0.01275, 0.01377, 0.01486, 0.01622, 0.01781, 0.01938, 0.02085, 0.02244,
-            0.02425, 0.02666, 0.03002, 0.03453, 0.04003, 0.04621, 0.05281, 0.05970, 0.06684, 0.07434,
-            0.08230, 0.09087, 0.10018, 0.11035, 0.12150, 0.13268, 0.14368, 0.15430, 0.16429, 0.17343,
-            0.18309, 0.19329, 0.20405, 0.21543, 0.22744, 0.24012, 0.25352, 0.26766, 0.28261, 0.29838,
-            0.31505, 0.33265, 0.35124, 0.37088, 0.39162, 0.41352, 0.43666, 0.45750, 0.47854, 0.50055,
-        ),
-        2040 : (
-            0.00290, 0.00022, 0.00014, 0.00011, 0.00008, 0.00007, 0.00007, 0.00007, 0.00006, 0.00006,
-            0.00005, 0.00005, 0.00006, 0.00009, 0.00014, 0.00019, 0.00023, 0.00027, 0.00028, 0.00028,
-            0.00028, 0.00028, 0.00028, 0.00028, 0.00029, 0.00029, 0.00030, 0.00031, 0.00033, 0.00035,
-            0.00038, 0.00041, 0.00044, 0.00048, 0.00053, 0.00058, 0.00064, 0.00069, 0.00075, 0.00081,
-            0.00087, 0.00093, 0.00099, 0.00105, 0.00110, 0.00116, 0.00122, 0.00129, 0.00137, 0.00146,
-            0.00155, 0.00167, 0.00181, 0.00198, 0.00218, 0.00241, 0.00266, 0.00292, 0.00318, 0.00345,
-            0.00375, 0.00410, 0.00453, 0.00508, 0.00572, 0.00643, 0.00717, 0.00792, 0.00866, 0.00940,
-            0.01024, 0.01117, 0.01212, 0.01309, 0.01413, 0.01544, 0.01696, 0.01844, 0.01984, 0.02133,
-            0.02304, 0.02533, 0.02854, 0.03290, 0.03821, 0.04419, 0.05056, 0.05719, 0.06406, 0.07126,
-            0.07890, 0.08712, 0.09606, 0.10585, 0.11658, 0.12735, 0.13795, 0.14818, 0.15781, 0.16662,
-            0.17592, 0.18575, 0.19613, 0.20710, 0.21868, 0.23091, 0.24383, 0.25748, 0.27189, 0.28712,
-            0.30320, 0.32019, 0.33814, 0.35710, 0.37712, 0.39827, 0.42062, 0.44059, 0.46093, 0.48220,
-        ),
-        2050 : (
-            0.00244, 0.00020, 0.00013, 0.00009, 0.00007, 0.00006, 0.00006, 0.00006, 0.00006, 0.00005,
-            0.00004, 0.00004, 0.00005, 0.00008, 0.00013, 0.00017, 0.00022, 0.00025, 0.00026, 0.00026,
-            0.00026, 0.00026, 0.00026, 0.00026, 0.00027, 0.00027, 0.00028, 0.00029, 0.00031, 0.00033,
-            0.00035, 0.00038, 0.00041, 0.00045, 0.00050, 0.00054, 0.00059, 0.00064, 0.00070, 0.00075,
-            0.00081, 0.00087, 0.00093, 0.00098, 0.00103, 0.00108, 0.00115, 0.00121, 0.00129, 0.00137,
-            0.00146, 0.00157, 0.00170, 0.00186, 0.00205, 0.00227, 0.00251, 0.00275, 0.00300, 0.00325,
-            0.00352, 0.00385, 0.00426, 0.00479, 0.00541, 0.00610, 0.00682, 0.00754, 0.00824, 0.00895,
-            0.00975, 0.01063, 0.01155, 0.01248, 0.01346, 0.01472, 0.01617, 0.01759, 0.01891, 0.02033,
-            0.02194, 0.02412, 0.02721, 0.03141, 0.03655, 0.04233, 0.04849, 0.05489, 0.06150, 0.06842,
-            0.07577, 0.08367, 0.09227, 0.10170, 0.11205, 0.12244, 0.13267, 0.14253, 0.15182, 0.16032,
-            0.16931, 0.17879, 0.18881, 0.19940, 0.21058, 0.22239, 0.23487, 0.24806, 0.26198, 0.27668,
-            0.29223, 0.30864, 0.32600, 0.34432, 0.36367, 0.38413, 0.40574, 0.42488, 0.44453, 0.46510,
-        ),
-        2060 : (
-            0.00206, 0.00017, 0.00011, 0.00008, 0.00006, 0.00006, 0.00006, 0.00005, 0.00005, 0.00004,
-            0.00004, 0.00003, 0.00005, 0.00007, 0.00011, 0.00016, 0.00020, 0.00023, 0.00024, 0.00024,
-            0.00024, 0.00024, 0.00024, 0.00024, 0.00025, 0.00025, 0.00026, 0.00027, 0.00029, 0.00031,
-            0.00033, 0.00035, 0.00039, 0.00042, 0.00046, 0.00051, 0.00055, 0.00060, 0.00065, 0.00070,
-            0.00076, 0.00082, 0.00087, 0.00092, 0.00096, 0.00101, 0.00108, 0.00114, 0.00121, 0.00128,
-            0.00137, 0.00147, 0.00160, 0.00175, 0.00193, 0.00214, 0.00237, 0.00260, 0.00282, 0.00306,
-            0.00331, 0.00362, 0.00402, 0.00452, 0.00512, 0.00579, 0.00649, 0.00719, 0.00786, 0.00854,
-            0.00930, 0.01014, 0.01101, 0.01190, 0.01285, 0.01405, 0.01545, 0.01680, 0.01806, 0.01940,
-            0.02094, 0.02302, 0.02599, 0.03005, 0.03503, 0.04062, 0.04658, 0.05276, 0.05914, 0.06580,
-            0.07287, 0.08049, 0.08878, 0.09786, 0.10787, 0.11790, 0.12778, 0.13731, 0.14629, 0.15450,
-            0.16318, 0.17235, 0.18204, 0.19227, 0.20307, 0.21450, 0.22657, 0.23931, 0.25277, 0.26701,
-            0.28204, 0.29793, 0.31470, 0.33244, 0.35117, 0.37097, 0.39190, 0.41020, 0.42922, 0.44914,
-        ),
-        2070 : (
-            0.00173, 0.00015, 0.00010, 0.00007, 0.00005, 0.00005, 0.00005, 0.00005, 0.00004, 0.00004,
-            0.00003, 0.00003, 0.00004, 0.00007, 0.00010, 0.00015, 0.00018, 0.00021, 0.00022, 0.00022,
-            0.00022, 0.00022, 0.00022, 0.00023, 0.00023, 0.00024, 0.00024, 0.00025, 0.00027, 0.00029,
-            0.00031, 0.00033, 0.00036, 0.00039, 0.00043, 0.00047, 0.00052, 0.00056, 0.00061, 0.00066,
-            0.00071, 0.00076, 0.00081, 0.00086, 0.00090, 0.00095, 0.00101, 0.00107, 0.00113, 0.00121,
-            0.00129, 0.00139, 0.00151, 0.00165, 0.00182, 0.00202, 0.00224, 0.00246, 0.00267, 0.00289,
-            0.00312, 0.00341, 0.00379, 0.00428, 0.00486, 0.00551, 0.00619, 0.00686, 0.00751, 0.00816,
-            0.00888, 0.00969, 0.01052, 0.01138, 0.01228, 0.01344, 0.01478, 0.01608, 0.01728, 0.01856,
-            0.02002, 0.02201, 0.02486, 0.02879, 0.03362, 0.03904, 0.04481, 0.05079, 0.05695, 0.06338,
-            0.07020, 0.07754, 0.08554, 0.09432, 0.10398, 0.11369, 0.12325, 0.13246, 0.14115, 0.14910,
-            0.15749, 0.16636, 0.17573, 0.18564, 0.19609, 0.20715, 0.21883, 0.23118, 0.24422, 0.25800,
-            0.27255, 0.28794, 0.30420, 0.32138, 0.33953, 0.35871, 0.37886, 0.39647, 0.41490, 0.43420,
-        ),
-        2080 : (
-            0.00146, 0.00013, 0.00009, 0.00006, 0.00005, 0.00004, 0.00004, 0.00004, 0.00004, 0.00003,
-            0.00003, 0.00002, 0.00003, 0.00006, 0.00010, 0.00014, 0.00017, 0.00020, 0.00021, 0.00021,
-            0.00021, 0.00021, 0.00021, 0.00021, 0.00022, 0.00022, 0.00023, 0.00024, 0.00025, 0.00027,
-            0.00029, 0.00031, 0.00034, 0.00037, 0.00040, 0.00044, 0.00048, 0.00053, 0.00057, 0.00062,
-            0.00067, 0.00072, 0.00076, 0.00081, 0.00085, 0.00089, 0.00095, 0.00101, 0.00107, 0.00114,
-            0.00122, 0.00131, 0.00142, 0.00156, 0.00172, 0.00191, 0.00212, 0.00232, 0.00252, 0.00273,
-            0.00295, 0.00322, 0.00358, 0.00405, 0.00462, 0.00525, 0.00591, 0.00656, 0.00718, 0.00780,
-            0.00849, 0.00927, 0.01007, 0.01088, 0.01176, 0.01287, 0.01416, 0.01540, 0.01655, 0.01777,
-            0.01916, 0.02107, 0.02383, 0.02763, 0.03231, 0.03757, 0.04317, 0.04896, 0.05491, 0.06113,
-            0.06771, 0.07480, 0.08253, 0.09102, 0.10038, 0.10977, 0.11903, 0.12796, 0.13637, 0.14407,
-            0.15219, 0.16078, 0.16987, 0.17946, 0.18959, 0.20030, 0.21162, 0.22359, 0.23622, 0.24959,
-            0.26370, 0.27862, 0.29438, 0.31104, 0.32865, 0.34725, 0.36651, 0.38359, 0.40147, 0.42017,
-        ),
-        2090 : (
-            0.00124, 0.00012, 0.00008, 0.00006, 0.00004, 0.00004, 0.00004, 0.00004, 0.00003, 0.00003,
-            0.00002, 0.00002, 0.00003, 0.00005, 0.00009, 0.00013, 0.00016, 0.00018, 0.00019, 0.00019,
-            0.00019, 0.00019, 0.00019, 0.00020, 0.00020, 0.00021, 0.00021, 0.00022, 0.00023, 0.00025,
-            0.00027, 0.00029, 0.00031, 0.00034, 0.00038, 0.00042, 0.00045, 0.00049, 0.00053, 0.00058,
-            0.00062, 0.00067, 0.00072, 0.00076, 0.00080, 0.00084, 0.00089, 0.00095, 0.00101, 0.00107,
-            0.00115, 0.00123, 0.00134, 0.00147, 0.00162, 0.00180, 0.00200, 0.00220, 0.00239, 0.00258,
-            0.00278, 0.00304, 0.00338, 0.00384, 0.00439, 0.00501, 0.00564, 0.00627, 0.00687, 0.00747,
-            0.00813, 0.00887, 0.00964, 0.01043, 0.01126, 0.01234, 0.01358, 0.01478, 0.01588, 0.01704,
-            0.01837, 0.02020, 0.02286, 0.02655, 0.03110, 0.03621, 0.04164, 0.04725, 0.05302, 0.05903,
-            0.06539, 0.07225, 0.07973, 0.08795, 0.09702, 0.10612, 0.11510, 0.12376, 0.13191, 0.13937,
-            0.14725, 0.15558, 0.16438, 0.17369, 0.18352, 0.19390, 0.20488, 0.21649, 0.22875, 0.24171,
-            0.25540, 0.26989, 0.28608, 0.30325, 0.32144, 0.34073, 0.36062, 0.37866, 0.39759, 0.41747,
-        ),
-        2100 : (
-            0.00105, 0.00010, 0.00007, 0.00005, 0.00004, 0.00004, 0.00004, 0.00003, 0.00003, 0.00002,
-            0.00002, 0.00002, 0.00003, 0.00005, 0.00008, 0.00012, 0.00015, 0.00017, 0.00018, 0.00018,
-            0.00018, 0.00018, 0.00018, 0.00018, 0.00019, 0.00019, 0.00020, 0.00021, 0.00022, 0.00023,
-            0.00025, 0.00027, 0.00029, 0.00032, 0.00035, 0.00039, 0.00042, 0.00046, 0.00050, 0.00054,
-            0.00059, 0.00063, 0.00067, 0.00071, 0.00075, 0.00079, 0.00084, 0.00089, 0.00095, 0.00101,
-            0.00108, 0.00117, 0.00127, 0.00139, 0.00154, 0.00171, 0.00190, 0.00209, 0.00226, 0.00244,
-            0.00263, 0.00287, 0.00320, 0.00365, 0.00418, 0.00478, 0.00540, 0.00601, 0.00659, 0.00716,
-            0.00779, 0.00850, 0.00924, 0.01000, 0.01080, 0.01184, 0.01304, 0.01419, 0.01524, 0.01636,
-            0.01763, 0.01939, 0.02197, 0.02555, 0.02997, 0.03494, 0.04021, 0.04566, 0.05125, 0.05707,
-            0.06323, 0.06987, 0.07711, 0.08508, 0.09388, 0.10271, 0.11142, 0.11982, 0.12773, 0.13497,
-            0.14262, 0.15070, 0.15975, 0.16933, 0.17949, 0.19026, 0.20168, 0.21378, 0.22660, 0.24020,
-            0.25461, 0.26989, 0.28608, 0.30325, 0.32144, 0.34073, 0.36062, 0.37866, 0.39759, 0.41747,
-        ),
-    },
-}
-
-# Social Security Administration period table, 2010.
-ssa2010_q = {
-    'male': (
-        0.006680, 0.000436, 0.000304, 0.000232, 0.000172, 0.000155, 0.000143, 0.000131, 0.000115, 0.000096,
-        0.000082, 0.000086, 0.000125, 0.000205, 0.000319, 0.000441, 0.000562, 0.000690, 0.000820, 0.000949,
-        0.001085, 0.001213, 0.001304, 0.001345, 0.001350, 0.001342, 0.001340, 0.001342, 0.001356, 0.001380,
-        0.001408, 0.001435, 0.001466, 0.001499, 0.001539, 0.001592, 0.001660, 0.001741, 0.001837, 0.001953,
-        0.002084, 0.002241, 0.002439, 0.002686, 0.002975, 0.003297, 0.003639, 0.003997, 0.004366, 0.004750,
-        0.005156, 0.005596, 0.006078, 0.006605, 0.007174, 0.007805, 0.008464, 0.009095, 0.009676, 0.010245,
-        0.010865, 0.011592, 0.012444, 0.013451, 0.014608, 0.015927, 0.017370, 0.018895, 0.020484, 0.022191,
-        0.024139, 0.026364, 0.028808, 0.031480, 0.034442, 0.037855, 0.041725, 0.045932, 0.050469, 0.055465,
-        0.061179, 0.067698, 0.074923, 0.082891, 0.091725, 0.101575, 0.112568, 0.124795, 0.138305, 0.153107,
-        0.169195, 0.186543, 0.205115, 0.224867, 0.245744, 0.266454, 0.286625, 0.305869, 0.323783, 0.339972,
-        0.356971, 0.374819, 0.393560, 0.413238, 0.433900, 0.455595, 0.478375, 0.502293, 0.527408, 0.553778,
-        0.581467, 0.610541, 0.641068, 0.673121, 0.706777, 0.742116, 0.779222, 0.818183, 0.859092, 0.902047,
-    ),
-    'female': (
-        0.005562, 0.000396, 0.000214, 0.000162, 0.000132, 0.000117, 0.000106, 0.000099, 0.000093, 0.000090,
-        0.000090, 0.000096, 0.000111, 0.000137, 0.000170, 0.000207, 0.000245, 0.000282, 0.000318, 0.000352,
-        0.000388, 0.000423, 0.000454, 0.000476, 0.000494, 0.000511, 0.000531, 0.000553, 0.000579, 0.000608,
-        0.000641, 0.000677, 0.000719, 0.000765, 0.000818, 0.000879, 0.000948, 0.001022, 0.001100, 0.001185,
-        0.001279, 0.001387, 0.001518, 0.001676, 0.001858, 0.002055, 0.002262, 0.002480, 0.002709, 0.002947,
-        0.003209, 0.003484, 0.003751, 0.004000, 0.004246, 0.004520, 0.004836, 0.005185, 0.005570, 0.006001,
-        0.006489, 0.007046, 0.007686, 0.008419, 0.009249, 0.010201, 0.011255, 0.012372, 0.013538, 0.014793,
-        0.016233, 0.017882, 0.019693, 0.021671, 0.023866, 0.026437, 0.029368, 0.032519, 0.035870, 0.039555,
-        0.043828, 0.048808, 0.054434, 0.060762, 0.067889, 0.075926, 0.084968, 0.095093, 0.106352, 0.118777,
-        0.132384, 0.147181, 0.163161, 0.180314, 0.198615, 0.217125, 0.235558, 0.253602, 0.270923, 0.287178,
-        0.304409, 0.322673, 0.342033, 0.362555, 0.384309, 0.407367, 0.431809, 0.457718, 0.485181, 0.514292,
-        0.545149, 0.577858, 0.612530, 0.649282, 0.688238, 0.729533, 0.773305, 0.818183, 0.859092, 0.902047,
-    ),
-}
-
 class UnableToAdjust(Exception):
     pass
 
+# Dense q grids by integer age shared across LifeTable objects, keyed by table, sex, AER, calendar year, and contract year bucket.
+_q_grids = {}
+_q_grid_arrays = {} # The same grids as NumPy arrays with a q of 1 appended.
+
 @cython.cclass
 class LifeTable:
 
@@ -806,7 +167,7 @@ class LifeTable:
 
         self._age_add = y
 
-    _age_add_cache = {}
+    _age_add_cache = LRUCache('life_table_age_add')
 
     def __init__(self, table, sex, age = None, *, death_age = float('inf'), ae = 'aer2005_13-grouped',
                  le_set = None, le_add = 0, date_str = None, age_add = 0, interpolate_q = True, alpha = 0, m = 82.3, b = 11.4):
@@ -910,8 +271,8 @@ class LifeTable:
         self.m = m
         self.b = b
 
-        self.table_ssa_cohort = ssa_as120_q[self.sex] if self.table == 'ssa-cohort' else None
-        self.table_iam2012_basic = iam2012_basic_1000_q[self.sex] if self.table == 'iam2012-basic' else None
+        self.table_ssa_cohort = _mortality_tuple('ssa_as120_q', self.sex) if self.table == 'ssa-cohort' else None
+        self.table_iam2012_basic = _mortality_tuple('iam2012_basic_1000_q', self.sex) if self.table == 'iam2012-basic' else None
         self.gompertz_makeham = self.table == 'gompertz-makeham'
         self.fixed = self.table == 'fixed'
         self.aer_years = aer2005_13_years if self.ae.startswith('aer2015_13') else aer2014_years
@@ -930,7 +291,10 @@ class LifeTable:
             self.table_ae_full = aer2014_actual_expected[self.sex]
         else:
             assert False
-        self.projection_scale = projection_scale_g2[self.sex]
+        self.projection_scale = _mortality_tuple('projection_scale_g2', self.sex) if self.table == 'iam2012-basic' else None
+        self._q_grid_key = (self.table, self.sex, self.ae if self.table_iam2012_basic is not None else None)
+        self._q_grid_period = tuple(min(q, 1) for q in _mortality_tuple('ssa2010_q', self.sex)) if self.table == 'ssa-period' else None
+        self._q_array_cohort = None
 
         if le_set is None and le_add == 0:
             return
@@ -947,87 +311,185 @@ class LifeTable:
 
         except KeyError:
 
-            yield_curve = YieldCurve('le', date_str)
-            income_annuity: IncomeAnnuity
+            # Solve for the age_add that produces the requested life expectancy, computing life expectancies directly from survival curves.
+            start = self._decimal_year(get_yield_curve('le', date_str).date)
             if le_set is None:
-                income_annuity = make_income_annuity(yield_curve, self, frequency = 1)
-                le_set = income_annuity.premium(1)
+                le_key = (table, sex, age, death_age, ae, date_str, interpolate_q, alpha, m, b)
+                try:
+                    le_set = LifeTable._le_cache[le_key]
+                except KeyError:
+                    le_set = self._life_expectancy(0, start)
+                    LifeTable._le_cache[le_key] = le_set
             le = le_set + le_add
-            if le > 0:
-                age_add_lo = age_add_lo_start = -50
-                age_add_hi = age_add_hi_start = 50
-                for _ in range(50):
-                    self._age_add = (age_add_lo + age_add_hi) / 2
-                    self._age_add = max(self._age_add, - self.age)
-                    if not self.interpolate_q:
-                        self._age_add = math.floor(self._age_add)
-                    income_annuity = make_income_annuity(yield_curve, self, frequency = 1)
-                    compute_le = income_annuity.premium(1)
-                    if self.interpolate_q:
-                        done = abs(le / compute_le - 1) < 1e-4
-                    else:
-                        done = age_add_hi - age_add_lo <= 1 and age_add_lo != age_add_lo_start and age_add_hi != age_add_hi_start
-                    if done:
-                        if len(LifeTable._age_add_cache) < 1000:
-                            LifeTable._age_add_cache[key] = self._age_add
-                        return
-                    if compute_le >= le:
-                        age_add_lo = self._age_add
-                    else:
-                        age_add_hi = self._age_add
+            if le <= 0:
+                raise UnableToAdjust('Unable to adjust life expectancy.')
+            self._age_add = self._solve_age_add(le, start)
+            LifeTable._age_add_cache[key] = self._age_add
+
+    _le_cache = LRUCache('life_table_le')
+    _q_grid_stacks = LRUCache('life_table_q_grid_stacks', capacity = 32)
+
+    def _decimal_year(self, date_str):
+        # Calendar year as a decimal, computed in the same way as for an IncomeAnnuity.
+        start_year, m, d = date_str.split('-')
+        start_year = int(start_year)
+        start_month = int(m) - 1 + (float(d) - 1) / monthrange(start_year, int(m))[1]
+        return start_year + start_month / 12
+
+    def _solve_age_add(self, le, start):
+        # Return the age_add giving a life expectancy of le, or the largest whole age_add giving a life expectancy of at least le if not
+        # interpolating q values.
+        # Life expectancy declines as age_add increases. Work outwards from an age_add of zero to bracket the solution, then solve it.
+        age_add_min = max(-50, - self.age)
+        age_add_max = 50
+        if not self.interpolate_q:
+            age_add_min = math.floor(age_add_min)
+        age_add_lo = age_add_hi = 0
+        le_lo = le_hi = self._life_expectancy(0, start)
+        step = math.ceil(2 * abs(le_lo - le)) + 1
+        if le_lo >= le:
+            while le_hi >= le:
+                if age_add_hi == age_add_max:
+                    raise UnableToAdjust('Unable to adjust life expectancy.')
+                age_add_lo, le_lo = age_add_hi, le_hi
+                age_add_hi = min(age_add_hi + step, age_add_max)
+                le_hi = self._life_expectancy(age_add_hi, start)
+                step *= 2
+        else:
+            while le_lo < le:
+                if age_add_lo == age_add_min:
+                    raise UnableToAdjust('Unable to adjust life expectancy.')
+                age_add_hi, le_hi = age_add_lo, le_lo
+                age_add_lo = max(age_add_lo - step, age_add_min)
+                le_lo = self._life_expectancy(age_add_lo, start)
+                step *= 2
+        if self.interpolate_q:
+            # Illinois variant of the secant method, which keeps the solution bracketed. Converges in a handful of evaluations.
+            err_lo = le_lo - le
+            err_hi = le_hi - le
+            retained = 0
+            for _ in range(100):
+                age_add = age_add_hi - err_hi * (age_add_hi - age_add_lo) / (err_hi - err_lo)
+                err = self._life_expectancy(age_add, start) - le
+                if abs(err) < 1e-8 * le or age_add_hi - age_add_lo < 1e-9:
+                    return age_add
+                if err >= 0:
+                    age_add_lo, err_lo = age_add, err
+                    if retained == 1:
+                        err_hi /= 2
+                    retained = 1
+                else:
+                    age_add_hi, err_hi = age_add, err
+                    if retained == -1:
+                        err_lo /= 2
+                    retained = -1
             raise UnableToAdjust('Unable to adjust life expectancy.')
+        else:
+            while age_add_hi - age_add_lo > 1:
+                age_add = (age_add_lo + age_add_hi) // 2
+                if self._life_expectancy(age_add, start) >= le:
+                    age_add_lo = age_add
+                else:
+                    age_add_hi = age_add
+            return age_add_lo
+
+    def _life_expectancy(self, age_add, start):
+        # Return the remaining life expectancy at self.age, having set age_add.
+        # Matches the premium of an annual payout IncomeAnnuity priced using the 'le' yield curve, with half credit for the year of death.
+        self._age_add = age_add
+        years = 128
+        while True:
+            y = np.arange(years)
+            q = self.q_array(self.age + y, years = start + y, contract_ages = y)
+            dead = np.flatnonzero(q == 1)
+            if len(dead) > 0:
+                break
+            years *= 2
+        alive = np.cumprod(1 - q[:dead[0]])
+        return float(np.cumsum(np.concatenate(((0.5, ), alive)))[-1])  # Sequential summation. Python float so np.float64 doesn't leak into age_add.
+
+    @cython.locals(age = cython.int)
+    def _ae(self, age, c):
+        # Return the AER actual/expected ratio for contract year bucket c.
+        if self.table_ae is not None:
+            if age < 70:
+                aa = 0
+            elif age < 80:
+                aa = 70
+            else:
+                aa = 80
+            ae = self.table_ae[aa][c]
+        elif self.table_ae_summary is not None:
+            ae = self.table_ae_summary[c]
+        elif self.table_ae_full is not None:
+            age_5: cython.int
+            age_5 = int(age / 5)
+            age_5 *= 5
+            ae = None
+            for a in range(age_5, 121, 5):
+                ae = self.table_ae_full.get(a, (None, ) * 4)[c]
+                if ae is not None:
+                    break
+            if ae is None:
+                for a in range(age_5, -1, -5):
+                    ae = self.table_ae_full.get(a, (None, ) * 4)[c]
+                    if ae is not None:
+                        break
+            assert ae is not None
+        else:
+            ae = 1
+        return ae
+
+    @cython.locals(contract_age = cython.double)
+    def _aer_index(self, contract_age):
+        # Return the AER contract year bucket.
+        if (self.table_ae is not None) or (self.table_ae_summary is not None) or (self.table_ae_full is not None):
+            return bisect_right(self.aer_years, contract_age + 1) - 1  # AER starts at year 1.
+        else:
+            return 0
+
+    @cython.locals(year = cython.double, age = cython.int)
+    def _q_iam2012_basic(self, year, age, c):
+        q: cython.double; g2: cython.double
+        try:
+            q = self.table_iam2012_basic[age]
+            q /= 1000.0
+            g2 = self.projection_scale[age]
+        except IndexError:
+            q = 1
+        else:
+            q *= (1 - g2) ** (year - iam2012_date) * self._ae(age, c)
+        return min(q, 1)
+
+    @cython.locals(year = cython.double, contract_age = cython.double)
+    def _q_grid(self, year, contract_age):
+        # Return the tuple of q values by non-negative integer age for a table other than ssa-cohort or fixed.
+        # Ages beyond the end of the tuple have a q of 1.
+        if self._q_grid_period is not None:
+            return self._q_grid_period
+        year_int = int(year)
+        c = self._aer_index(contract_age)
+        key = (self._q_grid_key, year_int, c)
+        try:
+            return _q_grids[key]
+        except KeyError:
+            grid = tuple([self._q_iam2012_basic(year_int, age, c) for age in range(min(len(self.table_iam2012_basic), len(self.projection_scale)))])
+            _q_grids[key] = grid
+            return grid
+
+    def _q_grid_array(self, year, contract_age):
+        key = (self._q_grid_key, int(year), self._aer_index(contract_age))
+        try:
+            return _q_grid_arrays[key]
+        except KeyError:
+            grid = np.array(self._q_grid(year, contract_age) + (1, ))
+            _q_grid_arrays[key] = grid
+            return grid
 
     @cython.locals(year = cython.double, age = cython.int, contract_age = cython.double)
     def _q_int(self, year, age, contract_age):
-        q: cython.double; g2: cython.double
-        if self.table_iam2012_basic is not None:
-            year = int(year)
-            try:
-                q = self.table_iam2012_basic[age]
-                q /= 1000.0
-                g2 = self.projection_scale[age]
-            except IndexError:
-                q = 1
-            else:
-                contract_year: cython.double
-                contract_year = contract_age + 1  # AER starts at year 1.
-                if (self.table_ae is not None) or (self.table_ae_summary is not None) or (self.table_ae_full is not None):
-                    c: cython.int; cy: cython.double
-                    c = 0
-                    for cy in self.aer_years:
-                        if cy > contract_year:
-                            break
-                        c += 1
-                    c -= 1
-                    if self.table_ae is not None:
-                        if age < 70:
-                            aa = 0
-                        elif age < 80:
-                            aa = 70
-                        else:
-                            aa = 80
-                        ae = self.table_ae[aa][c]
-                    elif self.table_ae_summary is not None:
-                        ae = self.table_ae_summary[c]
-                    else:
-                        age_5: cython.int
-                        age_5 = int(age / 5)
-                        age_5 *= 5
-                        ae = None
-                        for a in range(age_5, 121, 5):
-                            ae = self.table_ae_full.get(a, (None, ) * 4)[c]
-                            if ae is not None:
-                                break
-                        if ae is None:
-                            for a in range(age_5, -1, -5):
-                                ae = self.table_ae_full.get(a, (None, ) * 4)[c]
-                                if ae is not None:
-                                    break
-                        assert ae is not None
-                else:
-                    ae = 1
-                q *= (1 - g2) ** (year - iam2012_date) * ae
-        elif self.table_ssa_cohort is not None:
+        q: cython.double
+        if self.table_ssa_cohort is not None:
             cohort: cython.double; cohort_int: cython.int
             cohort = year - age
             cohort -= 0.5  # Cohort is people born in a given year.
@@ -1046,9 +508,12 @@ class LifeTable:
                 q = 1
         elif self.fixed:
             q = 0
+        elif age < 0 and self.table_iam2012_basic is not None:
+            q = self._q_iam2012_basic(int(year), age, self._aer_index(contract_age))
         else:
+            grid = self._q_grid(year, contract_age)
             try:
-                q = ssa2010_q[self.sex][age]
+                q = grid[age]
             except IndexError:
                 q = 1
         return min(q, 1)
@@ -1077,14 +542,103 @@ class LifeTable:
         if self.interpolate_q:
             fract = age % 1
             age_int = int(age)
-            q_int = self._q_int(year, age_int, contract_age)
-            q = (1 - fract) * q_int
-            if fract != 0:
-                age_int += 1
-                q_int = self._q_int(year, age_int, contract_age)
-                q += fract * q_int
-            return q
         else:
             age += 0.5
+            fract = 0
             age_int = int(age)
-            return self._q_int(year, age_int, contract_age)
+        if self.table_ssa_cohort is not None or self.fixed or age_int < 0:
+            q = self._q_int(year, age_int, contract_age)
+            if fract != 0:
+                q = (1 - fract) * q + fract * self._q_int(year, age_int + 1, contract_age)
+        else:
+            # Index the precompiled grid.
+            grid = self._q_grid(year, contract_age)
+            try:
+                q = grid[age_int]
+            except IndexError:
+                q = 1
+            if fract != 0:
+                try:
+                    q_int = grid[age_int + 1]
+                except IndexError:
+                    q_int = 1
+                q = (1 - fract) * q + fract * q_int
+        return q
+
+    def q_array(self, ages, *, years = -1, contract_ages = -1):
+        '''Return a NumPy array of the probabilities of dying in the next
+        year at possibly fractional ages, 'ages'.
+
+        'years' and 'contract_ages' are as for q(), and may be arrays
+        or scalars. The results are identical to calling q() for each
+        age.
+
+        '''
+
+        ages, years, contract_ages = np.broadcast_arrays(np.asarray(ages, dtype = float), np.asarray(years, dtype = float),
+            np.asarray(contract_ages, dtype = float))
+        age = ages + self._age_add
+        if self.gompertz_makeham:
+            q = np.array([max(0, min(self.alpha + math.exp((a - self.m) / self.b) / self.b, 1)) for a in age.ravel().tolist()],
+                dtype = float).reshape(age.shape)
+                # Scalar math.exp so the results are identical to q().
+        else:
+            if self.interpolate_q:
+                fract = age % 1
+                age_int = age.astype(int)
+            else:
+                fract = np.zeros(age.shape)
+                age_int = (age + 0.5).astype(int)
+            q = self._q_ints(years, age_int, contract_ages)
+            interpolate = fract != 0
+            if interpolate.any():
+                q_int = self._q_ints(years[interpolate], age_int[interpolate] + 1, contract_ages[interpolate])
+                q[interpolate] = (1 - fract[interpolate]) * q[interpolate] + fract[interpolate] * q_int
+        q[ages >= self.death_age] = 1
+        return q
+
+    def _q_ints(self, years, age_int, contract_ages):
+        # Array version of _q_int().
+        if self.table_ssa_cohort is not None:
+            if self._q_array_cohort is None:
+                table = get_mortality_table('ssa_as120_q', self.sex)
+                self._q_array_cohort = np.hstack((table, np.ones((len(table), 1))))
+            cohort_years = get_mortality_table('ssa_as120_cohort_years', self.sex)
+            cohort_first = cohort_years[0]
+            cohort = years - age_int
+            cohort -= 0.5  # Cohort is people born in a given year.
+            cohort /= 10
+            cohort_fract = cohort % 1
+            cohort_year = cohort.astype(int) * 10
+            if not (cohort_first <= cohort_year).all() or not (cohort_year + 10 <= cohort_years[-1]).all():
+                raise KeyError('Cohort outside of life table.')
+            index = (cohort_year - cohort_first) // 10
+            n = self._q_array_cohort.shape[1] - 1
+            outside = (age_int >= n) | (age_int < -n)
+            age_index = np.where(outside, n, age_int % n)  # Tuple style indexing, with the appended 1 beyond the end.
+            q = np.where(outside, 1, (1 - cohort_fract) * self._q_array_cohort[index, age_index] + cohort_fract * self._q_array_cohort[index + 1, age_index])
+            return np.minimum(q, 1)
+        elif self.fixed:
+            return np.zeros(age_int.shape)
+        else:
+            if self._q_grid_period is not None:
+                grids = self._q_grid_array(-1, -1)[np.newaxis]
+                rows = np.zeros(age_int.shape, dtype = int)
+            else:
+                # A row of the stacked grids for each element. Stacks are cached since the same years and contract ages recur, such as when
+                # solving for age_add.
+                years = years.astype(int)
+                key = (self._q_grid_key, years.shape, years.tobytes(), contract_ages.tobytes())
+                try:
+                    grids = LifeTable._q_grid_stacks[key]
+                except KeyError:
+                    grids = np.array([self._q_grid_array(year, contract_age) for year, contract_age in zip(years.ravel().tolist(), contract_ages.ravel().tolist())])
+                    LifeTable._q_grid_stacks[key] = grids
+                rows = np.arange(age_int.size).reshape(age_int.shape)
+            n = grids.shape[1] - 1
+            q = grids[rows, np.where((age_int >= n) | (age_int < 0), n, age_int)]
+            negative = age_int < 0
+            if negative.any():
+                q[negative] = [self._q_int(year, age, contract_age) for year, age, contract_age in
+                    zip(years[negative].tolist(), age_int[negative].tolist(), contract_ages[negative].tolist())]
+            return q
@@ -0,0 +1,129 @@
+# SPIA - Income annuity (SPIA and DIA) price calculator
+# Copyright (C) 2023 Gordon Irlam
+#
+# This program may be licensed by you (at your option) under an Open
+# Source, Free for Non-Commercial Use, or Commercial Use License.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is free for non-commercial use: you can use and modify it
+# under the terms of the Creative Commons
+# Attribution-NonCommercial-ShareAlike 4.0 International Public License
+# (https://creativecommons.org/licenses/by-nc-sa/4.0/).
+#
+# A Commercial Use License is available in exchange for agreed
+# remuneration.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from weakref import WeakSet
+
+_caches = WeakSet()
+_capacities = {}
+
+class LRUCache(object):
+    '''Dictionary like cache of bounded size with least recently used
+    eviction.
+
+    Lookups of missing keys raise KeyError so the cache can be used in
+    place of a dict. Hits, misses, and evictions are counted. Caches
+    sharing the same name are reported together by cache_stats().
+
+    '''
+
+    def __init__(self, name, capacity = 1000):
+
+        self.name = name
+        self.capacity = _capacities.get(name, capacity)
+
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        _caches.add(self)
+
+    def __getitem__(self, key):
+
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self._data.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def __setitem__(self, key, value):
+
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.capacity:
+            self._data.popitem(last = False)
+            self.evictions += 1
+
+    def __contains__(self, key):
+
+        return key in self._data
+
+    def __len__(self):
+
+        return len(self._data)
+
+    def clear(self):
+
+        self._data.clear()
+
+    def stats(self):
+
+        return {
+            'capacity': self.capacity,
+            'size': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+def set_cache_capacity(name, capacity):
+    '''Set the capacity of all current and future caches with the given
+    name.
+
+    '''
+
+    _capacities[name] = capacity
+    for cache in tuple(_caches):
+        if cache.name == name:
+            cache.capacity = capacity
+            while len(cache._data) > capacity:
+                cache._data.popitem(last = False)
+                cache.evictions += 1
+
+def cache_stats():
+    '''Return a dict mapping cache name to the combined statistics of all
+    live caches of that name.
+
+    '''
+
+    stats = {}
+    for cache in tuple(_caches):
+        try:
+            s = stats[cache.name]
+        except KeyError:
+            s = {'instances': 0, 'capacity': 0, 'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+            stats[cache.name] = s
+        s['instances'] += 1
+        for k, v in cache.stats().items():
+            s[k] += v
+
+    return stats
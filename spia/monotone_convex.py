@@ -29,6 +29,8 @@
 
 from statistics import mean
 
+import numpy as np
+
 class MonotoneConvex(object):
 
     '''Hagan, Patrick S., and Graeme West. "Methods for constructing a yield curve." Wilmott Magazine, May (2008): 70-81.'''
@@ -115,10 +117,16 @@ class MonotoneConvex(object):
 
     def forward(self, term):
         '''Return the continuously compounding annualized forward rate for
-        term, term.
+        term, term. If term is an array return an array of the forward
+        rates.
 
         '''
 
+        if type(term) is not float:
+            if np.ndim(term) > 0:
+                return self._forwards(np.asarray(term, dtype = float))
+            term = float(term) # So NumPy scalars don't propagate.
+
         if term <= 0:
             forward = self.f[0]
         elif term == self.terms[-1]:
@@ -131,13 +139,15 @@ class MonotoneConvex(object):
             x = (term - self.terms[i]) / (self.terms[i + 1] - self.terms[i])
             g0 = self.f[i] - self.fdiscrete[i]
             g1 = self.f[i + 1] - self.fdiscrete[i]
+            # Powers are computed using multiplication so that the array version produces identical results.
             if x == 0:
                 g = g0
             elif x == 1:
                 g = g1
             elif (g0 < 0 and -0.5 * g0 <= g1 and g1 <= -2 * g0) or (g0 > 0 and -0.5 * g0 >= g1 and g1 >= - 2 * g0):
                 # zone (i)
-                g = g0 * (1 - 4 * x + 3 * x ** 2) + g1 * (-2 * x + 3 * x ** 2)
+                x2 = x * x
+                g = g0 * (1 - 4 * x + 3 * x2) + g1 * (-2 * x + 3 * x2)
             elif (g0 < 0 and g1 > -2 * g0) or (g0 > 0 and g1 < -2 * g0):
                 # zone (ii)
                 # (29)
@@ -146,14 +156,16 @@ class MonotoneConvex(object):
                 if x <= eta:
                     g = g0
                 else:
-                    g = g0 + (g1 - g0) * ((x - eta) / (1 - eta)) ** 2
+                    r = (x - eta) / (1 - eta)
+                    g = g0 + (g1 - g0) * (r * r)
             elif (g0 > 0 and 0 > g1 and g1 > -0.5 * g0) or (g0 < 0 and 0 < g1 and g1 < -0.5 * g0):
                 # zone (iii)
                 # (31)
                 eta = 3 * g1 / (g1 - g0)
                 # (30)
                 if x < eta:
-                    g = g1 + (g0 - g1) * ((eta - x) / eta) ** 2
+                    r = (eta - x) / eta
+                    g = g1 + (g0 - g1) * (r * r)
                 else:
                     g = g1
             elif g0 == 0 and g1 == 0:
@@ -166,9 +178,11 @@ class MonotoneConvex(object):
                 a = - g0 * g1 / (g0 + g1)
                 # (32)
                 if x <= eta:
-                    g = a + (g0 - a) * ((eta - x) / eta) ** 2
+                    r = (eta - x) / eta
+                    g = a + (g0 - a) * (r * r)
                 else:
-                    g = a + (g1 - a) * ((eta - x) / (1 - eta)) ** 2
+                    r = (eta - x) / (1 - eta)
+                    g = a + (g1 - a) * (r * r)
                     # (26)
             forward = g + self.fdiscrete[i]
 
@@ -179,10 +193,15 @@ class MonotoneConvex(object):
 
     def spot(self, term):
         '''Return the continuously compounding annualized spot rate for term,
-        term.
+        term. If term is an array return an array of the spot rates.
 
         '''
 
+        if type(term) is not float:
+            if np.ndim(term) > 0:
+                return self._spots(np.asarray(term, dtype = float))
+            term = float(term) # So NumPy scalars don't propagate.
+
         if term <= 0:
             return self.f[0]
         elif term > self.terms[-1]:
@@ -198,7 +217,9 @@ class MonotoneConvex(object):
                 g = 0
             elif (g0 < 0 and -0.5 * g0 <= g1 and g1 <= -2 * g0) or (g0 > 0 and -0.5 * g0 >= g1 and g1 >= -2 * g0):
                 # zone [i]
-                g = l * (g0 * (x - 2 * x ** 2 + x ** 3) + g1 * (- x ** 2 + x ** 3))
+                x2 = x * x
+                x3 = x2 * x
+                g = l * (g0 * (x - 2 * x2 + x3) + g1 * (- x2 + x3))
             elif (g0 < 0 and g1 > -2 * g0) or (g0 > 0 and g1 < -2 * g0):
                 # zone (ii)
                 # (29)
@@ -207,16 +228,18 @@ class MonotoneConvex(object):
                 if x <= eta:
                     g = g0 * (term - self.terms[i])
                 else:
-                    g = g0 * (term - self.terms[i]) + (g1 - g0) * (x - eta) ** 3 / (1 - eta) ** 2 / 3 * l
+                    d = x - eta
+                    g = g0 * (term - self.terms[i]) + (g1 - g0) * (d * d * d) / ((1 - eta) * (1 - eta)) / 3 * l
             elif (g0 > 0 and 0 > g1 and g1 > -0.5 * g0) or (g0 < 0 and 0 < g1 and g1 < -0.5 * g0):
                 # zone (iii)
                 # (31)
                 eta = 3 * g1 / (g1 - g0)
                 # (30)
                 if x < eta:
-                    g = l* (g1 * x - 1 / 3 * (g0 - g1) * ((eta - x) ** 3 / eta ** 2 - eta))
+                    d = eta - x
+                    g = l * (g1 * x - 1 / 3 * (g0 - g1) * ((d * d * d) / (eta * eta) - eta))
                 else:
-                    g = l * (2 / 3 * g1 + 1/ 3 * g0) * eta + g1 * (x - eta) * l
+                    g = l * (2 / 3 * g1 + 1 / 3 * g0) * eta + g1 * (x - eta) * l
             elif g0 == 0 and g1 == 0:
                 g = 0
             else:
@@ -227,12 +250,166 @@ class MonotoneConvex(object):
                 a = -g0 * g1 / (g0 + g1)
                 # (32)
                 if x <= eta:
-                    g = l * (a * x - 1 / 3 * (g0 - a) * ((eta - x) ** 3 / eta ** 2 - eta))
+                    d = eta - x
+                    g = l * (a * x - 1 / 3 * (g0 - a) * ((d * d * d) / (eta * eta) - eta))
                 else:
-                    g = l * (2 / 3 * a + 1 / 3 * g0) * eta + l * (a * (x - eta) + (g1 - a) / 3 * (x - eta) ** 3 / (1 - eta) ** 2)
+                    d = x - eta
+                    g = l * (2 / 3 * a + 1 / 3 * g0) * eta + l * (a * (x - eta) + (g1 - a) / 3 * (d * d * d) / ((1 - eta) * (1 - eta)))
                     # (12)
             return (self.terms[i] * self.spots[i] + self.fdiscrete[i] * (term - self.terms[i]) + g) / term
 
+    def _arrays(self):
+
+        try:
+            return self._t, self._s, self._fdiscrete, self._f
+        except AttributeError:
+            self._t = np.array(self.terms, dtype = float)
+            self._s = np.array(self.spots, dtype = float)
+            self._fdiscrete = np.array(self.fdiscrete)
+            self._f = np.array(self.f)
+            return self._t, self._s, self._fdiscrete, self._f
+
+    def _forwards(self, terms):
+
+        t, s, fdiscrete, f = self._arrays()
+        i = np.clip(np.searchsorted(t, terms, side = 'right') - 1, 0, len(t) - 2)
+        with np.errstate(all = 'ignore'):
+            x = (terms - t[i]) / (t[i + 1] - t[i])
+            g = _forward_g(x, f[i] - fdiscrete[i], f[i + 1] - fdiscrete[i])
+            forward = np.select((terms <= 0, terms == t[-1], terms > t[-1]), (f[0], f[-1], self.long_term_forward), g + fdiscrete[i])
+
+        if self.force_forwards_non_negative:
+            forward = np.maximum(0, forward)
+
+        return forward
+
+    def _spots(self, terms):
+
+        t, s, fdiscrete, f = self._arrays()
+        i = np.clip(np.searchsorted(t, terms, side = 'right') - 1, 0, len(t) - 2)
+        with np.errstate(all = 'ignore'):
+            dt = terms - t[i]
+            l = t[i + 1] - t[i]
+            g = _spot_g(dt / l, l, dt, f[i] - fdiscrete[i], f[i + 1] - fdiscrete[i])
+            return np.select((terms <= 0, terms > t[-1]), (f[0], (t[-1] * s[-1] + (terms - t[-1]) * self.long_term_forward) / terms),
+                (t[i] * s[i] + fdiscrete[i] * dt + g) / terms)
+
+# Array versions of the zone computations of MonotoneConvex; every zone is evaluated and the applicable one selected.
+# The expressions must match those of the scalar methods exactly.
+
+def _zones(g0, g1):
+
+    return (
+        (g0 < 0) & (-0.5 * g0 <= g1) & (g1 <= -2 * g0) | (g0 > 0) & (-0.5 * g0 >= g1) & (g1 >= -2 * g0),
+        (g0 < 0) & (g1 > -2 * g0) | (g0 > 0) & (g1 < -2 * g0),
+        (g0 > 0) & (0 > g1) & (g1 > -0.5 * g0) | (g0 < 0) & (0 < g1) & (g1 < -0.5 * g0),
+        (g0 == 0) & (g1 == 0),
+    )
+
+def _forward_g(x, g0, g1):
+
+    x2 = x * x
+    eta2 = (g1 + 2 * g0) / (g1 - g0)
+    r2 = (x - eta2) / (1 - eta2)
+    eta3 = 3 * g1 / (g1 - g0)
+    r3 = (eta3 - x) / eta3
+    eta4 = g1 / (g1 + g0)
+    a = - g0 * g1 / (g0 + g1)
+    r4lo = (eta4 - x) / eta4
+    r4hi = (eta4 - x) / (1 - eta4)
+    zone1, zone2, zone3, zone0 = _zones(g0, g1)
+
+    return np.select((x == 0, x == 1, zone1, zone2, zone3, zone0), (
+        g0,
+        g1,
+        g0 * (1 - 4 * x + 3 * x2) + g1 * (-2 * x + 3 * x2),
+        np.where(x <= eta2, g0, g0 + (g1 - g0) * (r2 * r2)),
+        np.where(x < eta3, g1 + (g0 - g1) * (r3 * r3), g1),
+        0,
+    ), default = np.where(x <= eta4, a + (g0 - a) * (r4lo * r4lo), a + (g1 - a) * (r4hi * r4hi)))
+
+def _spot_g(x, l, dt, g0, g1):
+
+    x2 = x * x
+    x3 = x2 * x
+    eta2 = (g1 + 2 * g0) / (g1 - g0)
+    d2 = x - eta2
+    eta3 = 3 * g1 / (g1 - g0)
+    d3 = eta3 - x
+    eta4 = g1 / (g1 + g0)
+    a = -g0 * g1 / (g0 + g1)
+    d4lo = eta4 - x
+    d4hi = x - eta4
+    zone1, zone2, zone3, zone0 = _zones(g0, g1)
+
+    return np.select(((x == 0) | (x == 1), zone1, zone2, zone3, zone0), (
+        0,
+        l * (g0 * (x - 2 * x2 + x3) + g1 * (- x2 + x3)),
+        np.where(x <= eta2, g0 * dt, g0 * dt + (g1 - g0) * (d2 * d2 * d2) / ((1 - eta2) * (1 - eta2)) / 3 * l),
+        np.where(x < eta3, l * (g1 * x - 1 / 3 * (g0 - g1) * ((d3 * d3 * d3) / (eta3 * eta3) - eta3)),
+            l * (2 / 3 * g1 + 1 / 3 * g0) * eta3 + g1 * (x - eta3) * l),
+        0,
+    ), default = np.where(x <= eta4, l * (a * x - 1 / 3 * (g0 - a) * ((d4lo * d4lo * d4lo) / (eta4 * eta4) - eta4)),
+        l * (2 / 3 * a + 1 / 3 * g0) * eta4 + l * (a * (x - eta4) + (g1 - a) / 3 * (d4hi * d4hi * d4hi) / ((1 - eta4) * (1 - eta4)))))
+
+def monotone_convex_spots(terms, spots, at_terms, *, min_long_term_forward = float('inf'), force_forwards_non_negative = True):
+    '''Return the [N, len(at_terms)] array of continuously compounding
+    annualized spot rates at at_terms for N monotone convex curves
+    sharing the same ascending terms.
+
+    spots is the [N, len(terms)] array of the spot rates of each
+    curve. The other arguments are as for MonotoneConvex. Produces
+    the same values as MonotoneConvex(terms, spots[n],
+    ...).spot(at_term) without constructing an object per curve.
+
+    '''
+
+    spots = np.asarray(spots, dtype = float)
+    n, m = spots.shape
+    assert len(terms) == m
+
+    # extend the curves to time 0
+    t = np.array((0, ) + tuple(terms), dtype = float)
+    s = np.hstack((spots[:, :1], spots))
+
+    # step 1
+    fdiscrete = (t[1:] * s[:, 1:] - t[:-1] * s[:, :-1]) / (t[1:] - t[:-1])
+
+    # step 2
+    f = np.empty((n, m + 1))
+    f[:, 1:-1] = (t[1:-1] - t[:-2]) / (t[2:] - t[:-2]) * fdiscrete[:, 1:] + (t[2:] - t[1:-1]) / (t[2:] - t[:-2]) * fdiscrete[:, :-1]
+
+    # step 3
+    f[:, 0] = fdiscrete[:, 0] - 0.5 * (f[:, 1] - fdiscrete[:, 0])
+    f[:, -1] = fdiscrete[:, -1] - 0.5 * (f[:, -2] - fdiscrete[:, -1])
+    if force_forwards_non_negative:
+        f[:, 0] = np.maximum(0, np.minimum(f[:, 0], 2 * fdiscrete[:, 0]))
+        f[:, -1] = np.maximum(0, np.minimum(f[:, -1], 2 * fdiscrete[:, -1]))
+        f[:, 1:-1] = np.maximum(0, np.minimum(f[:, 1:-1], 2 * np.minimum(fdiscrete[:, :-1], fdiscrete[:, 1:])))
+
+    if min_long_term_forward < t[-1]:
+        long_term_forward = (t[-1] * _spots_at(t, s, fdiscrete, f, None, t[-1]) \
+            - min_long_term_forward * _spots_at(t, s, fdiscrete, f, None, min_long_term_forward)) / (t[-1] - min_long_term_forward)
+    else:
+        long_term_forward = f[:, -1]
+
+    return np.array([_spots_at(t, s, fdiscrete, f, long_term_forward, term) for term in at_terms]).T
+
+def _spots_at(t, s, fdiscrete, f, long_term_forward, term):
+
+    if term <= 0:
+        return f[:, 0]
+    elif term > t[-1]:
+        return (t[-1] * s[:, -1] + (term - t[-1]) * long_term_forward) / term
+
+    i = min(int(np.searchsorted(t, term, side = 'right')) - 1, len(t) - 2)
+    l = t[i + 1] - t[i]
+    dt = term - t[i]
+    with np.errstate(all = 'ignore'):
+        g = _spot_g(dt / l, l, dt, f[:, i] - fdiscrete[:, i], f[:, i + 1] - fdiscrete[:, i])
+
+    return (t[i] * s[:, i] + fdiscrete[:, i] * dt + g) / term
+
 if __name__ == '__main__':
 
     terms = (1, 2, 3, 4, 5)
@@ -61,6 +61,11 @@ class Test:
         life_table_ssa = LifeTable('ssa-cohort', 'male')
         life_table2_ssa = LifeTable('ssa-cohort', 'female')
 
+        life_table_le = LifeTable('ssa-cohort', 'male', age = 65, le_add = 2, date_str = '2017-06-10')
+        assert type(life_table_le.age_add) == float, 'Life expectancy adjusted age_add is not a Python float.'
+        life_table_le = LifeTable('ssa-cohort', 'male', age = 65, le_set = 20, date_str = '2017-06-10')
+        assert type(life_table_le.age_add) == float, 'Life expectancy adjusted age_add is not a Python float.'
+
         def p(x):
             print(round(x, 9))
 
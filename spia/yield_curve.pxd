@@ -37,7 +37,7 @@ cdef class YieldCurve:
     cdef bint _interest_rate_fixed
     cdef bint _interest_rate_le
     cdef double _log_1_plus_adjust
-    cdef dict _spot_cache
+    cdef object _spot_cache
     cdef str yield_curve_date
     cdef str _datadir
     cdef object monotone_convex
@@ -27,12 +27,11 @@
 
 import csv
 from datetime import datetime
-from json import dumps, loads
 import math
-from os import makedirs, replace
+from os import stat
 from os.path import expanduser, isdir, join, normpath
-import statistics
 
+import numpy as np
 import scipy.interpolate
 
 try:
@@ -51,9 +50,10 @@ except ImportError:
             pass
 
 from .fetch_yield_curve import datadir, fetch_yield_curve
-from .monotone_convex import MonotoneConvex
-
-cachedir = '~/.cache/spia'
+from .lru_cache import LRUCache
+from .monotone_convex import MonotoneConvex, monotone_convex_spots
+from .yield_curve_cache import get_yield_curve_cache
+from .yield_curve_store import get_yield_curve_store
 
 class NoData(Exception):
     pass
@@ -86,62 +86,71 @@ class YieldCurve:
             special = True
             date_year = 0
 
-        if date_str_low:
-            date_year_low = int(date_str_low.split('-')[0])
+        if not special:
+
+            yield_curve_date, yield_curve_years, yield_curve_rates = \
+                get_yield_curve_store(self._datadir, self._interest_rate).lookup(date_str, date_str_low)
+
         else:
-            date_year_low = date_year - 1
 
-        yield_curve_date = []
-        yield_curve_years = []
-        yield_curve_rates = []
-        for year in range(date_year, date_year_low - 1, -1):
+            # Special yield curves are only available as CSV files.
 
-            year_str = date_year_str if special else str(year)
+            if date_str_low:
+                date_year_low = int(date_str_low.split('-')[0])
+            else:
+                date_year_low = date_year - 1
 
-            try:
+            yield_curve_date = []
+            yield_curve_years = []
+            yield_curve_rates = []
+            for year in range(date_year, date_year_low - 1, -1):
+
+                year_str = date_year_str if special else str(year)
+
+                try:
+
+                    with open(join(self._datadir, self._interest_rate, self._interest_rate + '-' + year_str + '.csv')) as f:
+
+                        r = csv.reader(f)
+                        assert next(r)[0].startswith('#')
+
+                        years = next(r)
+                        years.pop(0)
+                        years = tuple(float(v) for v in years)
+
+                        date = []
+                        rates = []
+                        for line in r:
+                            d = line[0]
+                            rate = line[1:]
+                            if special:
+                                match = d == date_str
+                            else:
+                                match = d <= date_str
+                                if date_str_low:
+                                    match = match and date_str_low <= d
+                            if match:
+                                if not date_str_low:
+                                    date = []
+                                    rates = []
+                                assert len(years) == len(rate)
+                                if not all(r == '' for r in rate):
+                                    date.append(d)
+                                    rates.append(rate)
+                            elif not date_str_low:
+                                break
+
+                    yield_curve_date.extend(date)
+                    for rate in rates:
+                        yield_curve_years.append(tuple(y for y, r in zip(years, rate) if r != ''))
+                        yield_curve_rates.append(tuple(float(r) / 100 for r in rate if r != ''))
+
+                    if not date_str_low and yield_curve_date:
+                        break
 
-                with open(join(self._datadir, self._interest_rate, self._interest_rate + '-' + year_str + '.csv')) as f:
-
-                    r = csv.reader(f)
-                    assert next(r)[0].startswith('#')
-
-                    years = next(r)
-                    years.pop(0)
-                    years = tuple(float(v) for v in years)
-
-                    date = []
-                    rates = []
-                    for line in r:
-                        d = line[0]
-                        rate = line[1:]
-                        if special:
-                            match = d == date_str
-                        else:
-                            match = d <= date_str
-                            if date_str_low:
-                                match = match and date_str_low <= d
-                        if match:
-                            if not date_str_low:
-                                date = []
-                                rates = []
-                            assert len(years) == len(rate)
-                            if not all(r == '' for r in rate):
-                                date.append(d)
-                                rates.append(rate)
-                        elif not date_str_low:
-                            break
-
-                yield_curve_date.extend(date)
-                for rate in rates:
-                    yield_curve_years.append(tuple(y for y, r in zip(years, rate) if r != ''))
-                    yield_curve_rates.append(tuple(float(r) / 100 for r in rate if r != ''))
-
-                if not date_str_low and yield_curve_date:
-                    break
-
-            except IOError:
-
-                pass
+                except IOError:
+
+                    pass
 
         try:
             yield_curve_date_str = max(yield_curve_date)
@@ -262,9 +271,9 @@ class YieldCurve:
         'cache' specifies whether to cache and utilize any cache of
         the yield curve saved to the directory "~/.cache/spia" when
         'date_str_low' is specified. This can speed up initialization.
-        Cache should be False if 'date_str' exceeds the latest yield
-        curve data date. The cache should be manually cleared if this
-        package is changed.
+        Cache entries are keyed by the interest rate data used, so
+        newly fetched data is never masked by the cache. Run "python3
+        -m spia.yield_curve_cache stats" to report on the cache.
 
         Raises NoData if not interest rate data can be found for the
         requested date or dates.
@@ -282,7 +291,7 @@ class YieldCurve:
         self._interest_rate_fixed = self._interest_rate == 'fixed'
         self._interest_rate_le = self._interest_rate == 'le'
         self._log_1_plus_adjust = math.log(1 + self.adjust)
-        self._spot_cache = {}
+        self._spot_cache = LRUCache('yield_curve_spot')
 
         if self._interest_rate_fixed or self._interest_rate_le:
             self.yield_curve_date = 'none'
@@ -293,25 +302,20 @@ class YieldCurve:
         yield_curve_date = None
         cached = False
 
-        if self.cache and self._date_low:
+        use_cache: cython.bint
+        use_cache = self.cache and bool(self._date_low) and self._interest_rate in ('real', 'nominal') and not self._date.startswith('special-')
+            # The cache digest is computed from the yield curve store, which only holds the Treasury daily yield curves.
+            # Corporate and special yield curves are read from other CSV files, so aren't cached.
 
-            cache_dir = normpath(expanduser(cachedir))
-            makedirs(cache_dir, exist_ok = True)
-            cache_path = join(cache_dir, 'spia-' + self._interest_rate + '-' + self._date + '-' + self._date_low + '-' + str(self.adjust))
+        if use_cache:
 
-            try:
-                json_str = open(cache_path).read()
+            cache_key = (self._interest_rate, self._date, self._date_low, self.adjust)
+            cache_digest = get_yield_curve_store(self._datadir, self._interest_rate).digest(self._date, self._date_low)
+            entry = get_yield_curve_cache().load(cache_key, cache_digest)
+            if entry:
                 cached = True
-            except IOError:
-                pass
-
-            if cached:
-                cache_data = loads(json_str)
-                version = cache_data['version']
-                yield_curve_date = cache_data['yield_curve_date']
-                interpolate_years = cache_data['years']
-                interpolate_spots = cache_data['spots']
-                cached = version == 1
+                yield_curve_date, interpolate_years, interpolate_spots = entry
+                self.yield_curve_date = yield_curve_date
 
         for count in range(2):
 
@@ -345,58 +349,49 @@ class YieldCurve:
         if stale_days > self.permit_stale_days:
             raise NoData('Interest rate data is stale.')
 
-        if not cached and self.cache and self._date_low:
+        if not cached and use_cache:
 
-            cache_data = {'version': 1, 'yield_curve_date': self.yield_curve_date, 'years': interpolate_years, 'spots': interpolate_spots}
-            json_str = dumps(cache_data)
-            try:
-                with open(cache_path + '.tmp', 'w') as f:
-                    f.write(json_str)
-            except IOError:
-                pass
-            else:
-                try:
-                    replace(cache_path + '.tmp', cache_path)
-                except FileNotFoundError:
-                    pass
+            cache_digest = get_yield_curve_store(self._datadir, self._interest_rate).digest(self._date, self._date_low)
+                # Data may have been fetched.
+            get_yield_curve_cache().save(cache_key, cache_digest, self.yield_curve_date, interpolate_years, interpolate_spots)
 
         # Construct a master interpolator.
         self.monotone_convex = MonotoneConvex(interpolate_years, interpolate_spots, min_long_term_forward = 15, force_forwards_non_negative = False)
 
     def _load_yield_curve(self):
 
+        # Yield curves reporting the same years are processed together using array operations.
+        groups = {}
+
         if self._interest_rate in ('real', 'nominal'):
 
             yield_curve_years, yield_curve_rates, self.yield_curve_date = self._get_treasury(self._date, self._date_low)
 
-            # Convert par rates to spot rates.
-            spot_rates = []
             for yield_curve_year, yield_curve_rate in zip(yield_curve_years, yield_curve_rates):
+                groups.setdefault(yield_curve_year, []).append(yield_curve_rate)
+
+            # Convert par rates to spot rates.
+            for yield_curve_year, yield_curve_rate in groups.items():
 
                 # First interpolate the spot returns.
-                coupon_yield_curve = []
-                yield_curve = scipy.interpolate.PchipInterpolator(yield_curve_year, yield_curve_rate)
-
-                for i in range(1, int(2 * max(yield_curve_year)) + 1):
-                    year = i / 2.0
-                    # For below range values Scipy just uses the polynominal, which is problematic, so we use linear interpolation in this case.
-                    if year < min(yield_curve_year):
-                        slope = yield_curve(min(yield_curve_year), 1)
-                        slope = float(slope) # De-numpify.
-                        rate = yield_curve_rate[0] + slope * (year - min(yield_curve_year))
-                    else:
-                        rate = float(yield_curve(year))
-                    coupon_yield_curve.append(rate)
-
-                spot_rate = self.par_to_spot(coupon_yield_curve)
+                yield_curve_rate = np.array(yield_curve_rate)
+                yield_curve = scipy.interpolate.PchipInterpolator(yield_curve_year, yield_curve_rate, axis = 1)
+
+                years = np.arange(1, int(2 * max(yield_curve_year)) + 1) / 2.0
+                coupon_yield_curve = yield_curve(years)
+                # For below range values Scipy just uses the polynominal, which is problematic, so we use linear interpolation in this case.
+                below = years < min(yield_curve_year)
+                slope = yield_curve(min(yield_curve_year), 1)
+                coupon_yield_curve[:, below] = yield_curve_rate[:, :1] + slope[:, np.newaxis] * (years[below] - min(yield_curve_year))
+
+                spot_rate = pars_to_spots(coupon_yield_curve)
                     # Does not match spot rates at https://www.treasury.gov/resource-center/economic-policy/corp-bond-yield/Pages/TNC-YC.aspx
                     # because the input par rates of the daily quotes used differ from the end of month quotes reported there.
                 # Extract just the spot rates of the original yield curve.
-                spot_rate = tuple(spot_rate[math.ceil(y * 2 - 1)] for y in yield_curve_year)
+                groups[yield_curve_year] = spot_rate[:, [math.ceil(y * 2 - 1) for y in yield_curve_year]]
                     # Rates less than 6 months will all get the 6 month spot rate. This is only relevant for nominals.
                     # This is fine for computing immediate annuity prices.
                     # For some applications it may be necessary to interpolate the spot rates, but this would slow things down.
-                spot_rates.append(spot_rate)
 
         elif self._interest_rate == 'corporate':
 
@@ -407,6 +402,10 @@ class YieldCurve:
             except NoData:
                 yield_curve_years, spot_rates, self.yield_curve_date = self._get_corporate(date_year - 1, self._date, self._date_low)
 
+            for yield_curve_year, spot_rate in zip(yield_curve_years, spot_rates):
+                groups.setdefault(tuple(yield_curve_year), []).append(spot_rate)
+            groups = {yield_curve_year: np.array(spot_rate) for yield_curve_year, spot_rate in groups.items()}
+
         else:
 
             assert False
@@ -415,21 +414,22 @@ class YieldCurve:
 
         # Figure out what years have been reported.
         interpolate_years = set()
-        for yield_curve_year in yield_curve_years:
+        for yield_curve_year in groups:
                interpolate_years |= set(yield_curve_year)
         interpolate_years = sorted(interpolate_years)
 
-        # Construct interpolators for each yield curve.
-        interpolators = []
-        for yield_curve_year, spot_rate in zip(yield_curve_years, spot_rates):
-            continuous_spot_rate = tuple(math.log((1 + r / 2) ** 2 + self.adjust) for r in spot_rate) # Treasury rates are twice the semi-annualized rate.
-            interpolator = MonotoneConvex(yield_curve_year, continuous_spot_rate, min_long_term_forward = 15, force_forwards_non_negative = False)
+        # Interpolate each yield curve.
+        interpolated_spots = []
+        for yield_curve_year, spot_rate in groups.items():
+            continuous_spot_rate = np.log((1 + spot_rate / 2) ** 2 + self.adjust) # Treasury rates are twice the semi-annualized rate.
+            interpolated_spots.append(monotone_convex_spots(yield_curve_year, continuous_spot_rate, interpolate_years,
+                min_long_term_forward = 15, force_forwards_non_negative = False))
                 # Treasury methodology; extrapolate using average forward rate 15 years and longer.
                 # Real forwards are not required to be positive, and favor mathematical consistency for nominal forward rates.
-            interpolators.append(interpolator)
+        interpolated_spots = np.vstack(interpolated_spots)
 
         # Average the yield curves.
-        interpolate_spots = tuple(statistics.mean(interpolator.spot(year) for interpolator in interpolators) for year in interpolate_years)
+        interpolate_spots = tuple(math.fsum(spots) / len(spots) for spots in interpolated_spots.T.tolist())
 
         return interpolate_years, interpolate_spots
 
@@ -485,7 +485,21 @@ class YieldCurve:
         return spots
 
     def spot(self, y):
-        '''Return the continuously compounded annual spot rate.'''
+        '''Return the continuously compounded annual spot rate. If y is an
+        array return an array of spot rates.
+
+        '''
+
+        if type(y) is not float:
+            if np.ndim(y) > 0:
+                y = np.asarray(y, dtype = float)
+                if self._interest_rate_fixed:
+                    return np.full(y.shape, self._log_1_plus_adjust)
+                elif self._interest_rate_le:
+                    return np.zeros(y.shape)
+                else:
+                    return self.monotone_convex.spot(y)
+            y = float(y) # So NumPy scalars don't propagate.
 
         if self._interest_rate_fixed:
             spt = self._log_1_plus_adjust
@@ -502,37 +516,137 @@ class YieldCurve:
                     # the input par rates of the daily quotes used here differ
                     # from the end of month quotes reported there.
                     spt = self.monotone_convex.spot(y)
-                if len(self._spot_cache) < 1000:
-                    self._spot_cache[y] = spt
+                self._spot_cache[y] = spt
 
         return spt
 
     def forward(self, y):
-        '''Return the continuously compounded annual forward rate.'''
+        '''Return the continuously compounded annual forward rate. If y is
+        an array return an array of forward rates.
+
+        '''
 
         if self._interest_rate_fixed:
-            return self._log_1_plus_adjust
+            forward = self._log_1_plus_adjust
         elif self._interest_rate_le:
-            return 0
+            forward = 0
         else:
             return self.monotone_convex.forward(y)
 
+        if np.ndim(y) == 0:
+            return forward
+        else:
+            return np.full(np.shape(y), forward, dtype = float)
+
     def discount_rate(self, y):
         '''Return 1 + the annual discount rate associated with time period 'y'
         which is expressed in years. Raise the result to the power 'y'
-        to get the applicable discount factor.
+        to get the applicable discount factor. If y is an array return an
+        array of discount rates.
 
         '''
 
         if self._interest_rate_fixed:
-            return 1 + self.adjust
+            discount_rate = 1 + self.adjust
         elif self._interest_rate_le:
-            return 1
-        else:
+            discount_rate = 1
+        elif np.ndim(y) == 0:
             return math.exp(self.monotone_convex.spot(y))
+        else:
+            spots = self.monotone_convex.spot(np.asarray(y, dtype = float))
+            return np.array([math.exp(spot) for spot in spots.ravel().tolist()]).reshape(spots.shape)
+                # Elementwise math.exp so that the results are identical to those of the scalar path.
+
+        if np.ndim(y) == 0:
+            return discount_rate
+        else:
+            return np.full(np.shape(y), discount_rate, dtype = float)
 
     @property
     def risk_free_rate(self):
         '''Return the average annual risk free rate.'''
 
         return self.discount_rate(0) - 1
+
+# Array versions of the YieldCurve rate conversions. Rates are indexed by [..., term], where the terms are 0.5, 1, 1.5, ... years, so a
+# [days, terms] matrix converts the yield curves of many days at once.
+
+def pars_to_spots(pars):
+    '''Convert an array of semi-annual par rates to semi-annual spot
+    rates.
+
+    '''
+    pars = np.asarray(pars, dtype = float)
+    spots = np.empty(pars.shape)
+    discount_rate_sum = np.zeros(pars.shape[:-1])
+    # Bootstrapping is sequential in the term, but each step is computed for all of the yield curves at once.
+    for i in range(pars.shape[-1]):
+        coupon_yield = pars[..., i] / 2.0
+        discount_rate = (1 - coupon_yield * discount_rate_sum) / (1 + coupon_yield)
+        spot_yield = discount_rate ** (- 1.0 / (i + 1)) - 1
+        spots[..., i] = spot_yield * 2
+        discount_rate_sum += discount_rate
+    return spots
+
+def spots_to_pars(spots):
+    '''Convert an array of semi-annual spot rates to semi-annual par
+    rates.
+
+    '''
+    spots = np.asarray(spots, dtype = float)
+    growth = (1 + spots / 2) ** np.arange(1, spots.shape[-1] + 1)
+    return (1 - 1 / growth) / np.cumsum(1 / growth, axis = -1) * 2
+
+def spots_to_forwards(spots):
+    '''Convert an array of semi-annual spot rates to semi-annual forward
+    rates.
+
+    '''
+    spots = np.asarray(spots, dtype = float)
+    growth = (1 + spots / 2) ** np.arange(1, spots.shape[-1] + 1)
+    prev_growth = np.concatenate((np.ones(spots.shape[:-1] + (1, )), growth[..., :-1]), axis = -1)
+    return (growth / prev_growth - 1) * 2
+
+def forwards_to_spots(forwards):
+    '''Convert an array of semi-annual forward rates to semi-annual spot
+    rates.
+
+    '''
+    forwards = np.asarray(forwards, dtype = float)
+    growth = np.cumprod(1 + forwards / 2, axis = -1)
+    return (growth ** (1.0 / np.arange(1, forwards.shape[-1] + 1)) - 1) * 2
+
+_yield_curves = LRUCache('yield_curves', capacity = 100)
+
+def get_yield_curve(interest_rate, date_str, *, date_str_low = None, adjust = 0.0, permit_stale_days = float('inf'), cache = True):
+    '''Return the process wide shared YieldCurve for the given
+    arguments, constructing it on first use. See YieldCurve for the
+    meaning of the arguments.
+
+    A YieldCurve is not modified once constructed, so identical
+    requests, such as those made by the many environments of a single
+    worker process, can share the one object along with its
+    interpolators and spot rate cache.
+
+    As for the yield curve store, a new YieldCurve is constructed
+    whenever the modification time of the interest rate data
+    directory changes, such as when fetch_yield_curve adds or replaces
+    a CSV file.
+
+    '''
+
+    try:
+        dir_mtime = stat(join(normpath(expanduser(datadir)), interest_rate)).st_mtime_ns
+    except OSError:
+        dir_mtime = None # No data directory, such as for fixed yield curves.
+    key = (interest_rate, date_str, date_str_low, adjust, permit_stale_days, cache, dir_mtime)
+
+    try:
+        return _yield_curves[key]
+    except KeyError:
+        pass
+
+    yield_curve = YieldCurve(interest_rate, date_str, date_str_low = date_str_low, adjust = adjust, permit_stale_days = permit_stale_days, cache = cache)
+    _yield_curves[key] = yield_curve
+
+    return yield_curve
@@ -0,0 +1,211 @@
+# SPIA - Income annuity (SPIA and DIA) price calculator
+# Copyright (C) 2023 Gordon Irlam
+#
+# This program may be licensed by you (at your option) under an Open
+# Source, Free for Non-Commercial Use, or Commercial Use License.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is free for non-commercial use: you can use and modify it
+# under the terms of the Creative Commons
+# Attribution-NonCommercial-ShareAlike 4.0 International Public License
+# (https://creativecommons.org/licenses/by-nc-sa/4.0/).
+#
+# A Commercial Use License is available in exchange for agreed
+# remuneration.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from argparse import ArgumentParser
+from datetime import datetime
+from hashlib import sha1
+from json import dumps, loads
+from os import getpid, listdir, makedirs, remove, replace, stat, utime
+from os.path import expanduser, join, normpath
+from zipfile import BadZipFile
+
+import numpy as np
+
+cachedir = '~/.cache/spia'
+
+class YieldCurveCache:
+    '''On disk cache of the interpolation arrays of average yield curves.
+
+    Entries are content addressed: the file name is the hash of the
+    cache version, the yield curve parameters, and the digest of the
+    interest rate data the yield curve was computed from. Changes to
+    the data thus result in new entries rather than stale results. Bump
+    the version whenever the yield curve computation changes.
+
+    Entries are .npz files written atomically. Each lookup refreshes
+    the modification time of the entry, and the least recently used
+    entries are evicted once the cache exceeds max_size bytes.
+
+    '''
+
+    version = 2 # Version 1 was a JSON file named by the yield curve parameters.
+    prefix = 'spia-'
+
+    def __init__(self, directory = cachedir, *, max_size = 64 << 20):
+
+        self.directory = normpath(expanduser(directory))
+        self.max_size = max_size
+
+    def _path(self, key, digest):
+
+        name = sha1(repr((self.version, key, digest)).encode()).hexdigest()
+
+        return join(self.directory, self.prefix + name + '.npz')
+
+    def load(self, key, digest):
+        '''Return the cached (yield_curve_date, years, spots) for key and
+        data digest, or None if not cached.
+
+        '''
+
+        path = self._path(key, digest)
+        try:
+            with np.load(path) as data:
+                entry = str(data['yield_curve_date']), tuple(data['years'].tolist()), tuple(data['spots'].tolist())
+            utime(path)
+        except (OSError, ValueError, KeyError, BadZipFile):
+            return None
+
+        return entry
+
+    def save(self, key, digest, yield_curve_date, years, spots):
+
+        path = self._path(key, digest)
+        tmp_path = path + '.' + str(getpid()) + '.tmp'
+        try:
+            makedirs(self.directory, exist_ok = True)
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, key = dumps(key), yield_curve_date = yield_curve_date, years = years, spots = spots)
+            replace(tmp_path, path) # Atomic, so concurrent readers never see a partial entry.
+        except OSError:
+            return
+
+        self.evict()
+
+    def entries(self):
+        '''Return a list of (path, size, mtime) of the cache entries, least
+        recently used first. Also includes version 1 entries.
+
+        '''
+
+        entries = []
+        try:
+            names = listdir(self.directory)
+        except OSError:
+            names = []
+        for name in names:
+            if name.startswith(self.prefix) and not name.endswith('.tmp'):
+                path = join(self.directory, name)
+                try:
+                    st = stat(path)
+                except OSError:
+                    continue # Concurrently evicted.
+                entries.append((path, st.st_size, st.st_mtime))
+        entries.sort(key = lambda entry: entry[2])
+
+        return entries
+
+    def evict(self):
+        '''Remove least recently used entries until the cache is within
+        max_size bytes.
+
+        '''
+
+        entries = self.entries()
+        size = sum(entry[1] for entry in entries)
+        for path, entry_size, _ in entries:
+            if size <= self.max_size:
+                break
+            try:
+                remove(path)
+            except OSError:
+                pass
+            size -= entry_size
+
+    def clear(self):
+
+        for path, _, _ in self.entries():
+            try:
+                remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+
+        entries = self.entries()
+
+        return {
+            'directory': self.directory,
+            'entries': len(entries),
+            'size': sum(entry[1] for entry in entries),
+            'max_size': self.max_size,
+            'oldest': datetime.fromtimestamp(entries[0][2]).isoformat(timespec = 'seconds') if entries else None,
+            'newest': datetime.fromtimestamp(entries[-1][2]).isoformat(timespec = 'seconds') if entries else None,
+        }
+
+    def inspect(self):
+        '''Return a list of dictionaries describing each cache entry, least
+        recently used first.
+
+        '''
+
+        result = []
+        for path, size, mtime in self.entries():
+            entry = {'file': path, 'size': size, 'used': datetime.fromtimestamp(mtime).isoformat(timespec = 'seconds')}
+            if path.endswith('.npz'):
+                try:
+                    with np.load(path) as data:
+                        interest_rate, date, date_low, adjust = loads(str(data['key']))
+                        entry.update({'interest_rate': interest_rate, 'date': date, 'date_low': date_low, 'adjust': adjust,
+                            'yield_curve_date': str(data['yield_curve_date'])})
+                except (OSError, ValueError, KeyError, BadZipFile):
+                    entry['invalid'] = True
+            else:
+                entry['version'] = 1
+            result.append(entry)
+
+        return result
+
+_cache = None
+
+def get_yield_curve_cache():
+
+    global _cache
+
+    if _cache is None:
+        _cache = YieldCurveCache()
+
+    return _cache
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(description = 'Report on or clear the yield curve cache.')
+    parser.add_argument('--directory', default = cachedir, help = 'Cache directory')
+    parser.add_argument('command', choices = ('stats', 'inspect', 'evict', 'clear'))
+    args = parser.parse_args()
+
+    cache = YieldCurveCache(args.directory)
+    if args.command == 'stats':
+        for k, v in cache.stats().items():
+            print('{}: {}'.format(k, v))
+    elif args.command == 'inspect':
+        for entry in cache.inspect():
+            print(' '.join('{}={}'.format(k, v) for k, v in entry.items()))
+    elif args.command == 'evict':
+        cache.evict()
+    else:
+        cache.clear()
@@ -0,0 +1,219 @@
+# SPIA - Income annuity (SPIA and DIA) price calculator
+# Copyright (C) 2023 Gordon Irlam
+#
+# This program may be licensed by you (at your option) under an Open
+# Source, Free for Non-Commercial Use, or Commercial Use License.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is free for non-commercial use: you can use and modify it
+# under the terms of the Creative Commons
+# Attribution-NonCommercial-ShareAlike 4.0 International Public License
+# (https://creativecommons.org/licenses/by-nc-sa/4.0/).
+#
+# A Commercial Use License is available in exchange for agreed
+# remuneration.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import csv
+from glob import glob
+from hashlib import sha1
+from itertools import compress
+from math import nan
+from os import getpid, makedirs, remove, replace, stat
+from os.path import abspath, dirname, expanduser, getmtime, join, normpath
+
+import numpy as np
+
+from .yield_curve_cache import cachedir
+
+_stores = {}
+
+def get_yield_curve_store(datadir, interest_rate):
+    '''Return the process wide YieldCurveStore for the Treasury
+    interest_rate type ('real' or 'nominal') found in datadir.
+
+    The store is revalidated whenever the modification time of its
+    directory changes, such as when fetch_yield_curve adds or replaces
+    a CSV file.
+
+    '''
+
+    directory = join(datadir, interest_rate)
+    try:
+        dir_mtime = stat(directory).st_mtime_ns
+    except OSError:
+        dir_mtime = None
+
+    try:
+        store, mtime = _stores[directory]
+        if mtime == dir_mtime:
+            return store
+    except KeyError:
+        pass
+
+    store = YieldCurveStore(directory, interest_rate)
+    _stores[directory] = (store, dir_mtime)
+
+    return store
+
+class YieldCurveStore:
+    '''Columnar store of the daily yield curve history of a Treasury
+    interest rate type, built from the yearly fetch_yield_curve CSV
+    files.
+
+    The store is a single .npy file of records holding an ISO date and
+    the rates in percent for every maturity reported in any year, with
+    NaN for maturities not reported on that date. The first record has
+    an empty date and holds the maturities in years. The file is kept
+    in cache_directory, memory mapped read only, and rebuilt whenever
+    any CSV file is newer than it. If the file can't be written the
+    store is held in memory instead.
+
+    '''
+
+    version = 1
+
+    def __init__(self, directory, interest_rate, *, cache_directory = cachedir):
+
+        csv_paths = sorted(glob(join(directory, interest_rate + '-[0-9][0-9][0-9][0-9].csv')))
+        name = sha1(normpath(abspath(directory)).encode()).hexdigest()[:16]
+        path = join(normpath(expanduser(cache_directory)), 'yield_curve_store-' + interest_rate + '-v' + str(self.version) + '-' + name + '.npy')
+
+        data = None
+        if csv_paths:
+            try:
+                if getmtime(path) >= max(getmtime(csv_path) for csv_path in csv_paths):
+                    data = np.load(path, mmap_mode = 'r')
+            except (OSError, ValueError):
+                pass
+            if data is None:
+                data = self._build(csv_paths)
+                if self._save(data, path):
+                    data = np.load(path, mmap_mode = 'r')
+
+        if data is None:
+            self.years = ()
+            self.dates = np.zeros(0, dtype = 'S10')
+            self.rates = np.zeros((0, 0))
+        else:
+            self.years = tuple(data[0]['rates'].tolist())
+            self.dates = data['date'][1:]
+            self.rates = data['rates'][1:]
+
+    def _build(self, csv_paths):
+
+        rows = []
+        all_years = set()
+        for csv_path in csv_paths:
+            with open(csv_path) as f:
+                r = csv.reader(f)
+                assert next(r)[0].startswith('#')
+                years = next(r)
+                years.pop(0)
+                years = tuple(float(v) for v in years)
+                all_years |= set(years)
+                for line in r:
+                    rate = line[1:]
+                    assert len(years) == len(rate)
+                    rows.append((line[0], {y: float(v) for y, v in zip(years, rate) if v != ''}))
+
+        all_years = sorted(all_years)
+        rows.sort(key = lambda row: row[0])
+        data = np.zeros(len(rows) + 1, dtype = [('date', 'S10'), ('rates', 'f8', (len(all_years), ))])
+        data[0]['rates'] = all_years
+        for i, (date, rate) in enumerate(rows):
+            data[i + 1] = (date, tuple(rate.get(y, nan) for y in all_years))
+
+        return data
+
+    def _save(self, data, path):
+        # Return whether the store could be written.
+
+        tmp_path = path + '.' + str(getpid()) + '.tmp'
+        try:
+            makedirs(dirname(path), exist_ok = True)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, data)
+            replace(tmp_path, path) # Atomic, so concurrent readers never see a partial file.
+        except OSError:
+            try:
+                remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+        return True
+
+    def _index(self, date_str, side):
+
+        return int(np.searchsorted(self.dates, date_str.encode(), side = side))
+
+    def _rows(self, indexes):
+        # Row at a time NumPy operations are slow, so convert the rows to lists.
+
+        rates = self.rates[indexes]
+        dates = self.dates[indexes].tolist()
+        haves = (~ np.isnan(rates)).tolist()
+        rates = (rates / 100).tolist()
+
+        return [(date.decode(), tuple(compress(self.years, have)), tuple(compress(rate, have)))
+            for date, have, rate in zip(dates, haves, rates) if any(have)]
+
+    def digest(self, date_str, date_str_low):
+        '''Return a hash of the data lookup(date_str, date_str_low) is
+        computed from.
+
+        '''
+
+        lo = self._index(date_str_low if date_str_low else str(int(date_str.split('-')[0]) - 1), 'left')
+        hi = self._index(date_str, 'right')
+        h = sha1(np.array(self.years).tobytes())
+        h.update(self.dates[lo:hi].tobytes())
+        h.update(np.ascontiguousarray(self.rates[lo:hi]).tobytes())
+
+        return h.hexdigest()
+
+    def lookup(self, date_str, date_str_low):
+        '''Return the yield curve dates, maturities, and rates as used by
+        YieldCurve for the most recent date on or before date_str, or
+        if date_str_low is specified all dates in the range date_str_low
+        to date_str.
+
+        Matches the yearly scan of the CSV files: without date_str_low
+        only the date's year and the prior year are considered, and
+        with it the years are returned most recent first.
+
+        '''
+
+        date_year = int(date_str.split('-')[0])
+
+        if date_str_low:
+            date_year_low = int(date_str_low.split('-')[0])
+            lo = self._index(date_str_low, 'left')
+            hi = self._index(date_str, 'right')
+            indexes = []
+            for year in range(date_year, date_year_low - 1, -1):
+                indexes.extend(range(max(lo, self._index(str(year), 'left')), min(hi, self._index(str(year + 1), 'left'))))
+            rows = self._rows(indexes)
+        else:
+            rows = []
+            for year in (date_year, date_year - 1):
+                # Last record of the year on or before date_str.
+                i = min(self._index(date_str, 'right'), self._index(str(year + 1), 'left')) - 1
+                if i >= 0 and self.dates[i][:4] == str(year).encode():
+                    rows = self._rows([i])
+                    if rows:
+                        break
+
+        return tuple(row[0] for row in rows), tuple(row[1] for row in rows), tuple(row[2] for row in rows)